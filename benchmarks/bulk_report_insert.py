@@ -0,0 +1,85 @@
+"""Compare inserting reports one createReport call at a time against a single
+createReports batch.
+
+Usage:
+    python -m benchmarks.bulk_report_insert [--reports 1000]
+
+Needs SQLALCHEMY_DATABASE_URI pointing at a migrated database. The rows it
+creates are deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete
+
+from src.db import db, dispose_engine, engine
+from src.db.models.report import Report, Study, StudyTemplate
+from src.db.models.user import User
+from src.services.report_service import ReportService
+
+
+async def create_fixtures() -> dict:
+    user = User(first_name="Bench", last_name="Mark", email="bench@example.com")
+    user.set_password("benchmark")
+    study = Study(name="Bulk insert benchmark")
+    db.session.add_all([user, study])
+    await db.session.flush()
+    template = StudyTemplate(study_id=study.id, section_names=["Findings"])
+    db.session.add(template)
+    await db.session.commit()
+    return {"userId": user.id, "studyId": study.id, "templateId": template.id}
+
+
+async def remove_fixtures(ids: dict) -> None:
+    await db.session.execute(delete(Report).where(Report.study_id == ids["studyId"]))
+    await db.session.execute(
+        delete(StudyTemplate).where(StudyTemplate.id == ids["templateId"])
+    )
+    await db.session.execute(delete(Study).where(Study.id == ids["studyId"]))
+    await db.session.execute(delete(User).where(User.id == ids["userId"]))
+    await db.session.commit()
+
+
+async def one_at_a_time(inputs: list) -> None:
+    for input_data in inputs:
+        await ReportService.create_report(input_data)
+
+
+async def batched(inputs: list) -> None:
+    await ReportService.create_reports(inputs)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=1000)
+    args = parser.parse_args()
+
+    # Statement logging would dominate the timings
+    engine.echo = False
+    token = db.begin_scope()
+    try:
+        ids = await create_fixtures()
+        inputs = [
+            {**ids, "promptText": f"Benchmark report {index}"}
+            for index in range(args.reports)
+        ]
+        results = {}
+        runs = (("createReport", one_at_a_time), ("createReports", batched))
+        for name, insert in runs:
+            started = time.perf_counter()
+            await insert(inputs)
+            results[name] = args.reports / (time.perf_counter() - started)
+            print(f"{name:>15}: {results[name]:8.0f} reports/s")
+
+        speedup = results["createReports"] / results["createReport"]
+        print(f"{'speedup':>15}: {speedup:8.1f}x")
+        await remove_fixtures(ids)
+    finally:
+        await db.end_scope(token)
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
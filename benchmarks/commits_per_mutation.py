@@ -0,0 +1,98 @@
+"""Count database commits per mutation with and without a unit of work.
+
+Usage:
+    python -m benchmarks.commits_per_mutation [--mutations 200]
+
+Runs UserService.create_organization and invite_radiologist, which write
+several rows each, once committing after every DAO call and once inside a
+unit of work. Needs SQLALCHEMY_DATABASE_URI pointing at a migrated
+database. The rows it creates are deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import time
+
+from sqlalchemy import delete, event
+
+from src.db import db, dispose_engine, engine
+from src.db.models.user import Organization, User
+from src.services.user_service import UserService
+
+commits = 0
+
+
+def count_commit(connection) -> None:
+    global commits
+    commits += 1
+
+
+async def create_and_invite(owner_id: int, index: int, run: str) -> None:
+    organization = await UserService.create_organization(
+        {
+            "name": f"Benchmark clinic {run} {index}",
+            "address": "1 Benchmark Way",
+            "phoneNumber": "+1-555-0123",
+            "created_by_user_id": owner_id,
+        }
+    )
+    await UserService.invite_radiologist(
+        organization.id,
+        {
+            "firstName": "Bench",
+            "lastName": f"Radiologist {index}",
+            "email": f"bench-{run}-{index}@example.com",
+        },
+        owner_id,
+    )
+
+
+async def measure(run: str, owner_id: int, mutations: int, unit_of_work) -> None:
+    global commits
+    commits = 0
+    started = time.perf_counter()
+    for index in range(mutations):
+        async with unit_of_work():
+            await create_and_invite(owner_id, index, run)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{run:>14}: {commits / mutations:4.1f} commits/mutation, "
+        f"{elapsed / mutations * 1000:6.2f} ms/mutation"
+    )
+
+
+async def cleanup(owner_id: int) -> None:
+    await db.session.execute(
+        delete(Organization).where(Organization.created_by_user_id == owner_id)
+    )
+    await db.session.execute(delete(User).where(User.email.like("bench-%@example.com")))
+    await db.session.execute(delete(User).where(User.id == owner_id))
+    await db.session.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mutations", type=int, default=200)
+    args = parser.parse_args()
+
+    # Statement logging would dominate the timings
+    engine.echo = False
+    event.listen(engine.sync_engine, "commit", count_commit)
+    token = db.begin_scope()
+    try:
+        owner = User(first_name="Bench", last_name="Owner", email="owner@example.com")
+        owner.set_password("benchmark")
+        db.session.add(owner)
+        await db.session.commit()
+
+        await measure("per DAO call", owner.id, args.mutations, contextlib.nullcontext)
+        await measure("unit of work", owner.id, args.mutations, db.unit_of_work)
+        await cleanup(owner.id)
+    finally:
+        await db.end_scope(token)
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
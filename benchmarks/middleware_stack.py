@@ -0,0 +1,113 @@
+"""Compare requests/sec of the pure ASGI middleware stack against the former
+BaseHTTPMiddleware implementation on a trivial authenticated GraphQL query.
+
+Usage:
+    python -m benchmarks.middleware_stack [--requests 5000] [--concurrency 50]
+
+The default query does not touch the database, so only SQLALCHEMY_DATABASE_URI
+needs to be set; no server has to be reachable.
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.app import graphql_app
+from src.api.auth_context import set_current_user
+from src.api.auth_middleware import AuthenticationMiddleware
+from src.api.middleware import SessionMiddleware
+from src.db import db
+from src.services.auth_service import AuthService
+from src.services.token_revocation_service import token_revocation_service
+
+
+class LegacySessionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        await db.start_session()
+        try:
+            return await call_next(request)
+        except Exception:
+            await db.session.rollback()
+            raise
+        finally:
+            await db.close_session()
+
+
+class LegacyAuthenticationMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        set_current_user(None)
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            try:
+                principal = await AuthService.get_current_user(
+                    auth_header.split(" ")[1]
+                )
+                if principal:
+                    set_current_user(principal)
+            except Exception:
+                pass
+        return await call_next(request)
+
+
+def build_app(session_middleware, auth_middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(auth_middleware)
+    app.add_middleware(session_middleware)
+    app.mount("/graphql", graphql_app)
+    return app
+
+
+async def run(app: FastAPI, query: str, requests: int, concurrency: int) -> float:
+    token = AuthService.create_access_token(1, password_must_change=False)
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.post("/graphql/", json={"query": query})
+                response.raise_for_status()
+
+        # Warm up
+        await client.post("/graphql/", json={"query": query})
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query", default="{ __typename }")
+    args = parser.parse_args()
+
+    # Keep the revocation list from refreshing against the database
+    token_revocation_service._refreshed_at = time.monotonic()
+    token_revocation_service.refresh_interval = float("inf")
+
+    stacks = {
+        "BaseHTTPMiddleware": build_app(
+            LegacySessionMiddleware, LegacyAuthenticationMiddleware
+        ),
+        "pure ASGI": build_app(SessionMiddleware, AuthenticationMiddleware),
+    }
+    results = {}
+    for name, app in stacks.items():
+        results[name] = await run(app, args.query, args.requests, args.concurrency)
+        print(f"{name:>20}: {results[name]:8.0f} req/s")
+
+    gain = results["pure ASGI"] / results["BaseHTTPMiddleware"] - 1
+    print(f"{'gain':>20}: {gain:8.1%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""Compare mutation latency of the former SELECT, COMMIT and refresh update
+path against a single UPDATE ... RETURNING.
+
+Usage:
+    python -m benchmarks.update_returning [--updates 1000]
+
+Needs SQLALCHEMY_DATABASE_URI pointing at a migrated database. The rows it
+creates are deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import delete, select
+
+from src.db import db, dispose_engine, engine
+from src.db.dao import user_dao
+from src.db.models.user import User
+
+
+async def legacy_update_user(user_id: int, user_data: dict):
+    stmt = select(User).where(User.id == user_id)
+    result = await db.session.execute(stmt)
+    user = result.scalar_one_or_none()
+    if user:
+        for key, value in user_data.items():
+            setattr(user, key, value)
+        await db.session.commit()
+        await db.session.refresh(user)
+    return user
+
+
+async def measure(update, user_id: int, updates: int) -> list:
+    latencies = []
+    for index in range(updates):
+        started = time.perf_counter()
+        await update(user_id, {"first_name": f"Bench {index}"})
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=1000)
+    args = parser.parse_args()
+
+    # Statement logging would dominate the timings
+    engine.echo = False
+    token = db.begin_scope()
+    try:
+        user = User(first_name="Bench", last_name="Mark", email="bench@example.com")
+        user.set_password("benchmark")
+        db.session.add(user)
+        await db.session.commit()
+
+        runs = (
+            ("SELECT + COMMIT + refresh", legacy_update_user),
+            ("UPDATE ... RETURNING", user_dao.update_user),
+        )
+        for name, update in runs:
+            latencies = sorted(await measure(update, user.id, args.updates))
+            p50 = statistics.median(latencies) * 1000
+            p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+            print(f"{name:>26}: p50 {p50:6.2f} ms  p99 {p99:6.2f} ms")
+
+        await db.session.execute(delete(User).where(User.id == user.id))
+        await db.session.commit()
+    finally:
+        await db.end_scope(token)
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
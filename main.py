@@ -1,6 +1,100 @@
-from src.api.app import app
+import argparse
+import os
 
-if __name__ == "__main__":
+from src.config.settings import settings
+
+
+def serve(args: argparse.Namespace) -> None:
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # "auto" uses uvloop and httptools when they are installed. With more
+    # than one worker uvicorn supervises the processes and forwards SIGTERM,
+    # letting each worker drain in-flight requests before running the
+    # lifespan shutdown that disposes the database pool.
+    uvicorn.run(
+        "src.api.app:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="auto",
+        http="auto",
+        proxy_headers=True,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+
+
+def outbox_worker(args: argparse.Namespace) -> None:
+    import asyncio
+
+    # Importing the handlers registers them with the worker
+    import src.workers.handlers  # noqa: F401
+    from src.workers.outbox import OutboxWorker
+    from src.workers.runner import run_worker
+
+    worker = OutboxWorker(batch_size=args.batch_size, poll_interval=args.poll_interval)
+    asyncio.run(run_worker(worker))
+
+
+def report_worker(args: argparse.Namespace) -> None:
+    import asyncio
+
+    from src.workers.report_generation import create_worker
+    from src.workers.runner import run_worker
+
+    asyncio.run(run_worker(create_worker(args.concurrency)))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Radmind backend")
+    subparsers = parser.add_subparsers(dest="command")
+
+    serve_parser = subparsers.add_parser("serve", help="Run the API server")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        help="Worker processes (default: WEB_CONCURRENCY or CPU count)",
+    )
+    serve_parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=30,
+        help="Seconds to let in-flight requests finish on shutdown",
+    )
+    serve_parser.set_defaults(handler=serve)
+
+    outbox_parser = subparsers.add_parser(
+        "outbox-worker", help="Deliver outbox events to their handlers"
+    )
+    outbox_parser.add_argument(
+        "--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE
+    )
+    outbox_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        help="Seconds to wait before polling an empty outbox again",
+    )
+    outbox_parser.set_defaults(handler=outbox_worker)
+
+    report_parser = subparsers.add_parser(
+        "report-worker", help="Generate report results from queued jobs"
+    )
+    report_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.REPORT_GENERATION_CONCURRENCY,
+        help="Generation jobs run at once by this process",
+    )
+    report_parser.set_defaults(handler=report_worker)
+    return parser
+
+
+if __name__ == "__main__":
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.command is None:
+        args = parser.parse_args(["serve"])
+    args.handler(args)
@@ -1,6 +1,7 @@
 from fastadmin import SqlAlchemyModelAdmin, register
 from fastapi import FastAPI
 
+from src.db import async_session_factory
 from src.db.models.report import (
     Report,
     ReportEvent,
@@ -9,7 +10,6 @@ from src.db.models.report import (
     StudyTemplate,
 )
 from src.db.models.user import Organization, User
-from src.db.session import async_session_factory
 
 
 # Register User admin
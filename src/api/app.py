@@ -1,17 +1,29 @@
+import logging
 from contextlib import asynccontextmanager
 
-from ariadne import make_executable_schema
+from ariadne import graphql, make_executable_schema
 from ariadne.asgi import GraphQL
 from fastadmin import fastapi_app as admin_app
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from src.api.auth_middleware import AuthenticationMiddleware
+from src.api.auth_middleware import AuthenticationMiddleware, authenticate_websocket
+from src.api.graphql_handler import GraphQLRequestHandler, GraphQLWebSocketHandler
 from src.api.middleware import SessionMiddleware
+from src.config.settings import settings
+from src.db import dispose_engine, warm_pool
+from src.graphql.cost import query_cost_validation_rules
 from src.graphql.directives.auth import RequiresAuthDirective, RequiresRoleDirective
+from src.graphql.directives.timeout import TimeoutDirective
+from src.graphql.parser import parse_query
 from src.graphql.resolvers import resolvers
 from src.graphql.schema import type_defs
+from src.graphql.transaction import make_mutations_transactional
+from src.services.report_audit_service import report_audit_writer
+from src.services.report_subscription_service import report_broker
+from src.utils.background import drain_background_tasks
+from src.utils.json_codec import get_json_codec
 
 schema = make_executable_schema(
     type_defs,
@@ -19,8 +31,23 @@ schema = make_executable_schema(
     directives={
         "requiresAuth": RequiresAuthDirective,
         "requiresRole": RequiresRoleDirective,
+        "timeout": TimeoutDirective,
     },
 )
+if settings.GRAPHQL_TRANSACTION_SCOPE == "field":
+    make_mutations_transactional(schema)
+
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up() -> None:
+    """Fill the connection pool and run the GraphQL pipeline once"""
+    try:
+        await warm_pool()
+    except Exception:
+        logger.warning("Could not warm the database pool", exc_info=True)
+    await graphql(schema, {"query": "{ __typename }"}, query_parser=parse_query)
 
 
 @asynccontextmanager
@@ -29,8 +56,14 @@ async def lifespan(app: FastAPI):
     # Import admin config to register models
     from src.admin import config
 
+    await warm_up()
+    report_audit_writer.start()
     yield
-    # Shutdown
+    # Shutdown: uvicorn has already drained in-flight requests
+    await report_audit_writer.stop()
+    await report_broker.close()
+    await drain_background_tasks()
+    await dispose_engine()
 
 
 app = FastAPI(
@@ -61,8 +94,27 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics():
+    handler = graphql_app.http_handler
+    metrics = {"admission": handler.admission.snapshot()}
+    if handler.single_flight is not None:
+        metrics["singleFlight"] = handler.single_flight.snapshot()
+    return metrics
+
+
 # Mount GraphQL
-graphql_app = GraphQL(schema, debug=False)
+json_codec = get_json_codec(settings.JSON_CODEC)
+graphql_app = GraphQL(
+    schema,
+    debug=False,
+    query_parser=parse_query,
+    validation_rules=query_cost_validation_rules,
+    http_handler=GraphQLRequestHandler(codec=json_codec),
+    websocket_handler=GraphQLWebSocketHandler(
+        codec=json_codec, on_connect=authenticate_websocket
+    ),
+)
 app.mount("/graphql", graphql_app)
 
 # Mount Admin interface
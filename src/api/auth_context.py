@@ -1,21 +1,58 @@
 from contextvars import ContextVar
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Union
 
+from src.db.dao import user_dao
 from src.db.models.user import User
 
-# Context variable to store current authenticated user
-current_user_context: ContextVar[Optional[User]] = ContextVar(
+
+@dataclass
+class Principal:
+    """Authenticated identity built from token claims.
+
+    Carries only what the auth directives need; the full User row is loaded
+    the first time a resolver asks for it.
+    """
+
+    id: int
+    password_must_change: bool
+    # Memberships at the time the token was issued; used for scheduling only
+    organization_ids: Tuple[int, ...] = ()
+    _user: Optional[User] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_user(
+        cls, user: User, organization_ids: Tuple[int, ...] = ()
+    ) -> "Principal":
+        return cls(
+            id=user.id,
+            password_must_change=user.password_must_change,
+            organization_ids=organization_ids,
+            _user=user,
+        )
+
+    async def get_user(self) -> Optional[User]:
+        """Load (once) and return the User row behind this principal"""
+        if self._user is None:
+            self._user = await user_dao.get_user_by_id(self.id)
+        return self._user
+
+
+# Context variable to store current authenticated principal
+current_user_context: ContextVar[Optional[Principal]] = ContextVar(
     "current_user", default=None
 )
 
 
-def get_current_user() -> Optional[User]:
-    """Get current authenticated user from context"""
+def get_current_user() -> Optional[Principal]:
+    """Get current authenticated principal from context"""
     return current_user_context.get()
 
 
-def set_current_user(user: Optional[User]) -> None:
-    """Set current authenticated user in context"""
+def set_current_user(user: Optional[Union[Principal, User]]) -> None:
+    """Set current authenticated principal in context"""
+    if isinstance(user, User):
+        user = Principal.from_user(user)
     current_user_context.set(user)
 
 
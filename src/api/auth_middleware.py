@@ -1,33 +1,76 @@
-from typing import Optional
+from typing import Any, Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.websockets import WebSocket
 
 from src.api.auth_context import set_current_user
+from src.db import db
 from src.services.auth_service import AuthService
 
 
-class AuthenticationMiddleware(BaseHTTPMiddleware):
-    """Middleware to extract JWT token and set current user context"""
+class AuthenticationMiddleware:
+    """Pure ASGI middleware to extract JWT token and set current principal context"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         # Reset user context for each request
         set_current_user(None)
 
         # Extract token from Authorization header
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-
-            try:
-                # Get user from token
-                user = await AuthService.get_current_user(token)
-                if user:
-                    set_current_user(user)
-            except Exception:
-                # Invalid token - user remains None
-                pass
+        auth_header = Headers(scope=scope).get("Authorization")
+        if scope["type"] == "websocket":
+            await authenticate_in_own_scope(auth_header)
+        else:
+            await authenticate(auth_header)
 
         # Process the request
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
+
+
+async def authenticate(auth_header: Optional[str]) -> None:
+    """Set the current principal from a "Bearer <token>" value, if valid"""
+    if auth_header and auth_header.startswith("Bearer "):
+        token = auth_header.split(" ")[1]
+
+        try:
+            # Build principal from token claims
+            principal = await AuthService.get_current_user(token)
+            if principal:
+                set_current_user(principal)
+        except Exception:
+            # Invalid token - user remains None
+            pass
+
+
+async def authenticate_in_own_scope(auth_header: Optional[str]) -> None:
+    """authenticate() with a session scope of its own.
+
+    SessionMiddleware only scopes http requests, but checking a token can
+    still query the database. The session is closed again right away rather
+    than held for the lifetime of a websocket connection.
+    """
+    token = db.begin_scope()
+    try:
+        await authenticate(auth_header)
+    finally:
+        await db.end_scope(token)
+
+
+async def authenticate_websocket(websocket: WebSocket, payload: Any) -> None:
+    """Authenticate a subscription connection from its connection_init payload.
+
+    Browsers cannot set headers on a websocket upgrade, so clients send
+    {"Authorization": "Bearer <token>"} when initializing the connection
+    instead. The principal is set in the connection's context, which every
+    operation started on it inherits.
+    """
+    if isinstance(payload, dict):
+        params = {str(key).lower(): value for key, value in payload.items()}
+        await authenticate_in_own_scope(params.get("authorization"))
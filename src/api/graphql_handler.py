@@ -0,0 +1,265 @@
+import asyncio
+import json
+from functools import partial
+from typing import Any, Hashable, List, Optional, Union
+
+from ariadne.asgi.handlers import GraphQLHTTPHandler, GraphQLTransportWSHandler
+from ariadne.exceptions import HttpBadRequestError, HttpError
+from ariadne.types import GraphQLResult
+from graphql import GraphQLError, OperationType
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+from starlette.websockets import WebSocket
+
+from src.api.auth_context import get_current_user
+from src.config.settings import settings
+from src.db import db
+from src.graphql.cost import get_query_cost, reset_query_cost
+from src.graphql.parser import get_operation_type, normalize_query
+from src.utils.admission import AdmissionController
+from src.utils.deadline import deadline
+from src.utils.exceptions import OperationTimeoutError, ServiceOverloadedError
+from src.utils.json_codec import JSONCodec, get_json_codec
+from src.utils.single_flight import SingleFlight
+
+
+class GraphQLRequestHandler(GraphQLHTTPHandler):
+    """GraphQL HTTP handler that parses and serializes with a pluggable codec.
+
+    Also accepts a JSON array of operations, executed concurrently with one
+    shared context, and answers with an array of results in the same order.
+    Every operation, batched or not, passes through an admission controller
+    first; a request is answered with 503 when the worker is saturated.
+    Identical queries from the same caller that arrive while one is already
+    running wait for its result instead of executing again.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        codec: Optional[JSONCodec] = None,
+        max_batch_size: int = settings.GRAPHQL_MAX_BATCH_SIZE,
+        operation_timeout: float = settings.GRAPHQL_OPERATION_TIMEOUT_SECONDS,
+        admission: Optional[AdmissionController] = None,
+        single_flight: bool = settings.GRAPHQL_SINGLE_FLIGHT,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.codec = codec or get_json_codec()
+        self.max_batch_size = max_batch_size
+        self.operation_timeout = operation_timeout
+        self.admission = admission or AdmissionController(
+            max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+            max_wait=settings.ADMISSION_MAX_WAIT_SECONDS,
+            weights=settings.ADMISSION_ORGANIZATION_WEIGHTS,
+        )
+        self.single_flight = SingleFlight() if single_flight else None
+
+    async def extract_data_from_json_request(self, request: Request) -> Any:
+        try:
+            return self.codec.loads(await request.body())
+        except ValueError as ex:
+            raise HttpBadRequestError("Request body is not a valid JSON") from ex
+
+    async def graphql_http_server(self, request: Request) -> Response:
+        try:
+            data = await self.extract_data_from_request(request)
+        except HttpError as error:
+            return PlainTextResponse(error.message or error.status, status_code=400)
+
+        try:
+            if isinstance(data, list):
+                return await self.execute_batch(request, data)
+
+            success, result = await self.execute_coalesced(request, data)
+            return await self.create_json_response(request, result, success)
+        except ServiceOverloadedError as error:
+            return self.create_overloaded_response(error)
+
+    async def execute_coalesced(self, request: Request, data: Any) -> GraphQLResult:
+        key = self.get_single_flight_key(data)
+        if key is None or self.single_flight is None:
+            return await self.execute_admitted(request, data)
+        # Waiters hold no admission slot; only the shared execution does
+        return await self.single_flight.run(
+            key, partial(self._execute_shared, request, data)
+        )
+
+    async def execute_admitted(self, request: Request, data: Any) -> GraphQLResult:
+        async with self.admission.admit(self.get_admission_tenant(request)):
+            return await self.execute_graphql_query(request, data)
+
+    async def _execute_shared(self, request: Request, data: Any) -> GraphQLResult:
+        # Runs in its own task, which may outlive the request that started it
+        token = db.fork_scope()
+        try:
+            return await self.execute_admitted(request, data)
+        finally:
+            await db.end_scope(token)
+
+    def get_single_flight_key(self, data: Any) -> Optional[Hashable]:
+        """Identity of a read that may share one execution with its twins.
+
+        Only query operations qualify. Results can depend on who asks, so the
+        caller is part of the key; None means execute on its own.
+        """
+        if self.single_flight is None or not isinstance(data, dict):
+            return None
+        query = data.get("query")
+        operation_name = data.get("operationName")
+        if not isinstance(query, str) or not isinstance(
+            operation_name, (str, type(None))
+        ):
+            return None
+        try:
+            if get_operation_type(query, operation_name) != OperationType.QUERY:
+                return None
+            variables = json.dumps(data.get("variables") or {}, sort_keys=True)
+        except (GraphQLError, TypeError, ValueError):
+            # Left to regular execution to report
+            return None
+
+        principal = get_current_user()
+        caller = (
+            None
+            if principal is None
+            else (principal.id, principal.password_must_change)
+        )
+        return normalize_query(query), operation_name, variables, caller
+
+    def get_admission_tenant(self, request: Request) -> Optional[int]:
+        """Organization whose share of the worker this request draws on.
+
+        Callers in several organizations are charged to the first one; callers
+        without memberships, and anonymous ones, share the default tenant.
+        """
+        principal = get_current_user()
+        if principal is None or not principal.organization_ids:
+            return None
+        return principal.organization_ids[0]
+
+    async def execute_graphql_query(
+        self, request: Any, data: Any, **kwargs: Any
+    ) -> GraphQLResult:
+        reset_query_cost()
+        try:
+            async with deadline(self.operation_timeout):
+                success, result = await super().execute_graphql_query(
+                    request, data, **kwargs
+                )
+        except OperationTimeoutError as error:
+            await db.end_unit_of_work(commit=False)
+            # The resolver tree was cancelled, so there is no partial data
+            formatted = GraphQLError(str(error), extensions=error.extensions).formatted
+            return True, {"data": None, "errors": [formatted]}
+
+        # Settles the operation-wide unit of work, if parse_query opened one
+        await db.end_unit_of_work(commit=success and not result.get("errors"))
+
+        cost = get_query_cost()
+        if cost is not None and isinstance(result, dict):
+            result.setdefault("extensions", {})["cost"] = cost
+        return success, result
+
+    async def execute_batch(self, request: Request, operations: List[Any]) -> Response:
+        if not operations:
+            return PlainTextResponse("Batch must not be empty", status_code=400)
+        if len(operations) > self.max_batch_size:
+            return PlainTextResponse(
+                f"Batch exceeds the maximum of {self.max_batch_size} operations",
+                status_code=400,
+            )
+
+        # The request was authenticated once by the middleware; every
+        # operation also shares one context value, built from the whole batch
+        context_value = await self.get_context_for_request(
+            request, {"operations": operations}
+        )
+        results = await asyncio.gather(
+            *(
+                self._execute_batched_operation(request, data, context_value)
+                for data in operations
+            )
+        )
+        shed = [
+            result for result in results if isinstance(result, ServiceOverloadedError)
+        ]
+        if len(shed) == len(results):
+            # Nothing ran, so the whole batch can be retried later
+            raise shed[0]
+        # Each result carries its own errors, so the batch itself succeeded
+        payload = [
+            self.format_overloaded(result)
+            if isinstance(result, ServiceOverloadedError)
+            else result[1]
+            for result in results
+        ]
+        return await self.create_json_response(request, payload, True)
+
+    async def _execute_batched_operation(
+        self, request: Request, data: Any, context_value: Any
+    ) -> Union[GraphQLResult, ServiceOverloadedError]:
+        """Execute one operation of a batch; its shedding is returned, not raised"""
+        try:
+            # Each operation checks out its own session, so each takes a slot
+            async with self.admission.admit(self.get_admission_tenant(request)):
+                # Its own task (via gather), so the session scope is private
+                token = db.fork_scope()
+                try:
+                    return await self.execute_graphql_query(
+                        request, data, context_value=context_value
+                    )
+                finally:
+                    await db.end_scope(token)
+        except ServiceOverloadedError as error:
+            return error
+
+    async def create_json_response(
+        self, request: Request, result: Any, success: bool
+    ) -> Response:
+        status_code = 200 if success else 400
+        return Response(
+            self.codec.dumps(result),
+            status_code=status_code,
+            media_type="application/json",
+        )
+
+    def format_overloaded(self, error: ServiceOverloadedError) -> dict:
+        formatted = GraphQLError(str(error), extensions=error.extensions).formatted
+        return {"errors": [formatted]}
+
+    def create_overloaded_response(self, error: ServiceOverloadedError) -> Response:
+        return Response(
+            self.codec.dumps(self.format_overloaded(error)),
+            status_code=503,
+            headers={"Retry-After": str(error.extensions["retryAfter"])},
+            media_type="application/json",
+        )
+
+
+class _CodecWebSocket(WebSocket):
+    """WebSocket that encodes outgoing JSON messages with a JSONCodec"""
+
+    def __init__(self, codec: JSONCodec, scope: Scope, receive: Receive, send: Send):
+        super().__init__(scope, receive, send)
+        self.codec = codec
+
+    async def send_json(self, data: Any, mode: str = "text") -> None:
+        encoded = self.codec.dumps(data)
+        if mode == "binary":
+            await self.send_bytes(encoded)
+        else:
+            await self.send_text(encoded.decode())
+
+
+class GraphQLWebSocketHandler(GraphQLTransportWSHandler):
+    """graphql-transport-ws handler that encodes with a pluggable codec"""
+
+    def __init__(self, *args: Any, codec: Optional[JSONCodec] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.codec = codec or get_json_codec()
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.handle_websocket(_CodecWebSocket(self.codec, scope, receive, send))
@@ -1,5 +1,6 @@
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.db import db
 
@@ -16,14 +17,36 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         return response
 
 
-class SessionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        await db.start_session()
+class SessionMiddleware:
+    """Pure ASGI middleware that scopes a database session to each request.
+
+    Runs the downstream app in the same task, so the session context variable
+    is visible to it without the task and stream wrapping BaseHTTPMiddleware
+    adds. The session itself is only created when something touches
+    db.session, and is closed as soon as the response starts, so requests
+    that never query the database never check out a connection and the
+    connection is back in the pool before the body is sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                await db.close_session()
+            await send(message)
+
+        token = db.begin_scope()
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
         except Exception:
-            await db.session.rollback()
+            if db.has_session:
+                await db.session.rollback()
             raise
         finally:
-            await db.close_session()
+            await db.end_scope(token)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -14,6 +14,75 @@ class Settings(BaseSettings):
 
     CORS_ORIGINS: List[str] = ["*"]
 
+    REDIS_URL: Optional[str] = None
+
+    # "auto" picks orjson, then msgspec, then the standard library
+    JSON_CODEC: str = "auto"
+
+    # Maximum operations accepted in one batched GraphQL request
+    GRAPHQL_MAX_BATCH_SIZE: int = 10
+
+    # Operations nested deeper or estimated costlier are rejected before execution
+    GRAPHQL_MAX_DEPTH: int = 10
+    GRAPHQL_MAX_COST: int = 10000
+
+    # Time budget of one GraphQL operation; @timeout can tighten it per field
+    GRAPHQL_OPERATION_TIMEOUT_SECONDS: float = 30.0
+
+    # Commit once per mutation "field", or once per mutation "operation"
+    GRAPHQL_TRANSACTION_SCOPE: str = "field"
+
+    # Let identical concurrent queries from one caller share an execution
+    GRAPHQL_SINGLE_FLIGHT: bool = True
+
+    # Concurrent GraphQL requests per worker; keep below DB pool size + overflow
+    ADMISSION_MAX_CONCURRENCY: int = 10
+    ADMISSION_MAX_QUEUE: int = 50
+    ADMISSION_MAX_WAIT_SECONDS: float = 2.0
+    # Relative share of admission slots per organization id (default 1.0)
+    ADMISSION_ORGANIZATION_WEIGHTS: Dict[int, float] = {}
+
+    # Studies with more reports than this are deleted in background chunks
+    BULK_DELETE_THRESHOLD: int = 5000
+    BULK_DELETE_CHUNK_SIZE: int = 1000
+
+    # "sync" writes report history with the change, "batched" writes it behind
+    REPORT_AUDIT_DURABILITY: str = "sync"
+    REPORT_AUDIT_BATCH_SIZE: int = 500
+    REPORT_AUDIT_FLUSH_INTERVAL_SECONDS: float = 0.05
+    REPORT_AUDIT_QUEUE_SIZE: int = 10000
+
+    # Outbox worker: events per batch, idle poll delay, lease and retry budget
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_LEASE_SECONDS: float = 60.0
+    OUTBOX_MAX_ATTEMPTS: int = 10
+
+    # Report generation: "stub" or a "module:Class" generator, jobs run at
+    # once per worker process, time budget and retry budget per job
+    REPORT_GENERATOR_BACKEND: str = "stub"
+    REPORT_GENERATOR_STUB_LATENCY_SECONDS: float = 0.0
+    REPORT_GENERATION_CONCURRENCY: int = 4
+    REPORT_GENERATION_POLL_INTERVAL_SECONDS: float = 1.0
+    REPORT_GENERATION_TIMEOUT_SECONDS: float = 120.0
+    REPORT_GENERATION_MAX_ATTEMPTS: int = 3
+
+    # Subscription fan-out ("memory" for a single worker, "redis" across
+    # workers) and the per-subscriber backlog kept for slow clients
+    SUBSCRIPTION_BROKER_BACKEND: str = "memory"
+    SUBSCRIPTION_QUEUE_SIZE: int = 100
+
+    # Login throttling ("memory" for a single worker, "redis" to share buckets)
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"
+    LOGIN_RATE_LIMIT_IP_CAPACITY: int = 20
+    LOGIN_RATE_LIMIT_IP_REFILL_PER_MINUTE: float = 10.0
+    LOGIN_RATE_LIMIT_EMAIL_CAPACITY: int = 5
+    LOGIN_RATE_LIMIT_EMAIL_REFILL_PER_MINUTE: float = 1.0
+
+    # Token revocation
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 5.0
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100_000
+
     class Config:
         env_file = ".env"
 
@@ -1,8 +1,17 @@
+import asyncio
+import logging
 import os
-from contextvars import ContextVar
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.utils.deadline import remaining_time
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URI")
 
@@ -11,6 +20,14 @@ engine = create_async_engine(
     DATABASE_URL,
     echo=True,
     future=True,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    # Backstop for statements running outside any operation deadline
+    connect_args={
+        "server_settings": {
+            "statement_timeout": os.getenv("DB_STATEMENT_TIMEOUT_MS", "60000")
+        }
+    },
 )
 
 async_session_factory = sessionmaker(
@@ -19,26 +36,205 @@ async_session_factory = sessionmaker(
     expire_on_commit=False,
 )
 
+# Read-only work runs in autocommit mode, skipping the BEGIN/ROLLBACK round
+# trips of a transaction nobody needs
+read_only_session_factory = sessionmaker(
+    bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    info={"read_only": True},
+)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection) -> None:
+    """Make Postgres give up on statements once the operation deadline passes"""
+    remaining = remaining_time()
+    # Autocommit sessions have no transaction for SET LOCAL to apply to; their
+    # statements are cancelled along with the task that awaits them
+    if remaining is None or session.info.get("read_only"):
+        return
+    timeout_ms = max(1, int(remaining * 1000))
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+async def warm_pool(connections: Optional[int] = None) -> None:
+    """Open pool connections up front so early requests don't pay for connecting"""
+
+    async def connect() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    count = connections or engine.pool.size()
+    await asyncio.gather(*(connect() for _ in range(count)))
+
+
+async def dispose_engine() -> None:
+    """Close every pooled connection"""
+    await engine.dispose()
+
+
+class _SessionScope:
+    """Per-request slot holding a session that is created on first use"""
+
+    __slots__ = (
+        "session",
+        "read_only",
+        "external",
+        "unit_of_work",
+        "after_commit",
+    )
+
+    def __init__(self, session: Optional[AsyncSession] = None, external: bool = False):
+        self.session = session
+        self.read_only = False
+        # While set, commit() only flushes; the unit of work commits at its end
+        self.unit_of_work = False
+        # Externally provided sessions are managed (and closed) by their owner
+        self.external = external
+        # Callbacks waiting for the current transaction to commit
+        self.after_commit: List[Callable[[], Awaitable[None]]] = []
 
-_session_context: ContextVar[AsyncSession] = ContextVar("session")
+
+_session_context: ContextVar[Optional[_SessionScope]] = ContextVar(
+    "session", default=None
+)
 
 
 class DatabaseSession:
     @property
     def session(self) -> AsyncSession:
-        return _session_context.get()
+        scope = _session_context.get()
+        if scope is None:
+            raise LookupError("No database session scope is active")
+        if scope.session is None:
+            factory = (
+                read_only_session_factory if scope.read_only else async_session_factory
+            )
+            scope.session = factory()
+        return scope.session
+
+    @property
+    def has_session(self) -> bool:
+        """Whether the current scope has created its session yet"""
+        scope = _session_context.get()
+        return scope is not None and scope.session is not None
+
+    def begin_scope(self) -> Token:
+        """Start a scope whose session is only created when first accessed"""
+        return _session_context.set(_SessionScope())
+
+    def fork_scope(self) -> Token:
+        """Start a scope for work running concurrently with the current one.
+
+        The child gets its own lazily created session, since an AsyncSession
+        must not be shared between concurrent tasks. An externally provided
+        session is the exception: its owner decides how it is shared.
+        """
+        parent = _session_context.get()
+        if parent is not None and parent.external:
+            return _session_context.set(_SessionScope(parent.session, external=True))
+        return self.begin_scope()
+
+    async def end_scope(self, token: Token) -> None:
+        scope = _session_context.get()
+        if scope is not None and not scope.external:
+            await self.close_session()
+        _session_context.reset(token)
+
+    async def commit(self) -> None:
+        """Commit the session, or only flush it inside a unit of work"""
+        scope = _session_context.get()
+        if scope is not None and scope.unit_of_work:
+            await self.session.flush()
+        else:
+            await self.session.commit()
+            await self._run_after_commit(scope)
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Run callback once the current transaction commits.
+
+        Callbacks are dropped if the transaction rolls back instead, so
+        side effects such as notifications never announce uncommitted data.
+        """
+        scope = _session_context.get()
+        if scope is None:
+            raise LookupError("No database session scope is active")
+        scope.after_commit.append(callback)
+
+    async def _run_after_commit(self, scope: Optional[_SessionScope]) -> None:
+        if scope is None:
+            return
+        callbacks, scope.after_commit = scope.after_commit, []
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception:
+                # The transaction is already committed; report and move on
+                logger.exception("after_commit callback failed")
+
+    def begin_unit_of_work(self) -> bool:
+        """Defer commits until end_unit_of_work; False if one is already open"""
+        scope = _session_context.get()
+        if scope is None:
+            raise LookupError("No database session scope is active")
+        if scope.unit_of_work:
+            return False
+        scope.unit_of_work = True
+        return True
+
+    async def end_unit_of_work(self, commit: bool) -> None:
+        """Commit or roll back everything flushed since begin_unit_of_work"""
+        scope = _session_context.get()
+        if scope is None or not scope.unit_of_work:
+            return
+        scope.unit_of_work = False
+        if scope.session is None:
+            return
+        if commit:
+            await scope.session.commit()
+            await self._run_after_commit(scope)
+            return
+        scope.after_commit = []
+        if not scope.external:
+            # An external session's owner decides what to discard
+            await scope.session.rollback()
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[None]:
+        """Commit once when the block succeeds, roll back if it raises.
+
+        Nested blocks join the outermost one.
+        """
+        if not self.begin_unit_of_work():
+            yield
+            return
+        try:
+            yield
+        except BaseException:
+            await self.end_unit_of_work(commit=False)
+            raise
+        await self.end_unit_of_work(commit=True)
+
+    def mark_read_only(self) -> None:
+        """Use an autocommit session for this scope, unless one already exists"""
+        scope = _session_context.get()
+        if scope is not None and scope.session is None:
+            scope.read_only = True
 
     async def start_session(self, session: AsyncSession | None = None):
+        external = session is not None
         session = session or async_session_factory()
-        _session_context.set(session)
+        _session_context.set(_SessionScope(session, external=external))
         return session
 
     def remove_session(self):
         _session_context.set(None)
 
     async def close_session(self):
-        session = _session_context.get(None)
-        if session:
+        scope = _session_context.get()
+        if scope is not None and scope.session is not None:
+            session, scope.session = scope.session, None
             await session.close()
 
 
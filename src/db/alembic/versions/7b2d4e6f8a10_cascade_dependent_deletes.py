@@ -0,0 +1,47 @@
+"""Cascade deletes to dependent rows
+
+Revision ID: 7b2d4e6f8a10
+Revises: 3f1c9a7b2e54
+Create Date: 2026-10-18 14:05:21.530417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2d4e6f8a10"
+down_revision: Union[str, None] = "3f1c9a7b2e54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table) of every foreign key that now cascades.
+# report.template_id stays NO ACTION: deleting a template must not silently
+# take its reports along, and the study cascade already removes them.
+CASCADING_FOREIGN_KEYS = [
+    ("organization_member", "organization_id", "organization"),
+    ("studytemplate", "study_id", "study"),
+    ("report", "study_id", "study"),
+    ("reporthistory", "report_id", "report"),
+    ("reportevent", "report_id", "report"),
+]
+
+
+def _recreate_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, column, referenced in CASCADING_FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, referenced, [column], ["id"], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_foreign_keys("CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_foreign_keys(None)
@@ -0,0 +1,31 @@
+"""Add report version
+
+Revision ID: a4c8e1f0b937
+Revises: 7b2d4e6f8a10
+Create Date: 2026-10-18 15:22:08.644190
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c8e1f0b937"
+down_revision: Union[str, None] = "7b2d4e6f8a10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "report",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("report", "version")
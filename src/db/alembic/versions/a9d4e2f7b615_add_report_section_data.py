@@ -0,0 +1,35 @@
+"""Add report section data
+
+Revision ID: a9d4e2f7b615
+Revises: f2b7c4d9a831
+Create Date: 2026-10-18 19:14:27.630518
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d4e2f7b615"
+down_revision: Union[str, None] = "f2b7c4d9a831"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "report", sa.Column("section_data", postgresql.JSONB(), nullable=True)
+    )
+    op.add_column(
+        "reporthistory", sa.Column("section_name", sa.String(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("reporthistory", "section_name")
+    op.drop_column("report", "section_data")
@@ -0,0 +1,40 @@
+"""Add token revocation txid
+
+Revision ID: c6f1a8e3d472
+Revises: a9d4e2f7b615
+Create Date: 2026-10-19 09:41:08.215364
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c6f1a8e3d472"
+down_revision: Union[str, None] = "a9d4e2f7b615"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "token_revocation",
+        sa.Column(
+            "txid",
+            sa.BigInteger(),
+            server_default=sa.text("(pg_current_xact_id()::text)::bigint"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        op.f("ix_token_revocation_txid"), "token_revocation", ["txid"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_token_revocation_txid"), table_name="token_revocation")
+    op.drop_column("token_revocation", "txid")
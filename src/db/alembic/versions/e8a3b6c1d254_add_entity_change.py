@@ -0,0 +1,60 @@
+"""Add entity change log
+
+Revision ID: e8a3b6c1d254
+Revises: c5d9f2a3e716
+Create Date: 2026-10-18 17:52:08.481930
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a3b6c1d254"
+down_revision: Union[str, None] = "c5d9f2a3e716"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "entity_change",
+        sa.Column("seq", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column(
+            "txid",
+            sa.BigInteger(),
+            server_default=sa.text("(pg_current_xact_id()::text)::bigint"),
+            nullable=False,
+        ),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("operation", sa.String(), nullable=False),
+        sa.Column(
+            "changed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("seq"),
+    )
+    op.create_index(
+        "ix_entity_change_txid_seq", "entity_change", ["txid", "seq"], unique=False
+    )
+    # Existing rows start the log, so a client syncing from scratch gets them
+    op.execute(
+        "INSERT INTO entity_change (entity_type, entity_id, operation) "
+        "SELECT 'study', id, 'created' FROM study ORDER BY id"
+    )
+    op.execute(
+        "INSERT INTO entity_change (entity_type, entity_id, operation) "
+        "SELECT 'report', id, 'created' FROM report ORDER BY id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entity_change_txid_seq", table_name="entity_change")
+    op.drop_table("entity_change")
@@ -0,0 +1,69 @@
+"""Add report generation job
+
+Revision ID: f2b7c4d9a831
+Revises: e8a3b6c1d254
+Create Date: 2026-10-18 18:31:44.902417
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b7c4d9a831"
+down_revision: Union[str, None] = "e8a3b6c1d254"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "report_generation_job",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("report_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), server_default="queued", nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["report_id"], ["report.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_report_generation_job_report_id"),
+        "report_generation_job",
+        ["report_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_report_generation_job_available_at"),
+        "report_generation_job",
+        ["available_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_report_generation_job_available_at"),
+        table_name="report_generation_job",
+    )
+    op.drop_index(
+        op.f("ix_report_generation_job_report_id"), table_name="report_generation_job"
+    )
+    op.drop_table("report_generation_job")
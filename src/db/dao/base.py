@@ -0,0 +1,33 @@
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from sqlalchemy import update
+
+from src.db import db
+
+T = TypeVar("T")
+
+
+async def update_by_id(
+    model: Type[T], row_id: int, values: Dict[str, Any], *criteria: Any
+) -> Optional[T]:
+    """Update one row with a single UPDATE ... RETURNING and return it.
+
+    The returned row is loaded into the session's identity map, replacing
+    the state of any instance of it that was already there. Extra criteria
+    make the update conditional; None is returned when they do not match.
+    """
+    if not values:
+        return await db.session.get(model, row_id)
+
+    stmt = (
+        update(model)
+        .where(model.id == row_id, *criteria)
+        .values(**values)
+        .returning(model)
+        .execution_options(populate_existing=True)
+    )
+    result = await db.session.execute(stmt)
+    row = result.scalar_one_or_none()
+    if row is not None:
+        await db.commit()
+    return row
@@ -0,0 +1,57 @@
+from typing import Iterable, List
+
+from sqlalchemy import Select, insert, literal, select, text, tuple_
+
+from src.db import db
+from src.db.models.change_log import ChangeEntityType, ChangeOperation, EntityChange
+from src.utils.sync_token import SyncToken
+
+
+async def record_changes(
+    entity_type: ChangeEntityType,
+    operation: ChangeOperation,
+    entity_ids: Iterable[int],
+) -> None:
+    """Log changes in the current transaction; the caller commits"""
+    rows = [
+        {
+            "entity_type": entity_type.value,
+            "entity_id": entity_id,
+            "operation": operation.value,
+        }
+        for entity_id in entity_ids
+    ]
+    if rows:
+        await db.session.execute(insert(EntityChange), rows)
+
+
+async def record_changes_from(
+    entity_type: ChangeEntityType, operation: ChangeOperation, entity_ids: Select
+) -> None:
+    """Log a change for every id the select returns, with one INSERT ... SELECT"""
+    ids = entity_ids.subquery()
+    stmt = insert(EntityChange).from_select(
+        ["entity_type", "entity_id", "operation"],
+        select(literal(entity_type.value), *ids.c, literal(operation.value)),
+    )
+    await db.session.execute(stmt)
+
+
+async def get_sync_horizon() -> int:
+    """Oldest transaction still running; every earlier one has finished"""
+    stmt = text("SELECT (pg_snapshot_xmin(pg_current_snapshot())::text)::bigint")
+    result = await db.session.execute(stmt)
+    return result.scalar_one()
+
+
+async def get_changes(after: SyncToken, horizon: int, limit: int) -> List[EntityChange]:
+    """Changes logged after the given position by transactions below horizon"""
+    stmt = (
+        select(EntityChange)
+        .where(tuple_(EntityChange.txid, EntityChange.seq) > tuple_(*after))
+        .where(EntityChange.txid < horizon)
+        .order_by(EntityChange.txid, EntityChange.seq)
+        .limit(limit)
+    )
+    result = await db.session.execute(stmt)
+    return result.scalars().all()
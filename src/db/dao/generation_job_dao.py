@@ -0,0 +1,89 @@
+from datetime import timedelta
+from typing import List
+
+from sqlalchemy import func, insert, select, update
+
+from src.db import db
+from src.db.models.generation import GenerationJobStatus, ReportGenerationJob
+
+
+async def create_generation_jobs(report_ids: List[int]) -> None:
+    """Queue one job per report with one multi-row INSERT"""
+    if not report_ids:
+        return
+    await db.session.execute(
+        insert(ReportGenerationJob),
+        [{"report_id": report_id} for report_id in report_ids],
+    )
+    await db.commit()
+
+
+async def claim_generation_jobs(
+    limit: int, lease: timedelta
+) -> List[ReportGenerationJob]:
+    """Lease up to limit due jobs to the caller.
+
+    Running jobs whose lease ran out belonged to a worker that died and are
+    claimed again; rows locked by another worker are skipped.
+    """
+    due = (
+        select(ReportGenerationJob.id)
+        .where(
+            ReportGenerationJob.status.in_(
+                [GenerationJobStatus.queued.value, GenerationJobStatus.running.value]
+            )
+        )
+        .where(ReportGenerationJob.available_at <= func.now())
+        .order_by(ReportGenerationJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(ReportGenerationJob)
+        .where(ReportGenerationJob.id.in_(due.scalar_subquery()))
+        .values(
+            status=GenerationJobStatus.running.value,
+            available_at=func.now() + lease,
+            attempts=ReportGenerationJob.attempts + 1,
+        )
+        .returning(ReportGenerationJob)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    result = await db.session.execute(stmt)
+    jobs = sorted(result.scalars().all(), key=lambda job: job.id)
+    await db.commit()
+    return jobs
+
+
+async def finish_generation_job(job_id: int) -> None:
+    await _set_job(
+        job_id, status=GenerationJobStatus.succeeded.value, finished_at=func.now()
+    )
+
+
+async def retry_generation_job(job_id: int, error: str, delay: timedelta) -> None:
+    await _set_job(
+        job_id,
+        status=GenerationJobStatus.queued.value,
+        available_at=func.now() + delay,
+        last_error=error,
+    )
+
+
+async def fail_generation_job(job_id: int, error: str) -> None:
+    await _set_job(
+        job_id,
+        status=GenerationJobStatus.failed.value,
+        finished_at=func.now(),
+        last_error=error,
+    )
+
+
+async def _set_job(job_id: int, **values) -> None:
+    stmt = (
+        update(ReportGenerationJob)
+        .where(ReportGenerationJob.id == job_id)
+        .values(**values)
+    )
+    await db.session.execute(stmt.execution_options(synchronize_session=False))
+    await db.commit()
@@ -0,0 +1,74 @@
+from datetime import timedelta
+from typing import List
+
+from sqlalchemy import delete, func, insert, select, update
+
+from src.db import db
+from src.db.models.outbox import OutboxEvent
+
+
+async def create_outbox_events(events: List[dict]) -> None:
+    """Append events in the current transaction with one multi-row INSERT"""
+    if not events:
+        return
+    await db.session.execute(insert(OutboxEvent), events)
+    await db.commit()
+
+
+async def claim_outbox_events(limit: int, lease: timedelta) -> List[OutboxEvent]:
+    """Lease up to limit due events to the caller.
+
+    Rows locked by another worker are skipped, and leased rows are hidden
+    from other workers until the lease runs out, so an event is redelivered
+    only if its worker died or was too slow.
+    """
+    due = (
+        select(OutboxEvent.id)
+        .where(OutboxEvent.failed_at.is_(None))
+        .where(OutboxEvent.available_at <= func.now())
+        .order_by(OutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(OutboxEvent)
+        .where(OutboxEvent.id.in_(due.scalar_subquery()))
+        .values(
+            available_at=func.now() + lease,
+            attempts=OutboxEvent.attempts + 1,
+        )
+        .returning(OutboxEvent)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    result = await db.session.execute(stmt)
+    events = sorted(result.scalars().all(), key=lambda event: event.id)
+    await db.commit()
+    return events
+
+
+async def delete_outbox_events(event_ids: List[int]) -> None:
+    if not event_ids:
+        return
+    stmt = delete(OutboxEvent).where(OutboxEvent.id.in_(event_ids))
+    await db.session.execute(stmt.execution_options(synchronize_session=False))
+    await db.commit()
+
+
+async def retry_outbox_event(event_id: int, error: str, delay: timedelta) -> None:
+    stmt = (
+        update(OutboxEvent)
+        .where(OutboxEvent.id == event_id)
+        .values(available_at=func.now() + delay, last_error=error)
+    )
+    await db.session.execute(stmt.execution_options(synchronize_session=False))
+    await db.commit()
+
+
+async def fail_outbox_event(event_id: int, error: str) -> None:
+    stmt = (
+        update(OutboxEvent)
+        .where(OutboxEvent.id == event_id)
+        .values(failed_at=func.now(), last_error=error)
+    )
+    await db.session.execute(stmt.execution_options(synchronize_session=False))
+    await db.commit()
@@ -1,10 +1,13 @@
-from datetime import datetime
 from typing import Any, List, Optional
 
-from sqlalchemy import or_, select
+from sqlalchemy import Text, cast, delete, func, insert, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
 from sqlalchemy.orm import joinedload
 
 from src.db import db
+from src.db.dao import change_log_dao
+from src.db.dao.base import update_by_id
+from src.db.models.change_log import ChangeEntityType, ChangeOperation
 from src.db.models.report import (
     Report,
     ReportEvent,
@@ -57,35 +60,76 @@ async def get_study_by_id(study_id: int) -> Optional[Study]:
     return result.scalar_one_or_none()
 
 
+async def get_studies_by_ids(study_ids: List[int]) -> List[Study]:
+    if not study_ids:
+        return []
+    stmt = select(Study).where(Study.id.in_(study_ids))
+    result = await db.session.execute(stmt)
+    return result.scalars().all()
+
+
 async def create_study(study_data: dict) -> Study:
     study = Study(**study_data)
     db.session.add(study)
-    await db.session.commit()
-    await db.session.refresh(study)
+    await db.session.flush()
+    await change_log_dao.record_changes(
+        ChangeEntityType.study, ChangeOperation.created, [study.id]
+    )
+    await db.commit()
     return study
 
 
 async def update_study(study_id: int, study_data: dict) -> Optional[Study]:
-    stmt = select(Study).where(Study.id == study_id)
-    result = await db.session.execute(stmt)
-    study = result.scalar_one_or_none()
-    if study:
-        for key, value in study_data.items():
-            setattr(study, key, value)
-        await db.session.commit()
-        await db.session.refresh(study)
+    async with db.unit_of_work():
+        study = await update_by_id(Study, study_id, study_data)
+        if study is not None and study_data:
+            await change_log_dao.record_changes(
+                ChangeEntityType.study, ChangeOperation.updated, [study.id]
+            )
     return study
 
 
 async def delete_study(study_id: int) -> bool:
-    stmt = select(Study).where(Study.id == study_id)
+    """Delete a study; templates, reports and their history cascade in Postgres"""
+    # Cascaded report deletes happen in Postgres, so log them up front
+    await change_log_dao.record_changes_from(
+        ChangeEntityType.report,
+        ChangeOperation.deleted,
+        select(Report.id).where(Report.study_id == study_id),
+    )
+    stmt = delete(Study).where(Study.id == study_id).returning(Study.id)
     result = await db.session.execute(stmt)
-    study = result.scalar_one_or_none()
-    if study:
-        await db.session.delete(study)
-        await db.session.commit()
-        return True
-    return False
+    deleted = result.scalar_one_or_none() is not None
+    if deleted:
+        await change_log_dao.record_changes(
+            ChangeEntityType.study, ChangeOperation.deleted, [study_id]
+        )
+    await db.commit()
+    return deleted
+
+
+async def count_reports_by_study_id(study_id: int) -> int:
+    stmt = select(func.count()).select_from(Report).where(Report.study_id == study_id)
+    result = await db.session.execute(stmt)
+    return result.scalar_one()
+
+
+async def delete_reports_by_study_id_chunk(study_id: int, limit: int) -> int:
+    """Delete up to limit reports of a study in their own transaction"""
+    chunk = select(Report.id).where(Report.study_id == study_id).limit(limit)
+    stmt = (
+        delete(Report)
+        .where(Report.id.in_(chunk.scalar_subquery()))
+        .returning(Report.id)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.session.execute(stmt)
+    report_ids = result.scalars().all()
+    await change_log_dao.record_changes(
+        ChangeEntityType.report, ChangeOperation.deleted, report_ids
+    )
+    await db.commit()
+    return len(report_ids)
 
 
 async def get_templates_by_study_id(study_id: int) -> List[StudyTemplate]:
@@ -167,37 +211,103 @@ async def get_reports_by_user_id(user_id: int) -> List[Report]:
     return result.scalars().all()
 
 
+async def get_reports_by_ids(report_ids: List[int]) -> List[Report]:
+    if not report_ids:
+        return []
+    stmt = select(Report).where(Report.id.in_(report_ids))
+    result = await db.session.execute(stmt)
+    return result.scalars().all()
+
+
 async def create_report(report_data: dict) -> Report:
     report = Report(**report_data)
     db.session.add(report)
-    await db.session.commit()
-    await db.session.refresh(report)
+    await db.session.flush()
+    await change_log_dao.record_changes(
+        ChangeEntityType.report, ChangeOperation.created, [report.id]
+    )
+    await db.commit()
     return report
 
 
-async def update_report(report_id: int, report_data: dict) -> Optional[Report]:
-    stmt = select(Report).where(Report.id == report_id)
-    result = await db.session.execute(stmt)
-    report = result.scalar_one_or_none()
-    if report:
-        for key, value in report_data.items():
-            setattr(report, key, value)
-        # Set updated_at timestamp
-        report.updated_at = datetime.now()
-        await db.session.commit()
-        await db.session.refresh(report)
+async def create_reports(reports_data: List[dict]) -> List[Report]:
+    """Insert many reports with one multi-row INSERT ... RETURNING"""
+    if not reports_data:
+        return []
+    stmt = insert(Report).returning(Report, sort_by_parameter_order=True)
+    result = await db.session.scalars(stmt, reports_data)
+    reports = result.all()
+    await change_log_dao.record_changes(
+        ChangeEntityType.report,
+        ChangeOperation.created,
+        [report.id for report in reports],
+    )
+    await db.commit()
+    return reports
+
+
+async def update_report(
+    report_id: int, report_data: dict, expected_version: Optional[int] = None
+) -> Optional[Report]:
+    """Update a report, only if it is still at expected_version when given"""
+    values = {
+        **report_data,
+        "updated_at": func.now(),
+        "version": Report.version + 1,
+    }
+    criteria = []
+    if expected_version is not None:
+        criteria.append(Report.version == expected_version)
+    async with db.unit_of_work():
+        report = await update_by_id(Report, report_id, values, *criteria)
+        if report is not None:
+            await change_log_dao.record_changes(
+                ChangeEntityType.report, ChangeOperation.updated, [report.id]
+            )
     return report
 
 
+async def update_report_section(
+    report_id: int,
+    section: str,
+    text: Optional[str],
+    expected_version: Optional[int] = None,
+) -> Optional[Report]:
+    """Set (or, for no text, remove) one section of a structured report.
+
+    The new content is sent on its own and merged into section_data by
+    Postgres, so the rest of the body never leaves the database.
+    """
+    if text is None:
+        section_data = Report.section_data.op("-")(cast(section, Text))
+    else:
+        section_data = func.jsonb_set(
+            func.coalesce(Report.section_data, cast("{}", JSONB)),
+            cast(array([section]), ARRAY(Text)),
+            func.to_jsonb(cast(text, Text)),
+        )
+    return await update_report(
+        report_id, {"section_data": section_data}, expected_version
+    )
+
+
+async def get_report_version(report_id: int) -> Optional[int]:
+    stmt = select(Report.version).where(Report.id == report_id)
+    result = await db.session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
 async def delete_report(report_id: int) -> bool:
-    stmt = select(Report).where(Report.id == report_id)
+    """Delete a report; its history and events cascade in Postgres"""
+    stmt = delete(Report).where(Report.id == report_id).returning(Report.id)
     result = await db.session.execute(stmt)
-    report = result.scalar_one_or_none()
-    if report:
-        await db.session.delete(report)
-        await db.session.commit()
-        return True
-    return False
+    deleted = result.scalar_one_or_none() is not None
+    if deleted:
+        await change_log_dao.record_changes(
+            ChangeEntityType.report, ChangeOperation.deleted, [report_id]
+        )
+    await db.commit()
+    return deleted
 
 
 async def get_report_history_by_report_id(report_id: int) -> List[ReportHistory]:
@@ -210,3 +320,14 @@ async def get_report_events_by_report_id(report_id: int) -> List[ReportEvent]:
     stmt = select(ReportEvent).where(ReportEvent.report_id == report_id)
     result = await db.session.execute(stmt)
     return result.scalars().all()
+
+
+async def create_report_audit_entries(
+    history_rows: List[dict], event_rows: List[dict]
+) -> None:
+    """Append history and event rows, each kind with one multi-row INSERT"""
+    if history_rows:
+        await db.session.execute(insert(ReportHistory), history_rows)
+    if event_rows:
+        await db.session.execute(insert(ReportEvent), event_rows)
+    await db.commit()
@@ -1,9 +1,11 @@
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select
 
 from src.db import db
-from src.db.models.user import Organization, OrganizationMember, User
+from src.db.dao.base import update_by_id
+from src.db.models.user import Organization, OrganizationMember, TokenRevocation, User
 from src.utils.pagination import Connection, paginate
 
 
@@ -51,21 +53,12 @@ async def create_user(user_data: Dict[str, Any]) -> User:
     if "password" in user_data:
         user.set_password(user_data["password"])
     db.session.add(user)
-    await db.session.commit()
-    await db.session.refresh(user)
+    await db.commit()
     return user
 
 
 async def update_user(user_id: int, user_data: Dict[str, Any]) -> Optional[User]:
-    stmt = select(User).where(User.id == user_id)
-    result = await db.session.execute(stmt)
-    user = result.scalar_one_or_none()
-    if user:
-        for key, value in user_data.items():
-            setattr(user, key, value)
-        await db.session.commit()
-        await db.session.refresh(user)
-    return user
+    return await update_by_id(User, user_id, user_data)
 
 
 async def delete_user(user_id: int) -> bool:
@@ -74,7 +67,7 @@ async def delete_user(user_id: int) -> bool:
     user = result.scalar_one_or_none()
     if user:
         await db.session.delete(user)
-        await db.session.commit()
+        await db.commit()
         return True
     return False
 
@@ -109,45 +102,27 @@ async def get_organization_by_id(organization_id: int) -> Optional[Organization]
 async def create_organization(org_data: Dict[str, Any]) -> Organization:
     organization = Organization(**org_data)
     db.session.add(organization)
-    await db.session.commit()
-    await db.session.refresh(organization)
+    await db.commit()
     return organization
 
 
 async def update_organization(
     organization_id: int, org_data: Dict[str, Any]
 ) -> Optional[Organization]:
-    stmt = select(Organization).where(Organization.id == organization_id)
-    result = await db.session.execute(stmt)
-    organization = result.scalar_one_or_none()
-    if organization:
-        for key, value in org_data.items():
-            setattr(organization, key, value)
-        await db.session.commit()
-        await db.session.refresh(organization)
-    return organization
+    return await update_by_id(Organization, organization_id, org_data)
 
 
 async def delete_organization(organization_id: int) -> bool:
-    stmt = select(Organization).where(Organization.id == organization_id)
+    """Delete an organization; its memberships cascade in Postgres"""
+    stmt = (
+        delete(Organization)
+        .where(Organization.id == organization_id)
+        .returning(Organization.id)
+    )
     result = await db.session.execute(stmt)
-    organization = result.scalar_one_or_none()
-    if organization:
-        # First delete all organization members to avoid foreign key constraint violations
-        members_stmt = select(OrganizationMember).where(
-            OrganizationMember.organization_id == organization_id
-        )
-        members_result = await db.session.execute(members_stmt)
-        members = members_result.scalars().all()
-
-        for member in members:
-            await db.session.delete(member)
-
-        # Then delete the organization
-        await db.session.delete(organization)
-        await db.session.commit()
-        return True
-    return False
+    deleted = result.scalar_one_or_none() is not None
+    await db.commit()
+    return deleted
 
 
 async def get_organization_members(organization_id: int):
@@ -172,8 +147,7 @@ async def create_organization_member(user_id: int, organization_id: int, role: s
         user_id=user_id, organization_id=organization_id, role=role
     )
     db.session.add(member)
-    await db.session.commit()
-    await db.session.refresh(member)
+    await db.commit()
     return member
 
 
@@ -188,20 +162,44 @@ async def remove_organization_member(user_id: int, organization_id: int):
 
     if member:
         await db.session.delete(member)
-        await db.session.commit()
+        await db.commit()
         return True
     return False
 
 
 async def update_user_password_fields(user_id: int, **fields):
     """Update user password-related fields"""
-    stmt = select(User).where(User.id == user_id)
+    return await update_by_id(User, user_id, fields)
+
+
+async def create_token_revocation(user_id: int, reason: str) -> TokenRevocation:
+    """Record that all tokens issued to a user so far are revoked"""
+    revocation = TokenRevocation(
+        user_id=user_id, reason=reason, revoked_at=datetime.now(timezone.utc)
+    )
+    db.session.add(revocation)
+    await db.commit()
+    return revocation
+
+
+async def get_revoked_user_ids(horizon: int, revoked_since: datetime) -> List[int]:
+    """Get users revoked by transactions from horizon on, since revoked_since"""
+    stmt = (
+        select(TokenRevocation.user_id)
+        .where(
+            TokenRevocation.txid >= horizon,
+            TokenRevocation.revoked_at >= revoked_since,
+        )
+        .distinct()
+    )
     result = await db.session.execute(stmt)
-    user = result.scalar_one_or_none()
+    return list(result.scalars())
 
-    if user:
-        for field, value in fields.items():
-            setattr(user, field, value)
-        await db.session.commit()
-        await db.session.refresh(user)
-    return user
+
+async def get_latest_token_revocation(user_id: int) -> Optional[datetime]:
+    """Get the most recent revocation time for a user"""
+    stmt = select(func.max(TokenRevocation.revoked_at)).where(
+        TokenRevocation.user_id == user_id
+    )
+    result = await db.session.execute(stmt)
+    return result.scalar()
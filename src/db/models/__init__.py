@@ -1,3 +1,6 @@
+from src.db.models.change_log import EntityChange
+from src.db.models.generation import ReportGenerationJob
+from src.db.models.outbox import OutboxEvent
 from src.db.models.report import (
     Report,
     ReportEvent,
@@ -5,7 +8,7 @@ from src.db.models.report import (
     Study,
     StudyTemplate,
 )
-from src.db.models.user import Organization, User
+from src.db.models.user import Organization, TokenRevocation, User
 
 __all__ = [
     "User",
@@ -15,4 +18,8 @@ __all__ = [
     "Report",
     "ReportHistory",
     "ReportEvent",
+    "TokenRevocation",
+    "OutboxEvent",
+    "EntityChange",
+    "ReportGenerationJob",
 ]
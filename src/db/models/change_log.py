@@ -0,0 +1,44 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.models.base import Base
+
+
+class ChangeEntityType(str, Enum):
+    report = "report"
+    study = "study"
+
+
+class ChangeOperation(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+
+
+class EntityChange(Base):
+    """One create, update or delete of a synced entity, in commit-safe order.
+
+    seq alone is not a safe resume point: a transaction holding a lower seq
+    can commit after one holding a higher seq. Readers therefore page by
+    (txid, seq) and only past transactions that have all finished.
+    """
+
+    __tablename__ = "entity_change"
+    __table_args__ = (Index("ix_entity_change_txid_seq", "txid", "seq"),)
+
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # Id of the writing transaction
+    txid: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text("(pg_current_xact_id()::text)::bigint"),
+        nullable=False,
+    )
+    entity_type: Mapped[str] = mapped_column(String, nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    operation: Mapped[str] = mapped_column(String, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
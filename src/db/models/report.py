@@ -1,9 +1,9 @@
 from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, relationship
 
 from src.db.models.base import Base
@@ -20,15 +20,19 @@ class Study(Base):
     categories: List[str] = Column(ARRAY(String), default=list)
 
     templates: Mapped[List["StudyTemplate"]] = relationship(
-        "StudyTemplate", back_populates="study"
+        "StudyTemplate", back_populates="study", passive_deletes=True
+    )
+    reports: Mapped[List["Report"]] = relationship(
+        "Report", back_populates="study", passive_deletes=True
     )
-    reports: Mapped[List["Report"]] = relationship("Report", back_populates="study")
 
 
 class StudyTemplate(Base):
     __tablename__ = "studytemplate"
     id: Optional[int] = Column(Integer, primary_key=True, autoincrement=True)
-    study_id: int = Column(Integer, ForeignKey("study.id"), nullable=False)
+    study_id: int = Column(
+        Integer, ForeignKey("study.id", ondelete="CASCADE"), nullable=False
+    )
     section_names: List[str] = Column(ARRAY(String), default=list)
     created_at: datetime = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -45,33 +49,44 @@ class ReportStatus(str, Enum):
 class Report(Base):
     __tablename__ = "report"
     id: Optional[int] = Column(Integer, primary_key=True, autoincrement=True)
-    study_id: int = Column(Integer, ForeignKey("study.id"), nullable=False)
+    study_id: int = Column(
+        Integer, ForeignKey("study.id", ondelete="CASCADE"), nullable=False
+    )
     template_id: int = Column(Integer, ForeignKey("studytemplate.id"), nullable=False)
     user_id: int = Column(Integer, ForeignKey("user.id"), nullable=False)
     created_at: datetime = Column(DateTime(timezone=True), server_default=func.now())
     updated_at: Optional[datetime] = Column(DateTime(timezone=True), nullable=True)
     prompt_text: str = Column(String, nullable=False)
     result_text: Optional[str] = Column(String, nullable=True)
+    # Body of a structured report, keyed by template section name; when set
+    # it supersedes result_text, which is then rendered from it
+    section_data: Optional[Dict[str, str]] = Column(JSONB, nullable=True)
     status: ReportStatus = Column(String, default=ReportStatus.draft.value)
+    # Bumped by every update; writers pass the version they read to detect conflicts
+    version: int = Column(Integer, nullable=False, default=1, server_default="1")
 
     study: Mapped[Optional[Study]] = relationship("Study", back_populates="reports")
     template: Mapped["StudyTemplate"] = relationship("StudyTemplate")
     user: Mapped[Optional["User"]] = relationship("User")
     history: Mapped[List["ReportHistory"]] = relationship(
-        "ReportHistory", back_populates="report"
+        "ReportHistory", back_populates="report", passive_deletes=True
     )
     events: Mapped[List["ReportEvent"]] = relationship(
-        "ReportEvent", back_populates="report"
+        "ReportEvent", back_populates="report", passive_deletes=True
     )
 
 
 class ReportHistory(Base):
     __tablename__ = "reporthistory"
     id: Optional[int] = Column(Integer, primary_key=True, autoincrement=True)
-    report_id: int = Column(Integer, ForeignKey("report.id"), nullable=False)
+    report_id: int = Column(
+        Integer, ForeignKey("report.id", ondelete="CASCADE"), nullable=False
+    )
     timestamp: datetime = Column(DateTime(timezone=True), server_default=func.now())
     status: ReportStatus = Column(String, nullable=False)
     result_text: Optional[str] = Column(String, nullable=True)
+    # Set when only this section changed; result_text then holds just its text
+    section_name: Optional[str] = Column(String, nullable=True)
 
     report: Mapped[Optional[Report]] = relationship("Report", back_populates="history")
 
@@ -79,7 +94,9 @@ class ReportHistory(Base):
 class ReportEvent(Base):
     __tablename__ = "reportevent"
     id: Optional[int] = Column(Integer, primary_key=True, autoincrement=True)
-    report_id: int = Column(Integer, ForeignKey("report.id"), nullable=False)
+    report_id: int = Column(
+        Integer, ForeignKey("report.id", ondelete="CASCADE"), nullable=False
+    )
     event_type: str = Column(String, nullable=False)
     timestamp: datetime = Column(DateTime(timezone=True), server_default=func.now())
     details: Optional[str] = Column(String, nullable=True)
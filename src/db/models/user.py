@@ -3,7 +3,16 @@ from enum import Enum
 from typing import List, Optional
 
 import bcrypt
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.models.base import Base
@@ -28,7 +37,7 @@ class Organization(Base):
 
     created_by: Mapped["User"] = relationship("User", foreign_keys=[created_by_user_id])
     members: Mapped[List["OrganizationMember"]] = relationship(
-        "OrganizationMember", back_populates="organization"
+        "OrganizationMember", back_populates="organization", passive_deletes=True
     )
 
 
@@ -51,12 +60,14 @@ class User(Base):
         "OrganizationMember", back_populates="user"
     )
 
-    def set_password(self, plaintext_password: str) -> None:
+    @staticmethod
+    def hash_password(plaintext_password: str) -> str:
         """Hash password using bcrypt"""
         salt = bcrypt.gensalt()
-        self.password = bcrypt.hashpw(plaintext_password.encode("utf-8"), salt).decode(
-            "utf-8"
-        )
+        return bcrypt.hashpw(plaintext_password.encode("utf-8"), salt).decode("utf-8")
+
+    def set_password(self, plaintext_password: str) -> None:
+        self.password = User.hash_password(plaintext_password)
 
     def check_password(self, plaintext_password: str) -> bool:
         """Check password against stored hash"""
@@ -71,7 +82,7 @@ class OrganizationMember(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("user.id"), nullable=False)
     organization_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("organization.id"), nullable=False
+        Integer, ForeignKey("organization.id", ondelete="CASCADE"), nullable=False
     )
     role: Mapped[UserRole] = mapped_column(String, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -84,3 +95,25 @@ class OrganizationMember(Base):
     organization: Mapped["Organization"] = relationship(
         "Organization", back_populates="members"
     )
+
+
+class TokenRevocation(Base):
+    """Tokens issued to user_id at or before revoked_at are no longer valid"""
+
+    __tablename__ = "token_revocation"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # No foreign key: revocations must outlive deleted users
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    reason: Mapped[str] = mapped_column(String, nullable=False)
+    # Id of the writing transaction; ids are assigned before commit, so
+    # readers resume from a transaction horizon rather than the last id seen
+    txid: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text("(pg_current_xact_id()::text)::bigint"),
+        nullable=False,
+        index=True,
+    )
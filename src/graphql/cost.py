@@ -0,0 +1,241 @@
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLInterfaceType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    ValidationRule,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+)
+
+from src.config.settings import settings
+from src.utils.pagination import DEFAULT_PAGE_SIZE
+
+# Estimated rows returned by list fields that take no pagination arguments
+LIST_CARDINALITY: Dict[Tuple[str, str], int] = {
+    ("Study", "reports"): 100,
+    ("User", "reports"): 100,
+    ("Study", "templates"): 5,
+    ("Report", "history"): 20,
+    ("Report", "events"): 20,
+    ("Organization", "members"): 50,
+    ("User", "organizationMemberships"): 5,
+}
+DEFAULT_LIST_CARDINALITY = 10
+
+# List fields that, like a connection's edges, hold one page of their parent
+# field and so are sized by its first/last argument
+PAGE_LIST_FIELDS = {("ChangeFeed", "changes")}
+
+# Cost of resolving one object-typed field (typically one query); scalars are free
+OBJECT_FIELD_COST = 1
+
+_query_cost: ContextVar[Optional[Dict[str, int]]] = ContextVar(
+    "query_cost", default=None
+)
+
+
+def get_query_cost() -> Optional[Dict[str, int]]:
+    """Cost computed while validating the current operation, if any"""
+    return _query_cost.get()
+
+
+def reset_query_cost() -> None:
+    _query_cost.set(None)
+
+
+def _page_size(
+    field: GraphQLField, node: FieldNode, variables: Dict[str, Any]
+) -> Optional[int]:
+    """Requested page size of a paginated field, or None if not paginated"""
+    if "first" not in field.args and "last" not in field.args:
+        return None
+    for argument in node.arguments:
+        if argument.name.value not in ("first", "last"):
+            continue
+        value: Any = None
+        if isinstance(argument.value, IntValueNode):
+            value = argument.value.value
+        elif isinstance(argument.value, VariableNode):
+            value = variables.get(argument.value.name.value)
+        try:
+            return max(0, int(value))
+        except (TypeError, ValueError):
+            return DEFAULT_PAGE_SIZE
+    # Not given; resolvers then return a default-sized page
+    return DEFAULT_PAGE_SIZE
+
+
+class _CostCalculator:
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        fragments: Dict[str, FragmentDefinitionNode],
+        variables: Dict[str, Any],
+    ):
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables
+
+    def selection_set(
+        self,
+        parent_type: Any,
+        selection_set: SelectionSetNode,
+        depth: int,
+        page_size: Optional[int] = None,
+        visited: frozenset = frozenset(),
+    ) -> Tuple[int, int]:
+        """Return (cost, depth) of a selection set"""
+        total_cost, max_depth = 0, depth
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost, field_depth = self.field(parent_type, selection, depth, page_size)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    fragment_type = self.schema.get_type(
+                        selection.type_condition.name.value
+                    )
+                cost, field_depth = self.selection_set(
+                    fragment_type, selection.selection_set, depth, page_size, visited
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                # Unknown and cyclic fragments are reported by the standard rules
+                if fragment is None or name in visited:
+                    continue
+                cost, field_depth = self.selection_set(
+                    self.schema.get_type(fragment.type_condition.name.value),
+                    fragment.selection_set,
+                    depth,
+                    page_size,
+                    visited | {name},
+                )
+            else:
+                continue
+            total_cost += cost
+            max_depth = max(max_depth, field_depth)
+        return total_cost, max_depth
+
+    def field(
+        self, parent_type: Any, node: FieldNode, depth: int, page_size: Optional[int]
+    ) -> Tuple[int, int]:
+        if not isinstance(parent_type, (GraphQLObjectType, GraphQLInterfaceType)):
+            return 0, depth
+        field = parent_type.fields.get(node.name.value)
+        if field is None:
+            return 0, depth
+
+        field_type = get_named_type(field.type)
+        if not isinstance(field_type, (GraphQLObjectType, GraphQLInterfaceType)):
+            return 0, depth
+
+        multiplier = 1
+        if is_list_type(get_nullable_type(field.type)):
+            is_page = node.name.value == "edges" or (
+                (parent_type.name, node.name.value) in PAGE_LIST_FIELDS
+            )
+            if is_page and page_size is not None:
+                multiplier = page_size
+            else:
+                multiplier = LIST_CARDINALITY.get(
+                    (parent_type.name, node.name.value), DEFAULT_LIST_CARDINALITY
+                )
+
+        child_cost, child_depth = 0, depth + 1
+        if node.selection_set:
+            child_cost, child_depth = self.selection_set(
+                field_type,
+                node.selection_set,
+                depth + 1,
+                _page_size(field, node, self.variables),
+            )
+        return multiplier * (OBJECT_FIELD_COST + child_cost), child_depth
+
+    def operation(self, operation: OperationDefinitionNode) -> Tuple[int, int]:
+        root_type = self.schema.get_root_type(operation.operation)
+        if root_type is None:
+            return 0, 0
+        return self.selection_set(root_type, operation.selection_set, 0)
+
+
+def calculate_cost(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    variables: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Tuple[int, int]]:
+    """Static (cost, depth) of every operation in a document, by operation name"""
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    calculator = _CostCalculator(schema, fragments, variables or {})
+    return {
+        (definition.name.value if definition.name else ""): calculator.operation(
+            definition
+        )
+        for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+    }
+
+
+def query_cost_validation_rules(
+    context: Any, document: DocumentNode, data: Dict[str, Any]
+) -> list:
+    """Ariadne validation_rules hook adding depth and cost limits"""
+    variables = data.get("variables") or {}
+    max_depth = settings.GRAPHQL_MAX_DEPTH
+    max_cost = settings.GRAPHQL_MAX_COST
+
+    class QueryCostRule(ValidationRule):
+        def enter_document(self, node: DocumentNode, *_: Any) -> Any:
+            costs = calculate_cost(self.context.schema, node, variables)
+            for operation in node.definitions:
+                if not isinstance(operation, OperationDefinitionNode):
+                    continue
+                name = operation.name.value if operation.name else ""
+                cost, depth = costs[name]
+                if depth > max_depth:
+                    self.report_error(
+                        GraphQLError(
+                            f"Query depth {depth} exceeds the maximum of {max_depth}",
+                            operation,
+                        )
+                    )
+                if cost > max_cost:
+                    self.report_error(
+                        GraphQLError(
+                            f"Query cost {cost} exceeds the maximum of {max_cost}",
+                            operation,
+                        )
+                    )
+
+            if costs:
+                cost, depth = max(costs.values())
+                _query_cost.set(
+                    {
+                        "cost": cost,
+                        "maxCost": max_cost,
+                        "depth": depth,
+                        "maxDepth": max_depth,
+                    }
+                )
+            return self.SKIP
+
+    return [QueryCostRule]
@@ -1,3 +1,4 @@
+from inspect import isawaitable
 from typing import Any, Dict
 
 from ariadne import SchemaDirectiveVisitor
@@ -16,6 +17,21 @@ def _default_resolver(obj, info, **args):
     return getattr(obj, info.field_name)
 
 
+def _check_authenticated(info: GraphQLResolveInfo) -> None:
+    user = get_current_user()
+    if not user:
+        raise AuthenticationError("Authentication required")
+
+    # Check if password change is required
+    if user.password_must_change:
+        # Only allow changePassword mutation
+        operation_name = info.field_name
+        if operation_name != "changePassword":
+            raise PasswordChangeRequiredError(
+                "Password must be changed before accessing other operations"
+            )
+
+
 class AuthDirective(SchemaDirectiveVisitor):
     """Legacy auth directive - kept for compatibility"""
 
@@ -36,22 +52,23 @@ class RequiresAuthDirective(SchemaDirectiveVisitor):
         original_resolver = field.resolve or _default_resolver
 
         async def auth_required_resolver(obj, info: GraphQLResolveInfo, **kwargs):
-            user = get_current_user()
-            if not user:
-                raise AuthenticationError("Authentication required")
-
-            # Check if password change is required
-            if user.password_must_change:
-                # Only allow changePassword mutation
-                operation_name = info.field_name
-                if operation_name != "changePassword":
-                    raise PasswordChangeRequiredError(
-                        "Password must be changed before accessing other operations"
-                    )
-
+            _check_authenticated(info)
             return await original_resolver(obj, info, **kwargs)
 
         field.resolve = auth_required_resolver
+
+        # Subscriptions are authorized once, when the event stream is opened
+        if field.subscribe is not None:
+            original_subscribe = field.subscribe
+
+            async def auth_required_subscribe(obj, info: GraphQLResolveInfo, **kwargs):
+                _check_authenticated(info)
+                result = original_subscribe(obj, info, **kwargs)
+                if isawaitable(result):
+                    result = await result
+                return result
+
+            field.subscribe = auth_required_subscribe
         return field
 
 
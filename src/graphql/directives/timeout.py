@@ -0,0 +1,28 @@
+import inspect
+
+from ariadne import SchemaDirectiveVisitor
+from graphql import GraphQLField, GraphQLResolveInfo
+
+from src.utils.deadline import deadline
+
+
+def _default_resolver(obj, info, **args):
+    return getattr(obj, info.field_name)
+
+
+class TimeoutDirective(SchemaDirectiveVisitor):
+    """Directive that gives a field a tighter time budget than its operation"""
+
+    def visit_field_definition(self, field: GraphQLField, object_type):
+        original_resolver = field.resolve or _default_resolver
+        seconds = self.args.get("seconds")
+
+        async def timeout_resolver(obj, info: GraphQLResolveInfo, **kwargs):
+            async with deadline(seconds):
+                result = original_resolver(obj, info, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+
+        field.resolve = timeout_resolver
+        return field
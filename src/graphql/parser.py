@@ -0,0 +1,69 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from graphql import (
+    DocumentNode,
+    OperationDefinitionNode,
+    OperationType,
+    parse,
+    print_ast,
+)
+
+from src.config.settings import settings
+from src.db import db
+
+
+@lru_cache(maxsize=1024)
+def _parse(query: str) -> DocumentNode:
+    return parse(query)
+
+
+@lru_cache(maxsize=1024)
+def normalize_query(query: str) -> str:
+    """Canonical text of a query, independent of whitespace and comments"""
+    return print_ast(_parse(query))
+
+
+def get_operation_type(
+    query: str, operation_name: Optional[str] = None
+) -> Optional[OperationType]:
+    operation = get_operation(_parse(query), operation_name)
+    return operation.operation if operation is not None else None
+
+
+def get_operation(
+    document: DocumentNode, operation_name: Optional[str] = None
+) -> Optional[OperationDefinitionNode]:
+    """Find the operation a request will execute, if it can be determined"""
+    operations = [
+        definition
+        for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+    ]
+    if operation_name is None:
+        return operations[0] if len(operations) == 1 else None
+    for operation in operations:
+        if operation.name and operation.name.value == operation_name:
+            return operation
+    return None
+
+
+def parse_query(context: Any, data: Dict[str, Any]) -> DocumentNode:
+    """Parse (with caching) the request's query document.
+
+    Requests executing a query operation only read, so their database
+    session is switched to autocommit before it is created. Mutation
+    operations open a unit of work spanning the whole operation when
+    GRAPHQL_TRANSACTION_SCOPE is "operation".
+    """
+    document = _parse(data["query"])
+    operation = get_operation(document, data.get("operationName"))
+    if operation is not None and operation.operation == OperationType.QUERY:
+        db.mark_read_only()
+    elif (
+        operation is not None
+        and operation.operation == OperationType.MUTATION
+        and settings.GRAPHQL_TRANSACTION_SCOPE == "operation"
+    ):
+        db.begin_unit_of_work()
+    return document
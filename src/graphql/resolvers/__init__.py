@@ -9,12 +9,19 @@ from src.graphql.resolvers.report import (
     study_template_type,
     study_type,
 )
+from src.graphql.resolvers.subscription import subscription
+from src.graphql.resolvers.sync import change_feed_type, entity_change_type
 from src.graphql.resolvers.user import (
     organization_member_type,
     organization_type,
     user_type,
 )
-from src.graphql.types.enums import report_status_enum
+from src.graphql.types.enums import (
+    change_entity_type_enum,
+    change_operation_enum,
+    report_status_enum,
+)
+from src.graphql.types.scalars import datetime_scalar, sync_token_scalar
 
 # Pagination types
 page_info_type = ObjectType("PageInfo")
@@ -167,6 +174,7 @@ def resolve_auth_payload_must_change_password(auth_payload, *_):
 resolvers = [
     query,
     mutation,
+    subscription,
     user_type,
     report_type,
     study_type,
@@ -177,6 +185,10 @@ resolvers = [
     organization_member_type,
     auth_payload_type,
     report_status_enum,
+    change_entity_type_enum,
+    change_operation_enum,
+    datetime_scalar,
+    sync_token_scalar,
     page_info_type,
     user_connection_type,
     user_edge_type,
@@ -188,4 +200,6 @@ resolvers = [
     study_edge_type,
     report_connection_type,
     report_edge_type,
+    entity_change_type,
+    change_feed_type,
 ]
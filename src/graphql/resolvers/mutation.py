@@ -9,8 +9,10 @@ mutation = MutationType()
 
 
 @mutation.field("login")
-async def resolve_login(*_, email, password):
-    return await AuthService.login(email, password)
+async def resolve_login(_, info, email, password):
+    request = info.context["request"]
+    client_ip = request.client.host if request.client else None
+    return await AuthService.login(email, password, client_ip)
 
 
 @mutation.field("changePassword")
@@ -79,9 +81,25 @@ async def resolve_create_report(*_, input):
     return await ReportService.create_report(input_with_user)
 
 
+@mutation.field("createReports")
+async def resolve_create_reports(*_, inputs):
+    current_user = get_current_user()
+    inputs_with_user = [{**input, "userId": current_user.id} for input in inputs]
+    return await ReportService.create_reports(inputs_with_user)
+
+
 @mutation.field("updateReport")
-async def resolve_update_report(*_, id, input):
-    return await ReportService.update_report(int(id), input)
+async def resolve_update_report(*_, id, input, expectedVersion=None):
+    return await ReportService.update_report(int(id), input, expectedVersion)
+
+
+@mutation.field("updateReportSection")
+async def resolve_update_report_section(
+    *_, reportId, section, text=None, expectedVersion=None
+):
+    return await ReportService.update_report_section(
+        int(reportId), section, text, expectedVersion
+    )
 
 
 @mutation.field("deleteReport")
@@ -1,6 +1,7 @@
 from ariadne import QueryType
 
 from src.services.report_service import ReportService
+from src.services.sync_service import SyncService
 from src.services.user_service import UserService
 
 query = QueryType()
@@ -48,3 +49,8 @@ async def resolve_reports(
 @query.field("report")
 async def resolve_report(*_, id):
     return await ReportService.get_report_by_id(int(id))
+
+
+@query.field("changes")
+async def resolve_changes(*_, since=None, first=None):
+    return await SyncService.get_changes(since, first)
@@ -17,18 +17,18 @@ def resolve_report_prompt_text(report, *_):
 
 
 @report_type.field("resultText")
-def resolve_report_result_text(report, *_):
-    return report.result_text
+async def resolve_report_result_text(report, *_):
+    return await ReportService.get_report_text(report)
 
 
 @report_type.field("createdAt")
 def resolve_report_created_at(report, *_):
-    return report.created_at.isoformat() if report.created_at else None
+    return report.created_at
 
 
 @report_type.field("updatedAt")
 def resolve_report_updated_at(report, *_):
-    return report.updated_at.isoformat() if report.updated_at else None
+    return report.updated_at
 
 
 @report_type.field("study")
@@ -58,6 +58,11 @@ async def resolve_report_events(report, *_):
     return await ReportService.get_report_events_by_report_id(report.id)
 
 
+@report_type.field("sections")
+async def resolve_report_sections(report, *_):
+    return await ReportService.get_report_sections(report)
+
+
 @study_type.field("templates")
 async def resolve_study_templates(study, *_):
     return await ReportService.get_templates_by_study_id(study.id)
@@ -86,7 +91,7 @@ async def resolve_event_report(event, *_):
 # Study field resolvers for camelCase mapping
 @study_type.field("createdAt")
 def resolve_study_created_at(study, *_):
-    return study.created_at.isoformat() if study.created_at else None
+    return study.created_at
 
 
 # StudyTemplate field resolvers for camelCase mapping
@@ -97,7 +102,7 @@ def resolve_template_section_names(template, *_):
 
 @study_template_type.field("createdAt")
 def resolve_template_created_at(template, *_):
-    return template.created_at.isoformat() if template.created_at else None
+    return template.created_at
 
 
 # ReportHistory field resolvers for camelCase mapping
@@ -106,6 +111,11 @@ def resolve_history_result_text(history, *_):
     return history.result_text
 
 
+@report_history_type.field("sectionName")
+def resolve_history_section_name(history, *_):
+    return history.section_name
+
+
 # ReportEvent field resolvers for camelCase mapping
 @report_event_type.field("eventType")
 def resolve_event_type(event, *_):
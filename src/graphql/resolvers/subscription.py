@@ -0,0 +1,15 @@
+from ariadne import SubscriptionType
+
+from src.services.report_subscription_service import ReportSubscriptionService
+
+subscription = SubscriptionType()
+
+
+@subscription.source("reportUpdated")
+def source_report_updated(*_, filter=None):
+    return ReportSubscriptionService.subscribe(filter)
+
+
+@subscription.field("reportUpdated")
+async def resolve_report_updated(delta, *_, **__):
+    return delta
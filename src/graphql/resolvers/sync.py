@@ -0,0 +1,45 @@
+from ariadne import ObjectType
+
+from src.db.models.change_log import ChangeEntityType
+
+entity_change_type = ObjectType("EntityChange")
+change_feed_type = ObjectType("ChangeFeed")
+
+
+@entity_change_type.field("entityType")
+def resolve_entity_change_entity_type(change, *_):
+    return change.entity_type
+
+
+@entity_change_type.field("entityId")
+def resolve_entity_change_entity_id(change, *_):
+    return change.entity_id
+
+
+@entity_change_type.field("changedAt")
+def resolve_entity_change_changed_at(change, *_):
+    return change.changed_at
+
+
+@entity_change_type.field("report")
+def resolve_entity_change_report(change, *_):
+    if change.entity_type == ChangeEntityType.report:
+        return change.entity
+    return None
+
+
+@entity_change_type.field("study")
+def resolve_entity_change_study(change, *_):
+    if change.entity_type == ChangeEntityType.study:
+        return change.entity
+    return None
+
+
+@change_feed_type.field("syncToken")
+def resolve_change_feed_sync_token(feed, *_):
+    return feed.sync_token
+
+
+@change_feed_type.field("hasMore")
+def resolve_change_feed_has_more(feed, *_):
+    return feed.has_more
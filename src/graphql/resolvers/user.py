@@ -26,7 +26,7 @@ def resolve_user_phone_number(user, *_):
 
 @user_type.field("createdAt")
 def resolve_user_created_at(user, *_):
-    return user.created_at.isoformat() if user.created_at else None
+    return user.created_at
 
 
 @user_type.field("mustChangePassword")
@@ -73,4 +73,4 @@ async def resolve_organization_member_organization(member, *_):
 
 @organization_member_type.field("createdAt")
 def resolve_organization_member_created_at(member, *_):
-    return member.created_at.isoformat() if member.created_at else None
+    return member.created_at
@@ -3,6 +3,10 @@ from ariadne import gql
 type_defs = gql("""
     directive @requiresAuth on FIELD_DEFINITION
     directive @requiresRole(role: UserRole!) on FIELD_DEFINITION
+    directive @timeout(seconds: Float!) on FIELD_DEFINITION
+
+    scalar DateTime
+    scalar SyncToken
     
     type Query {
         users(first: Int, after: String, last: Int, before: String): UserConnection! @requiresAuth
@@ -11,8 +15,9 @@ type_defs = gql("""
         organization(id: ID!): Organization @requiresAuth
         studies(first: Int, after: String, last: Int, before: String, filter: StudyFilterInput): StudyConnection! @requiresAuth
         study(id: ID!): Study @requiresAuth
-        reports(first: Int, after: String, last: Int, before: String, filter: ReportFilterInput): ReportConnection! @requiresAuth
+        reports(first: Int, after: String, last: Int, before: String, filter: ReportFilterInput): ReportConnection! @requiresAuth @timeout(seconds: 10)
         report(id: ID!): Report @requiresAuth
+        changes(since: SyncToken, first: Int): ChangeFeed! @requiresAuth
     }
 
     type Mutation {
@@ -32,10 +37,21 @@ type_defs = gql("""
         updateStudy(id: ID!, input: UpdateStudyInput!): Study! @requiresAuth
         deleteStudy(id: ID!): Boolean! @requiresAuth
         createReport(input: CreateReportInput!): Report! @requiresAuth
-        updateReport(id: ID!, input: UpdateReportInput!): Report! @requiresAuth
+        createReports(inputs: [CreateReportInput!]!): [Report!]! @requiresAuth
+        updateReport(id: ID!, input: UpdateReportInput!, expectedVersion: Int): Report! @requiresAuth
+        updateReportSection(
+            reportId: ID!
+            section: String!
+            text: String
+            expectedVersion: Int
+        ): Report! @requiresAuth
         deleteReport(id: ID!): Boolean! @requiresAuth
     }
 
+    type Subscription {
+        reportUpdated(filter: ReportUpdateFilterInput): ReportDelta! @requiresAuth
+    }
+
     enum UserRole {
         Owner
         Radiologist
@@ -53,7 +69,7 @@ type_defs = gql("""
         lastName: String!
         email: String!
         phoneNumber: String
-        createdAt: String!
+        createdAt: DateTime!
         mustChangePassword: Boolean!
         organizationMemberships: [OrganizationMember!]!
         reports: [Report!]!
@@ -74,14 +90,14 @@ type_defs = gql("""
         user: User!
         organization: Organization!
         role: UserRole!
-        createdAt: String!
+        createdAt: DateTime!
     }
 
     type Study {
         id: ID!
         name: String!
         categories: [String!]!
-        createdAt: String!
+        createdAt: DateTime!
         templates: [StudyTemplate!]!
         reports: [Report!]!
     }
@@ -89,7 +105,7 @@ type_defs = gql("""
     type StudyTemplate {
         id: ID!
         sectionNames: [String!]!
-        createdAt: String!
+        createdAt: DateTime!
         study: Study!
     }
 
@@ -98,31 +114,74 @@ type_defs = gql("""
         promptText: String
         resultText: String
         status: ReportStatus!
-        createdAt: String!
-        updatedAt: String
+        createdAt: DateTime!
+        updatedAt: DateTime
+        version: Int!
         study: Study!
         template: StudyTemplate
         user: User!
         history: [ReportHistory!]!
         events: [ReportEvent!]!
+        sections: [ReportSection!]!
+    }
+
+    type ReportSection {
+        name: String!
+        content: String
+    }
+
+    type ReportDelta {
+        id: ID!
+        studyId: ID!
+        version: Int!
+        status: ReportStatus!
+        changedFields: [String!]!
+        updatedAt: DateTime
     }
 
     type ReportHistory {
         id: ID!
-        timestamp: String!
+        timestamp: DateTime!
         status: ReportStatus!
         resultText: String
+        sectionName: String
         report: Report!
     }
 
     type ReportEvent {
         id: ID!
         eventType: String!
-        timestamp: String!
+        timestamp: DateTime!
         details: String
         report: Report!
     }
 
+    enum ChangeEntityType {
+        REPORT
+        STUDY
+    }
+
+    enum ChangeOperation {
+        CREATED
+        UPDATED
+        DELETED
+    }
+
+    type EntityChange {
+        entityType: ChangeEntityType!
+        entityId: ID!
+        operation: ChangeOperation!
+        changedAt: DateTime!
+        report: Report
+        study: Study
+    }
+
+    type ChangeFeed {
+        changes: [EntityChange!]!
+        syncToken: SyncToken!
+        hasMore: Boolean!
+    }
+
     enum ReportStatus {
         DRAFT
         PRELIMINARY
@@ -186,6 +245,12 @@ type_defs = gql("""
         promptText: String
         resultText: String
         status: ReportStatus
+        sections: [ReportSectionInput!]
+    }
+
+    input ReportSectionInput {
+        name: String!
+        content: String
     }
 
     type PageInfo {
@@ -292,4 +357,10 @@ type_defs = gql("""
         templateId: ID
         studyCategories: [String!]
     }
+
+    input ReportUpdateFilterInput {
+        reportIds: [ID!]
+        studyId: ID
+        statuses: [ReportStatus!]
+    }
 """)
@@ -0,0 +1,31 @@
+import inspect
+
+from graphql import GraphQLSchema, default_field_resolver
+
+from src.db import db
+
+
+def make_mutations_transactional(schema: GraphQLSchema) -> GraphQLSchema:
+    """Run every mutation field in its own unit of work.
+
+    DAO commits inside a field only flush; the field commits once when its
+    resolver returns and rolls back if it raises. Fields already inside an
+    operation-wide unit of work join it instead.
+    """
+    if schema.mutation_type is None:
+        return schema
+
+    for field in schema.mutation_type.fields.values():
+        field.resolve = _transactional(field.resolve or default_field_resolver)
+    return schema
+
+
+def _transactional(resolver):
+    async def transactional_resolver(obj, info, **kwargs):
+        async with db.unit_of_work():
+            result = resolver(obj, info, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+    return transactional_resolver
@@ -1,5 +1,6 @@
 from ariadne import EnumType
 
+from src.db.models.change_log import ChangeEntityType, ChangeOperation
 from src.db.models.report import ReportStatus
 
 report_status_enum = EnumType(
@@ -11,3 +12,20 @@ report_status_enum = EnumType(
         "SIGNED_WITH_ADDENDUM": ReportStatus.signed_with_addendum.value,
     },
 )
+
+change_entity_type_enum = EnumType(
+    "ChangeEntityType",
+    {
+        "REPORT": ChangeEntityType.report.value,
+        "STUDY": ChangeEntityType.study.value,
+    },
+)
+
+change_operation_enum = EnumType(
+    "ChangeOperation",
+    {
+        "CREATED": ChangeOperation.created.value,
+        "UPDATED": ChangeOperation.updated.value,
+        "DELETED": ChangeOperation.deleted.value,
+    },
+)
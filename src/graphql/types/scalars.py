@@ -1,19 +1,34 @@
 from datetime import datetime
+from typing import Any
 
 from ariadne import ScalarType
 
+from src.utils.sync_token import decode_sync_token, encode_sync_token
+
 datetime_scalar = ScalarType("DateTime")
+sync_token_scalar = ScalarType("SyncToken")
 
 
 @datetime_scalar.serializer
-def serialize_datetime(value):
+def serialize_datetime(value: Any) -> Any:
+    # A string, as not every transport encodes with the response JSON codec
     if isinstance(value, datetime):
         return value.isoformat()
     return value
 
 
 @datetime_scalar.value_parser
-def parse_datetime_value(value):
+def parse_datetime_value(value: Any) -> Any:
     if isinstance(value, str):
         return datetime.fromisoformat(value.replace("Z", "+00:00"))
     return value
+
+
+@sync_token_scalar.serializer
+def serialize_sync_token(value):
+    return encode_sync_token(value)
+
+
+@sync_token_scalar.value_parser
+def parse_sync_token_value(value):
+    return decode_sync_token(value)
@@ -1,11 +1,27 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import List, Optional
 
 import jwt
 
+from src.api.auth_context import Principal
+from src.config.settings import settings
 from src.db.dao import user_dao
 from src.db.models.user import User
-from src.utils.exceptions import AuthenticationError
+from src.services.token_revocation_service import token_revocation_service
+from src.utils.exceptions import AuthenticationError, RateLimitExceededError
+from src.utils.rate_limit import TokenBucketPolicy, create_rate_limiter
+
+login_rate_limiter = create_rate_limiter(
+    settings.LOGIN_RATE_LIMIT_BACKEND, settings.REDIS_URL
+)
+LOGIN_IP_POLICY = TokenBucketPolicy.per_minute(
+    settings.LOGIN_RATE_LIMIT_IP_CAPACITY,
+    settings.LOGIN_RATE_LIMIT_IP_REFILL_PER_MINUTE,
+)
+LOGIN_EMAIL_POLICY = TokenBucketPolicy.per_minute(
+    settings.LOGIN_RATE_LIMIT_EMAIL_CAPACITY,
+    settings.LOGIN_RATE_LIMIT_EMAIL_REFILL_PER_MINUTE,
+)
 
 
 class AuthService:
@@ -23,14 +39,39 @@ class AuthService:
         return None
 
     @staticmethod
-    async def login(email: str, password: str) -> dict:
+    async def check_login_rate_limit(email: str, client_ip: Optional[str]) -> None:
+        """Reject login attempts over the per-IP or per-email budget"""
+        retry_after = await login_rate_limiter.acquire(
+            f"login:email:{email.strip().lower()}", LOGIN_EMAIL_POLICY
+        )
+        if client_ip:
+            retry_after = max(
+                retry_after,
+                await login_rate_limiter.acquire(
+                    f"login:ip:{client_ip}", LOGIN_IP_POLICY
+                ),
+            )
+        if retry_after > 0:
+            raise RateLimitExceededError(
+                "Too many login attempts, please try again later", retry_after
+            )
+
+    @staticmethod
+    async def login(email: str, password: str, client_ip: Optional[str] = None) -> dict:
         """Login user and return JWT token with user info"""
+        # Throttle before touching the database or running bcrypt
+        await AuthService.check_login_rate_limit(email, client_ip)
+
         user = await AuthService.authenticate_user(email, password)
         if not user:
             raise AuthenticationError("Invalid email or password")
 
-        # Create access token
-        access_token = AuthService.create_access_token(user.id)
+        memberships = await user_dao.get_user_organization_memberships(user.id)
+        access_token = AuthService.create_access_token(
+            user.id,
+            password_must_change=user.password_must_change,
+            organization_ids=sorted(m.organization_id for m in memberships),
+        )
 
         return {
             "token": access_token,
@@ -39,38 +80,80 @@ class AuthService:
         }
 
     @staticmethod
-    def create_access_token(user_id: int, expires_delta: timedelta = None) -> str:
+    def create_access_token(
+        user_id: int,
+        expires_delta: timedelta = None,
+        password_must_change: Optional[bool] = None,
+        organization_ids: Optional[List[int]] = None,
+    ) -> str:
         """Create JWT access token"""
         if expires_delta is None:
             expires_delta = timedelta(hours=24)
 
-        expire = datetime.now(timezone.utc) + expires_delta
-        to_encode = {"sub": str(user_id), "exp": expire}
+        now = datetime.now(timezone.utc)
+        to_encode = {
+            "sub": str(user_id),
+            "exp": now + expires_delta,
+            # Sub-second precision so a token issued right after a revocation
+            # is not mistaken for one issued before it
+            "iat": now.timestamp(),
+        }
+        # Embed the claims the auth directives need so most requests can
+        # authorize without loading the user row
+        if password_must_change is not None:
+            to_encode["pmc"] = password_must_change
+        if organization_ids is not None:
+            to_encode["orgs"] = organization_ids
         return jwt.encode(
             to_encode, AuthService.SECRET_KEY, algorithm=AuthService.ALGORITHM
         )
 
     @staticmethod
-    def verify_token(token: str) -> Optional[int]:
-        """Verify JWT token and return user ID"""
+    def decode_token(token: str) -> Optional[dict]:
+        """Verify JWT token and return its claims"""
         try:
             payload = jwt.decode(
                 token, AuthService.SECRET_KEY, algorithms=[AuthService.ALGORITHM]
             )
-            user_id = payload.get("sub")
-            if user_id is None:
-                return None
-            return int(user_id)
         except jwt.PyJWTError:
             return None
+        if payload.get("sub") is None:
+            return None
+        return payload
 
     @staticmethod
-    async def get_current_user(token: str) -> Optional[User]:
-        """Get current user from JWT token"""
-        user_id = AuthService.verify_token(token)
-        if user_id is None:
+    def verify_token(token: str) -> Optional[int]:
+        """Verify JWT token and return user ID"""
+        payload = AuthService.decode_token(token)
+        if payload is None:
             return None
-        return await user_dao.get_user_by_id(user_id)
+        return int(payload["sub"])
+
+    @staticmethod
+    async def get_current_user(token: str) -> Optional[Principal]:
+        """Get current principal from JWT token"""
+        payload = AuthService.decode_token(token)
+        if payload is None:
+            return None
+
+        user_id = int(payload["sub"])
+        if await token_revocation_service.is_revoked(user_id, payload.get("iat", 0)):
+            return None
+
+        organization_ids = tuple(payload.get("orgs", ()))
+        if payload.get("pmc") is False:
+            return Principal(
+                id=user_id,
+                password_must_change=False,
+                organization_ids=organization_ids,
+            )
+
+        # Tokens without claims, or issued while a password change was pending,
+        # are checked against the user row, which may have changed since.
+        user = await user_dao.get_user_by_id(user_id)
+        if user is None:
+            return None
+        return Principal.from_user(user, organization_ids)
 
     @staticmethod
     async def change_password(
@@ -85,12 +168,15 @@ class AuthService:
         if not user.check_password(current_password):
             raise AuthenticationError("Current password is incorrect")
 
-        # Set new password
-        user.set_password(new_password)
-
-        # Clear password change requirement and temp password
+        # Set new password, clearing the change requirement and temp password
         await user_dao.update_user_password_fields(
-            user_id, password_must_change=False, temp_password=None
+            user_id,
+            password=User.hash_password(new_password),
+            password_must_change=False,
+            temp_password=None,
         )
 
+        # Sessions opened with the old password must log in again
+        await token_revocation_service.revoke_user_tokens(user_id, "password_change")
+
         return True
@@ -0,0 +1,55 @@
+from typing import Iterable, List, Optional
+
+from src.db.dao import outbox_dao
+from src.db.models.report import Report
+
+REPORT_CREATED = "report.created"
+REPORT_UPDATED = "report.updated"
+REPORT_DELETED = "report.deleted"
+
+
+def report_payload(report: Report) -> dict:
+    return {
+        "id": report.id,
+        "studyId": report.study_id,
+        "templateId": report.template_id,
+        "userId": report.user_id,
+        "status": report.status,
+        "version": report.version,
+    }
+
+
+class OutboxService:
+    """Writes domain events to the outbox in the caller's unit of work"""
+
+    @staticmethod
+    async def report_events(
+        event_type: str, reports: Iterable[Report], changes: Optional[List[str]] = None
+    ) -> None:
+        events = []
+        for report in reports:
+            payload = report_payload(report)
+            if changes is not None:
+                payload["changes"] = changes
+            events.append(
+                {
+                    "aggregate_type": "report",
+                    "aggregate_id": report.id,
+                    "event_type": event_type,
+                    "payload": payload,
+                }
+            )
+        await outbox_dao.create_outbox_events(events)
+
+    @staticmethod
+    async def report_deleted(report_id: int) -> None:
+        await outbox_dao.create_outbox_events(
+            [
+                {
+                    "aggregate_type": "report",
+                    "aggregate_id": report_id,
+                    "event_type": REPORT_DELETED,
+                    "payload": {"id": report_id},
+                }
+            ]
+        )
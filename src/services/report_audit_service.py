@@ -0,0 +1,136 @@
+import asyncio
+import contextvars
+import logging
+from functools import partial
+from typing import List, Optional, Tuple
+
+from src.config.settings import settings
+from src.db import db
+from src.db.dao import report_dao
+
+logger = logging.getLogger(__name__)
+
+# (history rows, event rows) appended for one report change
+AuditRecord = Tuple[List[dict], List[dict]]
+
+
+class ReportAuditWriter:
+    """Appends ReportHistory and ReportEvent rows for report changes.
+
+    With "sync" durability the rows are inserted in the caller's unit of
+    work, so they commit or roll back together with the change. With
+    "batched" durability they are queued once the change commits, and a
+    background task writes the appends of many concurrent requests as
+    multi-row inserts; rows still queued when the process dies are lost.
+    Until start() is called, batched writes fall back to sync, and while
+    the queue is full they are written on their own after the commit.
+    """
+
+    def __init__(
+        self,
+        durability: str = settings.REPORT_AUDIT_DURABILITY,
+        batch_size: int = settings.REPORT_AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.REPORT_AUDIT_FLUSH_INTERVAL_SECONDS,
+        queue_size: int = settings.REPORT_AUDIT_QUEUE_SIZE,
+    ):
+        if durability not in ("sync", "batched"):
+            raise ValueError(f"Unknown report audit durability: {durability}")
+        self.durability = durability
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue[AuditRecord]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def record(self, history: List[dict], events: List[dict]) -> None:
+        if self._queue is None:
+            await report_dao.create_report_audit_entries(history, events)
+            return
+        # A change that rolls back must leave no trace in the history
+        db.after_commit(partial(self._enqueue, (history, events)))
+
+    async def _enqueue(self, record: AuditRecord) -> None:
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(record)
+                return
+            except asyncio.QueueFull:
+                logger.warning("Report audit queue is full, writing synchronously")
+        await self._write([record])
+
+    def start(self) -> None:
+        """Start the write-behind task when durability is "batched" """
+        if self.durability != "batched" or self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # A fresh context keeps request state out of the long-lived task
+        self._task = asyncio.create_task(
+            self._run(self._queue), context=contextvars.Context()
+        )
+
+    async def stop(self) -> None:
+        """Write everything still queued and stop the write-behind task"""
+        if self._task is None:
+            return
+        queue, self._queue = self._queue, None
+        if queue is not None:
+            await queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, queue: "asyncio.Queue[AuditRecord]") -> None:
+        while True:
+            batch = [await queue.get()]
+            # Give concurrent requests a moment to add to the same insert
+            loop = asyncio.get_running_loop()
+            flush_at = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = flush_at - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except TimeoutError:
+                    break
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _write(self, batch: List[AuditRecord]) -> None:
+        try:
+            await self._insert(batch)
+            return
+        except Exception:
+            if len(batch) == 1:
+                logger.exception("Could not write report audit record")
+                return
+            logger.warning(
+                "Could not write %d report audit records, retrying one by one",
+                len(batch),
+                exc_info=True,
+            )
+        # One bad record, say of a report deleted meanwhile, must not cost
+        # the others theirs
+        for record in batch:
+            try:
+                await self._insert([record])
+            except Exception:
+                logger.exception("Could not write report audit record")
+
+    async def _insert(self, batch: List[AuditRecord]) -> None:
+        history = [row for rows, _ in batch for row in rows]
+        events = [row for _, rows in batch for row in rows]
+        token = db.begin_scope()
+        try:
+            await report_dao.create_report_audit_entries(history, events)
+        finally:
+            await db.end_scope(token)
+
+
+report_audit_writer = ReportAuditWriter()
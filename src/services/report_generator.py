@@ -0,0 +1,40 @@
+import asyncio
+import hashlib
+from importlib import import_module
+from typing import Protocol
+
+from src.db.models.report import Report
+
+
+class ReportGenerator(Protocol):
+    async def generate(self, report: Report) -> str:
+        """Return the result text for the report's prompt"""
+        ...
+
+
+class StubReportGenerator:
+    """Deterministic offline generator for development and load tests.
+
+    The same prompt always produces the same text. latency simulates a
+    remote model so the job pipeline can be exercised under load.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    async def generate(self, report: Report) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        prompt = report.prompt_text.strip()
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+        return f"Findings: {prompt}\nImpression: Generated draft ({digest})."
+
+
+def create_report_generator(backend: str, latency: float = 0.0) -> ReportGenerator:
+    """Build the configured generator: "stub" or a "module:Class" path"""
+    if backend == "stub":
+        return StubReportGenerator(latency)
+    module_name, _, attribute = backend.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Unknown report generator backend: {backend}")
+    return getattr(import_module(module_name), attribute)()
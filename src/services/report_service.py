@@ -1,8 +1,21 @@
-from src.db.dao import report_dao
+from typing import Dict, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.db import db
+from src.db.dao import generation_job_dao, report_dao
+from src.db.models.report import ReportStatus
+from src.services.outbox_service import REPORT_CREATED, REPORT_UPDATED, OutboxService
+from src.services.report_audit_service import report_audit_writer
+from src.services.report_subscription_service import ReportSubscriptionService
+from src.services.template_engine import CompiledTemplate, template_engine
+from src.utils.background import run_in_background
+from src.utils.exceptions import ConflictError
 from src.utils.field_mapping import convert_dict_keys_to_snake_case
 
 
 class ReportService:
+    MAX_BULK_REPORTS = 1000
+
     @staticmethod
     async def get_all_studies():
         return await report_dao.get_all_studies()
@@ -33,6 +46,21 @@ class ReportService:
 
     @staticmethod
     async def delete_study(study_id: int):
+        report_count = await report_dao.count_reports_by_study_id(study_id)
+        if report_count <= settings.BULK_DELETE_THRESHOLD:
+            return await report_dao.delete_study(study_id)
+
+        # Cascading this many reports in one transaction would hold locks on
+        # the report tables for too long
+        run_in_background(ReportService.delete_study_in_chunks, study_id)
+        return True
+
+    @staticmethod
+    async def delete_study_in_chunks(
+        study_id: int, chunk_size: int = settings.BULK_DELETE_CHUNK_SIZE
+    ):
+        while await report_dao.delete_reports_by_study_id_chunk(study_id, chunk_size):
+            pass
         return await report_dao.delete_study(study_id)
 
     @staticmethod
@@ -69,7 +97,39 @@ class ReportService:
 
     @staticmethod
     async def create_report(input_data: dict):
-        # Validate required fields
+        ReportService._validate_report_input(input_data)
+
+        # Convert camelCase to snake_case for database
+        db_data = convert_dict_keys_to_snake_case(input_data)
+        async with db.unit_of_work():
+            report = await report_dao.create_report(db_data)
+            await OutboxService.report_events(REPORT_CREATED, [report])
+            await generation_job_dao.create_generation_jobs([report.id])
+        return report
+
+    @staticmethod
+    async def create_reports(inputs: List[dict]):
+        limit = ReportService.MAX_BULK_REPORTS
+        if len(inputs) > limit:
+            raise ValueError(f"At most {limit} reports can be created at once")
+        # Validate everything up front so a bad input creates nothing
+        for index, input_data in enumerate(inputs):
+            try:
+                ReportService._validate_report_input(input_data)
+            except ValueError as ex:
+                raise ValueError(f"inputs[{index}]: {ex}") from ex
+
+        db_data = [convert_dict_keys_to_snake_case(data) for data in inputs]
+        async with db.unit_of_work():
+            reports = await report_dao.create_reports(db_data)
+            await OutboxService.report_events(REPORT_CREATED, reports)
+            await generation_job_dao.create_generation_jobs(
+                [report.id for report in reports]
+            )
+        return reports
+
+    @staticmethod
+    def _validate_report_input(input_data: dict) -> None:
         if not input_data.get("studyId"):
             raise ValueError("Study ID is required")
         if not input_data.get("templateId"):
@@ -79,19 +139,277 @@ class ReportService:
         if not input_data.get("promptText") or not input_data.get("promptText").strip():
             raise ValueError("Prompt text is required")
 
-        # Convert camelCase to snake_case for database
-        db_data = convert_dict_keys_to_snake_case(input_data)
-        return await report_dao.create_report(db_data)
+    @staticmethod
+    async def get_report_text(report) -> Optional[str]:
+        """The report body, rendered from its sections if it is structured"""
+        if report.section_data is None:
+            return report.result_text
+        compiled = await ReportService._compile_template(report)
+        layout = ReportService._section_layout(compiled, report.section_data)
+        return layout.render(report.section_data)
+
+    @staticmethod
+    async def get_report_sections(report) -> List[dict]:
+        """The report's body split into its template's sections"""
+        compiled = await ReportService._compile_template(report)
+        if report.section_data is not None:
+            layout = ReportService._section_layout(compiled, report.section_data)
+            return [
+                {"name": name, "content": report.section_data.get(name)}
+                for name in layout.section_names
+            ]
+        if compiled is None:
+            return []
+        parsed = compiled.parse(report.result_text)
+        return [
+            {"name": name, "content": content}
+            for name, content in parsed.sections.items()
+        ]
+
+    @staticmethod
+    async def _compile_template(report) -> Optional[CompiledTemplate]:
+        template = None
+        if report.template_id:
+            template = await report_dao.get_template_by_id(report.template_id)
+        return template_engine.compile(template) if template is not None else None
+
+    @staticmethod
+    def _section_layout(
+        compiled: Optional[CompiledTemplate], section_data: Dict[str, str]
+    ) -> CompiledTemplate:
+        """Layout of stored sections: the template's, then any it since dropped"""
+        names = compiled.section_names if compiled is not None else ()
+        extra = [name for name in section_data if name not in names]
+        if compiled is not None and not extra:
+            return compiled
+        return CompiledTemplate(names + tuple(extra))
 
     @staticmethod
-    async def update_report(report_id: int, input_data: dict):
+    def _structure_sections(
+        compiled: CompiledTemplate, result_text: Optional[str]
+    ) -> Dict[str, str]:
+        """Split a plain result text into section data"""
+        parsed = compiled.parse(result_text)
+        values = {name: text for name, text in parsed.sections.items() if text}
+        if parsed.preamble and compiled.section_names:
+            # Text before the first heading stays at the top of the body
+            first = compiled.section_names[0]
+            values[first] = "\n\n".join(
+                text for text in (parsed.preamble, values.get(first)) if text
+            )
+        return values
+
+    @staticmethod
+    async def update_report(
+        report_id: int, input_data: dict, expected_version: Optional[int] = None
+    ):
+        if input_data.get("sections") is not None:
+            input_data, read_version = await ReportService._render_sections(
+                report_id, input_data
+            )
+            # Sections are merged into the text read above; don't lose a
+            # concurrent edit to it
+            if expected_version is None:
+                expected_version = read_version
+
         # Convert camelCase to snake_case for database
         db_data = convert_dict_keys_to_snake_case(input_data)
-        return await report_dao.update_report(report_id, db_data)
+        if "result_text" in db_data:
+            # A whole new body replaces any structured one
+            db_data.setdefault("section_data", None)
+        changes = sorted(
+            "sections" if key == "sectionData" else key for key in input_data
+        )
+        async with db.unit_of_work():
+            report = await report_dao.update_report(
+                report_id, db_data, expected_version
+            )
+            if report is None and expected_version is not None:
+                await ReportService._raise_conflict(report_id, expected_version)
+            if report is not None:
+                await ReportService._record_report_change(report, db_data)
+                await OutboxService.report_events(
+                    REPORT_UPDATED, [report], changes=changes
+                )
+                ReportSubscriptionService.publish_update(report, changes)
+        return report
+
+    @staticmethod
+    async def update_report_section(
+        report_id: int,
+        section: str,
+        text: Optional[str],
+        expected_version: Optional[int] = None,
+    ):
+        """Replace the content of one section; no text removes the section.
+
+        Only the section is written and recorded in the history. A report
+        still stored as plain result text is split into sections first.
+        """
+        report = await report_dao.get_report_by_id(report_id)
+        if report is None:
+            return None
+        compiled = await ReportService._compile_template(report)
+        if compiled is None:
+            raise ValueError("Report has no template to lay out sections")
+        if section not in compiled.section_names:
+            raise ValueError(f"Unknown report section: {section}")
+        text = text.strip() if text and text.strip() else None
+
+        async with db.unit_of_work():
+            if report.section_data is None:
+                values = ReportService._structure_sections(compiled, report.result_text)
+                if text is None:
+                    values.pop(section, None)
+                else:
+                    values[section] = text
+                # The body was split as read above; don't lose a concurrent
+                # edit to it
+                if expected_version is None:
+                    expected_version = report.version
+                report = await report_dao.update_report(
+                    report_id,
+                    {"section_data": values, "result_text": None},
+                    expected_version,
+                )
+            else:
+                report = await report_dao.update_report_section(
+                    report_id, section, text, expected_version
+                )
+            if report is None and expected_version is not None:
+                await ReportService._raise_conflict(report_id, expected_version)
+            if report is not None:
+                await report_audit_writer.record(
+                    [
+                        {
+                            "report_id": report.id,
+                            "status": report.status,
+                            "result_text": text,
+                            "section_name": section,
+                        }
+                    ],
+                    [
+                        {
+                            "report_id": report.id,
+                            "event_type": "section_updated",
+                            "details": f"Section {section} updated",
+                        }
+                    ],
+                )
+                await OutboxService.report_events(
+                    REPORT_UPDATED, [report], changes=["sections"]
+                )
+                ReportSubscriptionService.publish_update(report, ["sections"])
+        return report
+
+    @staticmethod
+    async def _raise_conflict(report_id: int, expected_version: int) -> None:
+        """Raise ConflictError unless the report no longer exists"""
+        current_version = await report_dao.get_report_version(report_id)
+        if current_version is not None:
+            raise ConflictError(
+                f"Report {report_id} was modified by someone else "
+                f"(version {current_version}, expected {expected_version})",
+                current_version,
+            )
+
+    @staticmethod
+    async def _render_sections(
+        report_id: int, input_data: dict
+    ) -> Tuple[dict, Optional[int]]:
+        """Replace a sections input with the body it amounts to.
+
+        That is the merged section data for a structured report and the
+        rendered result text otherwise. Sections not mentioned keep their
+        current content.
+        """
+        if input_data.get("resultText") is not None:
+            raise ValueError("Set either resultText or sections, not both")
+        data = {key: value for key, value in input_data.items() if key != "sections"}
+        report = await report_dao.get_report_by_id(report_id)
+        if report is None:
+            return data, None
+
+        compiled = await ReportService._compile_template(report)
+        if compiled is None:
+            raise ValueError("Report has no template to lay out sections")
+        unknown = [
+            section["name"]
+            for section in input_data["sections"]
+            if section["name"] not in compiled.section_names
+        ]
+        if unknown:
+            raise ValueError(f"Unknown report sections: {', '.join(unknown)}")
+        if report.section_data is not None:
+            values = dict(report.section_data)
+            for section in input_data["sections"]:
+                content = section.get("content")
+                if content is not None and content.strip():
+                    values[section["name"]] = content.strip()
+                else:
+                    values.pop(section["name"], None)
+            data["sectionData"] = values
+            return data, report.version
+
+        parsed = compiled.parse(report.result_text)
+        values = dict(parsed.sections)
+        for section in input_data["sections"]:
+            values[section["name"]] = section.get("content")
+        data["resultText"] = compiled.render(values, parsed.preamble)
+        return data, report.version
+
+    @staticmethod
+    async def apply_generated_result(report_id: int, version: int, result_text: str):
+        """Store a generated result and move the report to preliminary.
+
+        Raises ConflictError if the report changed since version was read,
+        and returns None if it was deleted.
+        """
+        return await ReportService.update_report(
+            report_id,
+            {"resultText": result_text, "status": ReportStatus.preliminary.value},
+            expected_version=version,
+        )
+
+    @staticmethod
+    async def _record_report_change(report, changes: dict) -> None:
+        events = []
+        if "status" in changes:
+            events.append(
+                {
+                    "report_id": report.id,
+                    "event_type": "status_changed",
+                    "details": f"Status changed to {report.status}",
+                }
+            )
+        if "result_text" in changes or "section_data" in changes:
+            events.append(
+                {
+                    "report_id": report.id,
+                    "event_type": "updated",
+                    "details": "Result text updated",
+                }
+            )
+        if not events:
+            return
+
+        history = [
+            {
+                "report_id": report.id,
+                "status": report.status,
+                "result_text": await ReportService.get_report_text(report),
+                "section_name": None,
+            }
+        ]
+        await report_audit_writer.record(history, events)
 
     @staticmethod
     async def delete_report(report_id: int):
-        return await report_dao.delete_report(report_id)
+        async with db.unit_of_work():
+            deleted = await report_dao.delete_report(report_id)
+            if deleted:
+                await OutboxService.report_deleted(report_id)
+        return deleted
 
     @staticmethod
     async def get_report_history_by_report_id(report_id: int):
@@ -0,0 +1,63 @@
+from functools import partial
+from typing import AsyncIterator, Iterable, Optional
+
+from src.config.settings import settings
+from src.db import db
+from src.db.models.report import Report, ReportStatus
+from src.utils.pubsub import create_broker
+
+REPORT_UPDATES_CHANNEL = "report-updates"
+
+report_broker = create_broker(
+    settings.SUBSCRIPTION_BROKER_BACKEND,
+    settings.REDIS_URL,
+    settings.SUBSCRIPTION_QUEUE_SIZE,
+)
+
+
+def report_delta(report: Report, changed_fields: Iterable[str]) -> dict:
+    """What subscribers are told about a change; plain JSON for the broker"""
+    return {
+        "id": report.id,
+        "studyId": report.study_id,
+        "version": report.version,
+        "status": ReportStatus(report.status).value,
+        "changedFields": sorted(changed_fields),
+        "updatedAt": report.updated_at.isoformat() if report.updated_at else None,
+    }
+
+
+def _matches(delta: dict, filter: Optional[dict]) -> bool:
+    if not filter:
+        return True
+    report_ids = filter.get("reportIds")
+    if report_ids and str(delta["id"]) not in report_ids:
+        return False
+    study_id = filter.get("studyId")
+    if study_id and str(delta["studyId"]) != str(study_id):
+        return False
+    statuses = filter.get("statuses")
+    if statuses and delta["status"] not in statuses:
+        return False
+    return True
+
+
+class ReportSubscriptionService:
+    """Pushes report changes to subscribed clients"""
+
+    @staticmethod
+    def publish_update(report: Report, changed_fields: Iterable[str]) -> None:
+        """Announce the change once the current transaction has committed"""
+        db.after_commit(
+            partial(
+                report_broker.publish,
+                REPORT_UPDATES_CHANNEL,
+                report_delta(report, changed_fields),
+            )
+        )
+
+    @staticmethod
+    async def subscribe(filter: Optional[dict] = None) -> AsyncIterator[dict]:
+        async for delta in report_broker.subscribe(REPORT_UPDATES_CHANNEL):
+            if _matches(delta, filter):
+                yield delta
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.db.dao import change_log_dao, report_dao
+from src.db.models.change_log import ChangeEntityType, ChangeOperation, EntityChange
+from src.utils.pagination import DEFAULT_PAGE_SIZE
+from src.utils.sync_token import SyncToken
+
+
+@dataclass
+class Change:
+    entity_type: str
+    entity_id: int
+    operation: str
+    changed_at: datetime
+    # Current state of the entity; None once it is deleted
+    entity: Optional[Any] = None
+
+
+@dataclass
+class ChangeFeed:
+    changes: List[Change]
+    sync_token: SyncToken
+    has_more: bool
+
+
+class SyncService:
+    MAX_CHANGES_PAGE = 1000
+
+    @staticmethod
+    async def get_changes(
+        since: Optional[SyncToken] = None, first: Optional[int] = None
+    ) -> ChangeFeed:
+        """Reports and studies changed after since, oldest first.
+
+        Without since the whole log is replayed. Several changes to the same
+        entity within a page are collapsed into the latest one, which carries
+        the entity's current state. Pass the returned sync_token as since
+        to continue; an empty page still moves the token forward.
+        """
+        limit = min(max(first or DEFAULT_PAGE_SIZE, 1), SyncService.MAX_CHANGES_PAGE)
+        start = since or SyncToken(0, 0)
+
+        # Read the horizon first: changes of transactions below it are final
+        horizon = await change_log_dao.get_sync_horizon()
+        rows = await change_log_dao.get_changes(start, horizon, limit + 1)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if has_more:
+            sync_token = SyncToken(rows[-1].txid, rows[-1].seq)
+        else:
+            sync_token = max(start, SyncToken(horizon, 0))
+
+        return ChangeFeed(
+            changes=await SyncService._collapse(rows),
+            sync_token=sync_token,
+            has_more=has_more,
+        )
+
+    @staticmethod
+    async def _collapse(rows: List[EntityChange]) -> List[Change]:
+        latest: Dict[Tuple[str, int], EntityChange] = {}
+        for row in rows:
+            key = (row.entity_type, row.entity_id)
+            latest.pop(key, None)
+            latest[key] = row
+
+        live = {entity_type.value: [] for entity_type in ChangeEntityType}
+        for entity_type, entity_id in latest:
+            if latest[(entity_type, entity_id)].operation != ChangeOperation.deleted:
+                live[entity_type].append(entity_id)
+        entities = {
+            (ChangeEntityType.report.value, report.id): report
+            for report in await report_dao.get_reports_by_ids(live["report"])
+        }
+        entities.update(
+            {
+                (ChangeEntityType.study.value, study.id): study
+                for study in await report_dao.get_studies_by_ids(live["study"])
+            }
+        )
+
+        changes = []
+        for key, row in latest.items():
+            entity = entities.get(key)
+            operation = row.operation
+            # Deleted by a change beyond this page; report it as deleted now
+            if entity is None:
+                operation = ChangeOperation.deleted.value
+            changes.append(
+                Change(
+                    entity_type=row.entity_type,
+                    entity_id=row.entity_id,
+                    operation=operation,
+                    changed_at=row.changed_at,
+                    entity=entity,
+                )
+            )
+        return changes
@@ -0,0 +1,117 @@
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import event
+
+from src.db.models.report import StudyTemplate
+
+
+@dataclass
+class ParsedReport:
+    # Section name -> content, in template order; None when absent
+    sections: Dict[str, Optional[str]]
+    # Text before the first heading
+    preamble: Optional[str] = None
+
+
+class CompiledTemplate:
+    """Section layout of a template, ready to render and parse report text.
+
+    A report body is each section's heading ("FINDINGS:") on its own line
+    followed by its content, sections separated by a blank line. Parsing
+    is case-insensitive and also accepts content on the heading line.
+    """
+
+    def __init__(self, section_names: Iterable[str]):
+        self.section_names: Tuple[str, ...] = tuple(dict.fromkeys(section_names))
+        self._by_heading = {name.upper(): name for name in self.section_names}
+        # Longest first, so "IMPRESSION" never shadows "IMPRESSION NOTES"
+        alternatives = "|".join(
+            re.escape(name)
+            for name in sorted(self.section_names, key=len, reverse=True)
+        )
+        self._heading = (
+            re.compile(
+                rf"^[ \t]*(?P<name>{alternatives})[ \t]*:[ \t]*",
+                re.IGNORECASE | re.MULTILINE,
+            )
+            if alternatives
+            else None
+        )
+
+    def render(
+        self, values: Mapping[str, Optional[str]], preamble: Optional[str] = None
+    ) -> str:
+        """Assemble a report body; sections without content are left out"""
+        unknown = [name for name in values if name not in self.section_names]
+        if unknown:
+            raise ValueError(f"Unknown report sections: {', '.join(unknown)}")
+        blocks = [preamble.strip()] if preamble and preamble.strip() else []
+        for name in self.section_names:
+            content = values.get(name)
+            if content is not None and content.strip():
+                blocks.append(f"{name}:\n{content.strip()}")
+        return "\n\n".join(blocks)
+
+    def parse(self, text: Optional[str]) -> ParsedReport:
+        """Split a report body into the template's sections"""
+        sections: Dict[str, Optional[str]] = dict.fromkeys(self.section_names)
+        text = text or ""
+        matches = list(self._heading.finditer(text)) if self._heading else []
+        if not matches:
+            return ParsedReport(sections, text.strip() or None)
+
+        for index, match in enumerate(matches):
+            end = matches[index + 1].start() if index + 1 < len(matches) else None
+            name = self._by_heading[match.group("name").upper()]
+            content = text[match.end() : end].strip()
+            # A repeated heading continues its section
+            previous = sections[name]
+            sections[name] = f"{previous}\n\n{content}" if previous else content
+        preamble = text[: matches[0].start()].strip()
+        return ParsedReport(sections, preamble or None)
+
+
+# Template id (None until saved) and its section names
+_Key = Tuple[Optional[int], Tuple[str, ...]]
+
+
+class TemplateEngine:
+    """Compiles each template once and keeps the most recently used ones.
+
+    Entries are keyed by template id and section names, so a template whose
+    sections were edited is compiled afresh even if nobody invalidated it.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._compiled: OrderedDict[_Key, CompiledTemplate] = OrderedDict()
+
+    def compile(self, template: StudyTemplate) -> CompiledTemplate:
+        key = (template.id, tuple(template.section_names or ()))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = CompiledTemplate(key[1])
+            self._compiled[key] = compiled
+            while len(self._compiled) > self.max_size:
+                self._compiled.popitem(last=False)
+        else:
+            self._compiled.move_to_end(key)
+        return compiled
+
+    def invalidate(self, template_id: Optional[int]) -> None:
+        for key in [key for key in self._compiled if key[0] == template_id]:
+            del self._compiled[key]
+
+
+template_engine = TemplateEngine()
+
+
+@event.listens_for(StudyTemplate, "after_update")
+@event.listens_for(StudyTemplate, "after_delete")
+def _invalidate_compiled_template(
+    mapper: Any, connection: Any, template: StudyTemplate
+) -> None:
+    template_engine.invalidate(template.id)
@@ -0,0 +1,78 @@
+import asyncio
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.config.settings import settings
+from src.db.dao import change_log_dao, user_dao
+from src.utils.bloom import BloomFilter
+
+
+class TokenRevocationService:
+    """Per-worker view of revoked tokens, fronted by a bloom filter.
+
+    Revocations are stored in Postgres. Each worker keeps a bloom filter of
+    the users with recent revocations and pulls new rows incrementally every
+    refresh_interval seconds, so checking a token whose user was never
+    revoked costs a few hash probes and no I/O. Only bloom filter hits are
+    confirmed against the database.
+
+    Revocations made by another worker take effect here within
+    refresh_interval seconds.
+    """
+
+    def __init__(
+        self,
+        capacity: int = settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+        refresh_interval: float = settings.TOKEN_REVOCATION_REFRESH_SECONDS,
+        token_lifetime: timedelta = timedelta(hours=settings.JWT_EXPIRATION_HOURS),
+    ):
+        self.capacity = capacity
+        self.refresh_interval = refresh_interval
+        self.token_lifetime = token_lifetime
+        self._bloom = BloomFilter(capacity)
+        # Every transaction below this had finished at the last refresh
+        self._horizon = 0
+        self._refreshed_at = -math.inf
+        self._refresh_lock = asyncio.Lock()
+
+    async def revoke_user_tokens(self, user_id: int, reason: str) -> None:
+        """Revoke every token issued to a user up to now"""
+        await user_dao.create_token_revocation(user_id, reason)
+        self._bloom.add(str(user_id))
+
+    async def is_revoked(self, user_id: int, issued_at: float) -> bool:
+        """Check whether a token issued to user_id at issued_at was revoked"""
+        await self._refresh_if_stale()
+        if str(user_id) not in self._bloom:
+            return False
+
+        revoked_at = await user_dao.get_latest_token_revocation(user_id)
+        return revoked_at is not None and issued_at <= revoked_at.timestamp()
+
+    async def _refresh_if_stale(self) -> None:
+        if time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        # Concurrent requests keep using the current filter while one refreshes
+        if self._refresh_lock.locked():
+            return
+
+        async with self._refresh_lock:
+            if self._bloom.is_full:
+                # Start over so revocations older than any live token drop out
+                self._bloom = BloomFilter(max(self.capacity, self._bloom.count * 2))
+                self._horizon = 0
+
+            revoked_since = datetime.now(timezone.utc) - self.token_lifetime
+            # Taken first: transactions below it have all finished, so the
+            # query below sees their revocations. Later ones, even with lower
+            # ids, are read again next time.
+            horizon = await change_log_dao.get_sync_horizon()
+            user_ids = await user_dao.get_revoked_user_ids(self._horizon, revoked_since)
+            for user_id in user_ids:
+                self._bloom.add(str(user_id))
+            self._horizon = horizon
+            self._refreshed_at = time.monotonic()
+
+
+token_revocation_service = TokenRevocationService()
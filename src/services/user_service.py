@@ -8,6 +8,8 @@ from src.db.dao.user_dao import (
     get_user_organization_memberships,
     remove_organization_member,
 )
+from src.services.token_revocation_service import token_revocation_service
+from src.utils.field_mapping import convert_dict_keys_to_snake_case
 from src.utils.validators import (
     validate_email,
     validate_password,
@@ -67,11 +69,17 @@ class UserService:
 
     @staticmethod
     async def update_user(user_id: int, input_data: dict):
-        return await user_dao.update_user(user_id, input_data)
+        # Map GraphQL field names to model field names
+        return await user_dao.update_user(
+            user_id, convert_dict_keys_to_snake_case(input_data)
+        )
 
     @staticmethod
     async def delete_user(user_id: int):
-        return await user_dao.delete_user(user_id)
+        deleted = await user_dao.delete_user(user_id)
+        if deleted:
+            await token_revocation_service.revoke_user_tokens(user_id, "user_deleted")
+        return deleted
 
     @staticmethod
     async def get_all_organizations():
@@ -191,6 +199,9 @@ class UserService:
         await user_dao.update_user_password_fields(
             user_id, temp_password=temp_password, password_must_change=True
         )
+        await token_revocation_service.revoke_user_tokens(
+            user_id, "force_password_reset"
+        )
         return temp_password
 
     @staticmethod
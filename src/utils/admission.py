@@ -0,0 +1,213 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Hashable, List, Optional
+
+from src.utils.exceptions import ServiceOverloadedError
+
+# Upper bounds, in seconds, of the queue wait histogram buckets
+WAIT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class AdmissionMetrics:
+    """Counters and a wait time histogram for one admission controller"""
+
+    def __init__(self):
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets: List[int] = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        for index, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                self.wait_buckets[index] += 1
+                return
+        self.wait_buckets[-1] += 1
+
+    def snapshot(self) -> Dict:
+        bounds = [str(bound) for bound in WAIT_BUCKETS] + ["+Inf"]
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timedOut": self.timed_out,
+            "wait": {
+                "count": self.wait_count,
+                "sumSeconds": self.wait_seconds_total,
+                "maxSeconds": self.wait_seconds_max,
+                "buckets": dict(zip(bounds, self.wait_buckets)),
+            },
+        }
+
+
+class _Tenant:
+    """Queue, in-flight count and metrics of one tenant"""
+
+    __slots__ = ("weight", "in_flight", "waiters", "metrics")
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.metrics = AdmissionMetrics()
+
+    @property
+    def active(self) -> bool:
+        return self.in_flight > 0 or bool(self.waiters)
+
+
+class AdmissionController:
+    """Caps concurrent database-bound operations in this worker.
+
+    Up to max_concurrency operations run at once. Later arrivals wait for up
+    to max_wait seconds in a bounded queue, and anything beyond that is shed
+    with ServiceOverloadedError. Limiting below the connection pool size
+    keeps admitted operations from queueing inside the driver, so their
+    latency stays flat under bursts.
+
+    Operations belong to tenants. Each tenant active at the moment gets a
+    weighted share of the execution slots and queue entries; a tenant alone
+    may use all of them. A freed slot goes to the waiting tenant that is
+    furthest below its share, so one busy tenant cannot starve the others.
+    Slots no tenant below its share is waiting for are lent to tenants over
+    theirs rather than left idle.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        max_wait: float,
+        weights: Optional[Dict[Hashable, float]] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.weights = weights or {}
+        self.in_flight = 0
+        self.metrics = AdmissionMetrics()
+        self._tenants: Dict[Hashable, _Tenant] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(tenant.waiters) for tenant in self._tenants.values())
+
+    @asynccontextmanager
+    async def admit(self, tenant_key: Hashable = None) -> AsyncIterator[None]:
+        """Hold one execution slot for the enclosed operation"""
+        tenant = self._tenant(tenant_key)
+        await self._acquire(tenant)
+        try:
+            yield
+        finally:
+            self._release(tenant)
+
+    def _tenant(self, key: Hashable) -> _Tenant:
+        tenant = self._tenants.get(key)
+        if tenant is None:
+            tenant = self._tenants[key] = _Tenant(self.weights.get(key, 1.0))
+        return tenant
+
+    def _share(self, tenant: _Tenant) -> float:
+        active_weight = sum(t.weight for t in self._tenants.values() if t.active)
+        if not tenant.active:
+            active_weight += tenant.weight
+        return tenant.weight / active_weight
+
+    def concurrency_quota(self, tenant: _Tenant) -> int:
+        return math.ceil(self.max_concurrency * self._share(tenant))
+
+    def queue_quota(self, tenant: _Tenant) -> int:
+        return math.ceil(self.max_queue * self._share(tenant))
+
+    async def _acquire(self, tenant: _Tenant) -> None:
+        can_start = self.in_flight < self.max_concurrency and not tenant.waiters
+        queue_full = self.queue_depth >= self.max_queue or len(
+            tenant.waiters
+        ) >= self.queue_quota(tenant)
+        if queue_full and not can_start:
+            self._reject(tenant)
+
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        tenant.waiters.append(waiter)
+        self._dispatch()
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await waiter
+        except BaseException as ex:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on
+                self._release(tenant)
+            elif waiter in tenant.waiters:
+                tenant.waiters.remove(waiter)
+            if isinstance(ex, TimeoutError):
+                self.metrics.timed_out += 1
+                tenant.metrics.timed_out += 1
+                raise ServiceOverloadedError("Server is busy", self.max_wait) from ex
+            raise
+
+        waited = time.monotonic() - started
+        for metrics in (self.metrics, tenant.metrics):
+            metrics.admitted += 1
+            metrics.observe_wait(waited)
+
+    def _reject(self, tenant: _Tenant) -> None:
+        self.metrics.rejected += 1
+        tenant.metrics.rejected += 1
+        raise ServiceOverloadedError("Server is busy", self.max_wait)
+
+    def _release(self, tenant: _Tenant) -> None:
+        self.in_flight -= 1
+        tenant.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting tenants, least served first"""
+        while self.in_flight < self.max_concurrency:
+            waiting = [tenant for tenant in self._tenants.values() if tenant.waiters]
+            if not waiting:
+                return
+            # Tenants within their share go first; idle capacity is lent
+            under_quota = [
+                tenant
+                for tenant in waiting
+                if tenant.in_flight < self.concurrency_quota(tenant)
+            ]
+            tenant = min(under_quota or waiting, key=lambda t: t.in_flight / t.weight)
+            waiter = tenant.waiters.popleft()
+            if waiter.done():
+                continue
+            waiter.set_result(None)
+            self.in_flight += 1
+            tenant.in_flight += 1
+
+    def snapshot(self) -> Dict:
+        tenants = {}
+        for key, tenant in self._tenants.items():
+            quota = self.concurrency_quota(tenant)
+            tenants[str(key)] = {
+                "weight": tenant.weight,
+                "inFlight": tenant.in_flight,
+                "concurrencyQuota": quota,
+                "queueDepth": len(tenant.waiters),
+                "queueQuota": self.queue_quota(tenant),
+                "saturation": tenant.in_flight / quota if quota else 1.0,
+                **tenant.metrics.snapshot(),
+            }
+        return {
+            "inFlight": self.in_flight,
+            "maxConcurrency": self.max_concurrency,
+            "queueDepth": self.queue_depth,
+            "maxQueue": self.max_queue,
+            **self.metrics.snapshot(),
+            "tenants": tenants,
+        }
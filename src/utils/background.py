@@ -0,0 +1,38 @@
+import asyncio
+import contextvars
+import logging
+from typing import Any, Awaitable, Callable, Set
+
+from src.db import db
+
+logger = logging.getLogger(__name__)
+
+_tasks: Set[asyncio.Task] = set()
+
+
+def run_in_background(job: Callable[..., Awaitable[Any]], *args: Any) -> asyncio.Task:
+    """Run job(*args) after the current request, in its own session scope.
+
+    The job starts from an empty context so it inherits neither the request's
+    session, principal nor deadline. Failures are logged, not raised.
+    """
+
+    async def runner() -> None:
+        token = db.begin_scope()
+        try:
+            await job(*args)
+        except Exception:
+            logger.exception("Background job %s failed", job.__qualname__)
+        finally:
+            await db.end_scope(token)
+
+    task = asyncio.create_task(runner(), context=contextvars.Context())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def drain_background_tasks() -> None:
+    """Wait for running background jobs to finish"""
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
@@ -0,0 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+from src.utils.exceptions import OperationTimeoutError
+
+# Event loop time by which the current operation must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one"""
+    when = _deadline.get()
+    if when is None:
+        return None
+    return max(0.0, when - asyncio.get_running_loop().time())
+
+
+@asynccontextmanager
+async def deadline(seconds: float) -> AsyncIterator[None]:
+    """Cancel the enclosed work if it runs longer than seconds.
+
+    Nested deadlines can only shorten the enclosing one. When the time is
+    up the work is cancelled and OperationTimeoutError is raised.
+    """
+    when = asyncio.get_running_loop().time() + seconds
+    enclosing = _deadline.get()
+    if enclosing is not None:
+        when = min(when, enclosing)
+
+    token = _deadline.set(when)
+    try:
+        async with asyncio.timeout_at(when) as timeout:
+            yield
+    except TimeoutError as ex:
+        if not timeout.expired():
+            raise
+        raise OperationTimeoutError(seconds) from ex
+    finally:
+        _deadline.reset(token)
@@ -1,3 +1,6 @@
+import math
+
+
 class AuthenticationError(Exception):
     pass
 
@@ -16,3 +19,37 @@ class NotFoundError(Exception):
 
 class DatabaseError(Exception):
     pass
+
+
+class RateLimitExceededError(Exception):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.extensions = {
+            "code": "RATE_LIMITED",
+            "retryAfter": max(1, math.ceil(retry_after)),
+        }
+
+
+class OperationTimeoutError(Exception):
+    def __init__(self, timeout: float):
+        super().__init__(f"Operation timed out after {timeout:g} seconds")
+        self.timeout = timeout
+        self.extensions = {"code": "OPERATION_TIMEOUT", "timeout": timeout}
+
+
+class ServiceOverloadedError(Exception):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.extensions = {
+            "code": "OVERLOADED",
+            "retryAfter": max(1, math.ceil(retry_after)),
+        }
+
+
+class ConflictError(Exception):
+    def __init__(self, message: str, current_version: int):
+        super().__init__(message)
+        self.current_version = current_version
+        self.extensions = {"code": "CONFLICT", "currentVersion": current_version}
@@ -0,0 +1,91 @@
+import json
+from datetime import date, datetime
+from typing import Any, Protocol
+
+
+class JSONCodec(Protocol):
+    name: str
+
+    def loads(self, data: bytes) -> Any:
+        """Decode JSON, raising ValueError on malformed input"""
+        ...
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode to JSON; datetime values become ISO 8601 strings"""
+        ...
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibJSONCodec:
+    name = "json"
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: bytes) -> Any:
+        # orjson.JSONDecodeError is a ValueError
+        return self._orjson.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        # Datetimes are encoded natively, in the same format as isoformat()
+        return self._orjson.dumps(value, default=_default)
+
+
+class MsgspecCodec:
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decode_error = msgspec.DecodeError
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+        self._decoder = msgspec.json.Decoder()
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as ex:
+            raise ValueError(str(ex)) from ex
+
+    def dumps(self, value: Any) -> bytes:
+        # Datetimes are encoded natively as RFC 3339 (UTC as "Z")
+        return self._encoder.encode(value)
+
+
+_CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": StdlibJSONCodec,
+}
+
+
+def get_json_codec(name: str = "auto") -> JSONCodec:
+    """Get a JSON codec by name, or the fastest installed one for "auto" """
+    if name != "auto":
+        if name not in _CODECS:
+            raise ValueError(f"Unknown JSON codec: {name}")
+        return _CODECS[name]()
+
+    for codec_class in _CODECS.values():
+        try:
+            return codec_class()
+        except ImportError:
+            continue
+    return StdlibJSONCodec()
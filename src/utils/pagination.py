@@ -10,6 +10,8 @@ from src.db import db
 
 T = TypeVar("T")
 
+DEFAULT_PAGE_SIZE = 20
+
 
 @dataclass
 class PageInfo:
@@ -93,7 +95,7 @@ async def paginate(
     else:
         # Default or first N
         query = query.order_by(asc(getattr(model, order_by_field)))
-        limit = (first or 20) + 1  # Default to 20, +1 to check if there are more
+        limit = (first or DEFAULT_PAGE_SIZE) + 1  # +1 to check if there are more
 
     query = query.limit(limit)
 
@@ -106,7 +108,7 @@ async def paginate(
         items.reverse()
 
     # Check for more pages
-    has_more = len(items) > (last or first or 20)
+    has_more = len(items) > (last or first or DEFAULT_PAGE_SIZE)
     if has_more:
         items = items[:-1]  # Remove the extra item
 
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Optional, Protocol, Set
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class Broker(Protocol):
+    async def publish(self, channel: str, message: dict) -> None:
+        """Send message to every current subscriber of channel"""
+        ...
+
+    def subscribe(self, channel: str) -> AsyncIterator[dict]:
+        """Yield messages published to channel from now on"""
+        ...
+
+    async def close(self) -> None: ...
+
+
+class InMemoryBroker:
+    """Fans messages out to subscribers in this process only.
+
+    Each subscriber has a bounded queue. A subscriber that falls behind
+    loses its oldest messages instead of slowing down publishers.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    async def publish(self, channel: str, message: dict) -> None:
+        self.deliver(channel, message)
+
+    def deliver(self, channel: str, message: dict) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[dict]:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers[channel].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            subscribers = self._subscribers[channel]
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[channel]
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBroker:
+    """Fans messages out to subscribers in every worker through Redis pub/sub.
+
+    Each process holds one Redis subscription per channel, whoever asked
+    first, and hands incoming messages to its local subscribers. Channels
+    are a small fixed set, so they stay subscribed once used.
+    """
+
+    def __init__(self, url: str, prefix: str = "pubsub:", queue_size: int = 100):
+        self.prefix = prefix
+        self._redis = Redis.from_url(url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._local = InMemoryBroker(queue_size)
+        self._channels: Set[str] = set()
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, channel: str, message: dict) -> None:
+        await self._redis.publish(self.prefix + channel, json.dumps(message))
+
+    async def subscribe(self, channel: str) -> AsyncIterator[dict]:
+        if channel not in self._channels:
+            self._channels.add(channel)
+            await self._pubsub.subscribe(self.prefix + channel)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        async for message in self._local.subscribe(channel):
+            yield message
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except RedisError:
+                logger.warning("Redis pub/sub unavailable, retrying")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None:
+                continue
+            channel = message["channel"].decode()[len(self.prefix) :]
+            self._local.deliver(channel, json.loads(message["data"]))
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+
+
+def create_broker(
+    backend: str, redis_url: Optional[str] = None, queue_size: int = 100
+) -> Broker:
+    """Build the pub/sub broker configured for this deployment"""
+    if backend == "memory":
+        return InMemoryBroker(queue_size)
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("REDIS_URL is required for the redis broker")
+        return RedisBroker(redis_url, queue_size=queue_size)
+    raise ValueError(f"Unknown broker backend: {backend}")
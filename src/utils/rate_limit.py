@@ -0,0 +1,113 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Protocol, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TokenBucketPolicy:
+    capacity: int
+    refill_per_second: float
+
+    @classmethod
+    def per_minute(cls, capacity: int, refill_per_minute: float) -> "TokenBucketPolicy":
+        return cls(capacity=capacity, refill_per_second=refill_per_minute / 60.0)
+
+
+class RateLimiter(Protocol):
+    async def acquire(self, key: str, policy: TokenBucketPolicy) -> float:
+        """Take one token for key; return 0 if allowed, else seconds to wait"""
+        ...
+
+
+class InMemoryRateLimiter:
+    """Token buckets kept in process memory, one set per worker"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (tokens, last refill time); insertion order tracks recency
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def acquire(self, key: str, policy: TokenBucketPolicy) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (float(policy.capacity), now))
+        tokens = min(
+            float(policy.capacity),
+            tokens + (now - updated_at) * policy.refill_per_second,
+        )
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / policy.refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        # Evict least recently used buckets, which are also the most refilled
+        while len(self._buckets) > self.max_keys:
+            del self._buckets[next(iter(self._buckets))]
+        return retry_after
+
+
+# Refill and take a token atomically, using the Redis clock so that all
+# workers agree on elapsed time.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimiter:
+    """Token buckets shared by all workers through Redis.
+
+    If Redis cannot be reached the limiter falls back to in-process buckets
+    rather than letting every request through unthrottled.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        self.prefix = prefix
+        self._redis = Redis.from_url(url)
+        self._script = self._redis.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._fallback = InMemoryRateLimiter()
+
+    async def acquire(self, key: str, policy: TokenBucketPolicy) -> float:
+        try:
+            result = await self._script(
+                keys=[self.prefix + key],
+                args=[policy.capacity, policy.refill_per_second],
+            )
+        except RedisError:
+            logger.warning("Redis rate limiter unavailable, using in-process buckets")
+            return await self._fallback.acquire(key, policy)
+        return float(result)
+
+
+def create_rate_limiter(backend: str, redis_url: Optional[str] = None) -> RateLimiter:
+    """Build the rate limiter configured for this deployment"""
+    if backend == "memory":
+        return InMemoryRateLimiter()
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("REDIS_URL is required for the redis rate limiter")
+        return RedisRateLimiter(redis_url)
+    raise ValueError(f"Unknown rate limiter backend: {backend}")
@@ -0,0 +1,25 @@
+import base64
+import json
+from typing import NamedTuple
+
+
+class SyncToken(NamedTuple):
+    """Position in the change log: every change at or before it was seen"""
+
+    txid: int
+    seq: int
+
+
+def encode_sync_token(token: SyncToken) -> str:
+    """Encode a sync token to an opaque base64 string"""
+    payload = {"txid": token.txid, "seq": token.seq}
+    return base64.b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_sync_token(value: str) -> SyncToken:
+    """Decode a base64 sync token"""
+    try:
+        payload = json.loads(base64.b64decode(value.encode()).decode())
+        return SyncToken(int(payload["txid"]), int(payload["seq"]))
+    except Exception:
+        raise ValueError("Invalid sync token")
@@ -0,0 +1,16 @@
+"""Outbox event handlers, registered with @outbox_handler on import"""
+
+import logging
+
+from src.db.models.outbox import OutboxEvent
+from src.services.outbox_service import REPORT_CREATED, REPORT_DELETED, REPORT_UPDATED
+from src.workers.outbox import outbox_handler
+
+logger = logging.getLogger(__name__)
+
+
+@outbox_handler(REPORT_CREATED, REPORT_UPDATED, REPORT_DELETED)
+async def log_report_event(event: OutboxEvent) -> None:
+    logger.info(
+        "%s report=%s payload=%s", event.event_type, event.aggregate_id, event.payload
+    )
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List
+
+from src.config.settings import settings
+from src.db import db
+from src.db.dao import outbox_dao
+from src.db.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+OutboxHandler = Callable[[OutboxEvent], Awaitable[None]]
+
+# event type -> handlers; "*" handlers receive every event
+_handlers: Dict[str, List[OutboxHandler]] = defaultdict(list)
+
+
+def outbox_handler(*event_types: str) -> Callable[[OutboxHandler], OutboxHandler]:
+    """Register a handler for the given event types (all events if none).
+
+    Delivery is at least once, so handlers must tolerate seeing the same
+    event (same event.id) more than once.
+    """
+
+    def register(handler: OutboxHandler) -> OutboxHandler:
+        for event_type in event_types or ("*",):
+            _handlers[event_type].append(handler)
+        return handler
+
+    return register
+
+
+def handlers_for(event_type: str) -> List[OutboxHandler]:
+    return _handlers.get(event_type, []) + _handlers.get("*", [])
+
+
+class OutboxWorker:
+    """Drains the outbox in batches and hands each event to its handlers.
+
+    An event is deleted once every handler succeeded. A failed event is
+    retried with exponential backoff and abandoned (failed_at is set) after
+    max_attempts. Several workers can run at once; each leases its own
+    batch.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        lease: float = settings.OUTBOX_LEASE_SECONDS,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease)
+        self.max_attempts = max_attempts
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Outbox batch failed")
+                processed = 0
+            # Keep draining while there is a backlog
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+
+    async def run_once(self) -> int:
+        """Process one batch in its own session scope; return its size"""
+        token = db.begin_scope()
+        try:
+            events = await outbox_dao.claim_outbox_events(self.batch_size, self.lease)
+            delivered = []
+            for event in events:
+                if await self._deliver(event):
+                    delivered.append(event.id)
+            await outbox_dao.delete_outbox_events(delivered)
+            return len(events)
+        finally:
+            await db.end_scope(token)
+
+    async def _deliver(self, event: OutboxEvent) -> bool:
+        try:
+            for handler in handlers_for(event.event_type):
+                await handler(event)
+        except Exception as ex:
+            error = f"{type(ex).__name__}: {ex}"
+            if event.attempts >= self.max_attempts:
+                logger.error("Giving up on outbox event %s: %s", event.id, error)
+                await outbox_dao.fail_outbox_event(event.id, error)
+            else:
+                delay = timedelta(seconds=min(2**event.attempts, 3600))
+                logger.warning("Outbox event %s failed, retrying: %s", event.id, error)
+                await outbox_dao.retry_outbox_event(event.id, error, delay)
+            return False
+        return True
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional, Set
+
+from src.config.settings import settings
+from src.db import db
+from src.db.dao import generation_job_dao, report_dao
+from src.db.models.generation import ReportGenerationJob
+from src.db.models.report import ReportStatus
+from src.services.report_generator import ReportGenerator, create_report_generator
+from src.services.report_service import ReportService
+from src.utils.deadline import deadline
+
+logger = logging.getLogger(__name__)
+
+
+class ReportGenerationWorker:
+    """Pool of up to concurrency generation jobs running at once.
+
+    Jobs are leased from the database, so several worker processes can
+    share the queue. No database connection is held while the generator
+    runs. A failed job is retried with exponential backoff and marked
+    failed after max_attempts.
+    """
+
+    def __init__(
+        self,
+        generator: ReportGenerator,
+        concurrency: int = settings.REPORT_GENERATION_CONCURRENCY,
+        poll_interval: float = settings.REPORT_GENERATION_POLL_INTERVAL_SECONDS,
+        timeout: float = settings.REPORT_GENERATION_TIMEOUT_SECONDS,
+        max_attempts: int = settings.REPORT_GENERATION_MAX_ATTEMPTS,
+    ):
+        self.generator = generator
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        # Outlasts the time budget, so a live job is never claimed twice
+        self.lease = timedelta(seconds=timeout * 2)
+        self.max_attempts = max_attempts
+        self._stopping = asyncio.Event()
+        self._active: Set[asyncio.Task] = set()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            while not self._stopping.is_set():
+                claimed = await self.dispatch()
+                # Claim again right away while there is both work and room
+                if claimed and len(self._active) < self.concurrency:
+                    continue
+                await asyncio.wait(
+                    self._active | {stopping},
+                    timeout=self.poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+        finally:
+            stopping.cancel()
+            # Jobs in progress are finished, not abandoned to their lease
+            await asyncio.gather(*self._active, return_exceptions=True)
+
+    async def dispatch(self) -> int:
+        """Claim jobs for the free slots and start them; return how many"""
+        free = self.concurrency - len(self._active)
+        if free <= 0:
+            return 0
+        try:
+            jobs = await self._claim(free)
+        except Exception:
+            logger.exception("Claiming report generation jobs failed")
+            return 0
+        for job in jobs:
+            task = asyncio.create_task(self.process(job))
+            self._active.add(task)
+            task.add_done_callback(self._active.discard)
+        return len(jobs)
+
+    async def _claim(self, limit: int):
+        token = db.begin_scope()
+        try:
+            return await generation_job_dao.claim_generation_jobs(limit, self.lease)
+        finally:
+            await db.end_scope(token)
+
+    async def process(self, job: ReportGenerationJob) -> None:
+        token = db.begin_scope()
+        try:
+            await self._generate(job)
+        except Exception as ex:
+            await self._handle_failure(job, f"{type(ex).__name__}: {ex}")
+        finally:
+            await db.end_scope(token)
+
+    async def _generate(self, job: ReportGenerationJob) -> None:
+        report = await report_dao.get_report_by_id(job.report_id)
+        # Release the connection for the (slow) generator call
+        await db.close_session()
+        if report is None or report.status != ReportStatus.draft.value:
+            # Deleted, or already taken further by hand
+            await generation_job_dao.finish_generation_job(job.id)
+            return
+
+        async with deadline(self.timeout):
+            result_text = await self.generator.generate(report)
+        await ReportService.apply_generated_result(
+            report.id, report.version, result_text
+        )
+        await generation_job_dao.finish_generation_job(job.id)
+
+    async def _handle_failure(self, job: ReportGenerationJob, error: str) -> None:
+        # The failed attempt may have left the session unusable
+        await db.close_session()
+        try:
+            if job.attempts >= self.max_attempts:
+                logger.error("Giving up on generation job %s: %s", job.id, error)
+                await generation_job_dao.fail_generation_job(job.id, error)
+            else:
+                delay = timedelta(seconds=min(2**job.attempts, 3600))
+                logger.warning("Generation job %s failed, retrying: %s", job.id, error)
+                await generation_job_dao.retry_generation_job(job.id, error, delay)
+        except Exception:
+            # The lease runs out and the job is claimed again
+            logger.exception("Recording failure of generation job %s failed", job.id)
+
+
+def create_worker(concurrency: Optional[int] = None) -> ReportGenerationWorker:
+    """Worker using the configured generator backend"""
+    generator = create_report_generator(
+        settings.REPORT_GENERATOR_BACKEND,
+        settings.REPORT_GENERATOR_STUB_LATENCY_SECONDS,
+    )
+    return ReportGenerationWorker(
+        generator, concurrency=concurrency or settings.REPORT_GENERATION_CONCURRENCY
+    )
@@ -0,0 +1,22 @@
+import asyncio
+import signal
+from typing import Protocol
+
+from src.db import dispose_engine
+
+
+class Worker(Protocol):
+    async def run(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+async def run_worker(worker: Worker) -> None:
+    """Run until SIGINT or SIGTERM, letting the worker finish current work"""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await dispose_engine()
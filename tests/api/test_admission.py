@@ -0,0 +1,224 @@
+import asyncio
+
+import pytest
+
+from src.api.app import graphql_app
+from src.services.auth_service import AuthService
+from src.utils.admission import AdmissionController
+from src.utils.exceptions import ServiceOverloadedError
+from tests.factories import OrganizationMemberFactory
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event):
+    async with controller.admit():
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_admission_queues_beyond_concurrency_limit():
+    """Test operations over the limit wait and run in arrival order"""
+    controller = AdmissionController(max_concurrency=1, max_queue=5, max_wait=1)
+    release = asyncio.Event()
+    order = []
+
+    async def record(name):
+        async with controller.admit():
+            order.append(name)
+
+    holder = asyncio.create_task(_hold(controller, release))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(record(name)) for name in ("a", "b")]
+    await asyncio.sleep(0)
+
+    assert controller.in_flight == 1
+    assert controller.queue_depth == 2
+
+    release.set()
+    await asyncio.gather(holder, *waiters)
+
+    assert order == ["a", "b"]
+    assert controller.in_flight == 0
+    assert controller.metrics.admitted == 3
+
+
+@pytest.mark.asyncio
+async def test_admission_sheds_load_when_queue_is_full():
+    """Test arrivals beyond the queue bound are rejected immediately"""
+    controller = AdmissionController(max_concurrency=1, max_queue=0, max_wait=1)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceOverloadedError) as error:
+        async with controller.admit():
+            pass
+
+    assert error.value.extensions["code"] == "OVERLOADED"
+    assert controller.metrics.rejected == 1
+
+    release.set()
+    await holder
+
+
+@pytest.mark.asyncio
+async def test_admission_wait_is_bounded():
+    """Test a queued operation gives up after max_wait and leaves the queue"""
+    controller = AdmissionController(max_concurrency=1, max_queue=5, max_wait=0.01)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceOverloadedError):
+        async with controller.admit():
+            pass
+
+    assert controller.queue_depth == 0
+    assert controller.metrics.timed_out == 1
+
+    release.set()
+    await holder
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_overloaded_graphql_request_gets_503(test_client, monkeypatch):
+    """Test a saturated worker answers with 503 and Retry-After"""
+    controller = AdmissionController(max_concurrency=0, max_queue=0, max_wait=2)
+    monkeypatch.setattr(graphql_app.http_handler, "admission", controller)
+
+    response = await test_client.post(
+        "/graphql/", json={"query": "query { studies { totalCount } }"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    assert response.json()["errors"][0]["extensions"]["code"] == "OVERLOADED"
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_admission_state(test_client):
+    """Test the metrics endpoint exposes queue depth and wait times"""
+    response = await test_client.get("/metrics")
+    assert response.status_code == 200
+
+    admission = response.json()["admission"]
+    assert admission["queueDepth"] == 0
+    assert "buckets" in admission["wait"]
+
+
+@pytest.mark.asyncio
+async def test_freed_slots_go_to_least_served_tenant():
+    """Test a busy tenant's backlog does not starve another tenant"""
+    controller = AdmissionController(max_concurrency=2, max_queue=10, max_wait=1)
+    release = asyncio.Event()
+    order = []
+
+    async def record(tenant):
+        async with controller.admit(tenant):
+            order.append(tenant)
+
+    holders = [asyncio.create_task(_hold(controller, release)) for _ in range(2)]
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(record(1)) for _ in range(3)]
+    waiters.append(asyncio.create_task(record(2)))
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(*holders, *waiters)
+
+    # Tenant 2 arrived last but is served before tenant 1's backlog drains
+    assert order.index(2) < 2
+
+
+@pytest.mark.asyncio
+async def test_tenant_concurrency_follows_weighted_share():
+    """Test each active tenant's quota follows its weighted share of slots"""
+    controller = AdmissionController(
+        max_concurrency=4, max_queue=10, max_wait=1, weights={1: 3.0, 2: 1.0}
+    )
+    release = asyncio.Event()
+
+    tasks = [
+        asyncio.create_task(_hold_tenant(controller, tenant, release))
+        for tenant in (2, 2, 1, 1, 1, 1)
+    ]
+    await asyncio.sleep(0)
+
+    tenants = controller.snapshot()["tenants"]
+    assert tenants["2"]["inFlight"] == 2
+    assert tenants["1"]["inFlight"] == 2
+    assert tenants["1"]["queueDepth"] == 2
+    assert tenants["1"]["concurrencyQuota"] == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_slots_are_lent_beyond_share():
+    """Test a tenant over its share uses slots nobody else is waiting for"""
+    controller = AdmissionController(max_concurrency=10, max_queue=20, max_wait=1)
+    release = asyncio.Event()
+
+    tasks = [asyncio.create_task(_hold_tenant(controller, "b", release))]
+    await asyncio.sleep(0)
+    tasks += [
+        asyncio.create_task(_hold_tenant(controller, "a", release)) for _ in range(8)
+    ]
+    await asyncio.sleep(0)
+
+    tenants = controller.snapshot()["tenants"]
+    assert tenants["a"]["concurrencyQuota"] == 5
+    assert tenants["a"]["inFlight"] == 8
+    assert controller.queue_depth == 0
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert controller.in_flight == 0
+
+
+async def _hold_tenant(controller, tenant, release):
+    async with controller.admit(tenant):
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_login_token_carries_organization_memberships(db_session):
+    """Test tokens issued at login name the caller's organizations"""
+    member = OrganizationMemberFactory(user__password_must_change=False)
+    member.user.set_password("Secret123!")
+    await db_session.commit()
+
+    result = await AuthService.login(member.user.email, "Secret123!")
+    principal = await AuthService.get_current_user(result["token"])
+
+    assert principal.organization_ids == (member.organization_id,)
+
+
+@pytest.mark.asyncio
+async def test_batched_operations_each_take_a_slot(test_client, monkeypatch):
+    """Test a batch counts one slot per operation, as each has its own session"""
+    controller = AdmissionController(max_concurrency=10, max_queue=0, max_wait=2)
+    monkeypatch.setattr(graphql_app.http_handler, "admission", controller)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, release))
+    await asyncio.sleep(0)
+
+    operations = [{"query": "query { studies { totalCount } }"}] * 10
+    response = await test_client.post("/graphql/", json=operations)
+    release.set()
+    await holder
+
+    # One slot was taken, so only nine of the ten operations fit
+    results = response.json()
+    assert response.status_code == 200
+    overloaded = [
+        result
+        for result in results
+        if result.get("errors")
+        and result["errors"][0]["extensions"]["code"] == "OVERLOADED"
+    ]
+    assert len(overloaded) == 1
+    assert controller.metrics.admitted == 10
+    assert controller.in_flight == 0
@@ -0,0 +1,71 @@
+import pytest
+
+from tests.factories import StudyFactory, UserFactory
+
+
+@pytest.mark.asyncio
+async def test_batched_operations_return_results_in_order(test_client, db_session):
+    """Test an array of operations is answered with an array of results"""
+    study = StudyFactory(name="Batched Study")
+    user = UserFactory(first_name="Batched")
+    await db_session.commit()
+
+    operations = [
+        {
+            "query": "query($id: ID!) { study(id: $id) { name } }",
+            "variables": {"id": str(study.id)},
+        },
+        {
+            "query": "query($id: ID!) { user(id: $id) { firstName } }",
+            "variables": {"id": str(user.id)},
+        },
+        {"query": "query { studies { totalCount } }"},
+    ]
+
+    response = await test_client.post("/graphql/", json=operations)
+    assert response.status_code == 200
+
+    results = response.json()
+    assert len(results) == 3
+    assert results[0]["data"]["study"]["name"] == "Batched Study"
+    assert results[1]["data"]["user"]["firstName"] == "Batched"
+    assert results[2]["data"]["studies"]["totalCount"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_batched_operation_errors_are_isolated(test_client, db_session):
+    """Test one failing operation does not fail the rest of the batch"""
+    operations = [
+        {"query": "query { doesNotExist }"},
+        {"query": "query { studies { totalCount } }"},
+    ]
+
+    response = await test_client.post("/graphql/", json=operations)
+    assert response.status_code == 200
+
+    results = response.json()
+    assert "errors" in results[0]
+    assert "errors" not in results[1]
+
+
+@pytest.mark.asyncio
+async def test_batched_operations_share_authentication(unauthenticated_client):
+    """Test every operation in a batch sees the same (missing) principal"""
+    operations = [{"query": "query { studies { totalCount } }"}] * 2
+
+    response = await unauthenticated_client.post("/graphql/", json=operations)
+
+    results = response.json()
+    assert all(
+        result["errors"][0]["message"] == "Authentication required"
+        for result in results
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_size_is_limited(test_client):
+    """Test oversized batches are rejected outright"""
+    operations = [{"query": "query { __typename }"}] * 11
+
+    response = await test_client.post("/graphql/", json=operations)
+    assert response.status_code == 400
@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.graphql.types.scalars import serialize_datetime
+from src.utils.json_codec import StdlibJSONCodec, get_json_codec
+from tests.factories import StudyFactory
+
+
+def test_stdlib_codec_encodes_datetimes():
+    """Test datetimes are encoded as ISO 8601 strings"""
+    codec = StdlibJSONCodec()
+    value = datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+
+    encoded = codec.dumps({"createdAt": value, "count": 1})
+
+    assert encoded == b'{"createdAt":"2025-01-02T03:04:05.678000+00:00","count":1}'
+    assert codec.loads(encoded)["createdAt"] == value.isoformat()
+
+
+def test_datetime_scalar_serializes_to_iso_string():
+    """Test DateTime values are plain JSON for every transport, not just HTTP"""
+    value = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    assert serialize_datetime(value) == "2025-01-02T03:04:05+00:00"
+
+
+def test_codec_rejects_malformed_input_with_value_error():
+    """Test every codec reports bad JSON as ValueError"""
+    with pytest.raises(ValueError):
+        get_json_codec().loads(b"{not json")
+
+
+def test_unknown_codec_name():
+    with pytest.raises(ValueError):
+        get_json_codec("yaml")
+
+
+@pytest.mark.asyncio
+async def test_datetime_fields_serialized_by_codec(test_client, db_session):
+    """Test DateTime fields reach the client as ISO 8601 strings"""
+    study = StudyFactory(name="Codec Study")
+    await db_session.commit()
+    await db_session.refresh(study)
+
+    query = """
+    query($id: ID!) {
+        study(id: $id) {
+            createdAt
+        }
+    }
+    """
+    response = await test_client.post(
+        "/graphql/", json={"query": query, "variables": {"id": str(study.id)}}
+    )
+
+    assert response.headers["content-type"] == "application/json"
+    created_at = response.json()["data"]["study"]["createdAt"]
+    assert datetime.fromisoformat(created_at.replace("Z", "+00:00")) == study.created_at
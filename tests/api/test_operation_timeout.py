@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from src.api.app import graphql_app
+from src.services.report_service import ReportService
+from src.utils.deadline import deadline, remaining_time
+from src.utils.exceptions import OperationTimeoutError
+
+
+async def _hang(*args, **kwargs):
+    await asyncio.sleep(60)
+
+
+@pytest.mark.asyncio
+async def test_nested_deadline_only_shortens_enclosing_one():
+    """Test a nested deadline cannot extend the deadline around it"""
+    assert remaining_time() is None
+
+    async with deadline(1):
+        async with deadline(60):
+            assert remaining_time() <= 1
+        async with deadline(0.5):
+            assert remaining_time() <= 0.5
+
+    assert remaining_time() is None
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_work_and_raises_timeout_error():
+    """Test work running past its deadline is cancelled"""
+    with pytest.raises(OperationTimeoutError) as error:
+        async with deadline(0.01):
+            await asyncio.sleep(60)
+
+    assert error.value.extensions["code"] == "OPERATION_TIMEOUT"
+
+
+@pytest.mark.asyncio
+async def test_operation_timeout_returns_structured_error(
+    test_client, db_session, monkeypatch
+):
+    """Test an operation over its time budget is cancelled with a timeout error"""
+    monkeypatch.setattr(graphql_app.http_handler, "operation_timeout", 0.05)
+    monkeypatch.setattr(ReportService, "get_studies_paginated", _hang)
+
+    response = await test_client.post(
+        "/graphql/", json={"query": "query { studies { totalCount } }"}
+    )
+    assert response.status_code == 200
+
+    result = response.json()
+    assert result["data"] is None
+    assert result["errors"][0]["extensions"]["code"] == "OPERATION_TIMEOUT"
+
+
+@pytest.mark.asyncio
+async def test_timeout_directive_fails_only_its_field(
+    test_client, db_session, monkeypatch
+):
+    """Test a field with @timeout fails on its own budget, not the operation's"""
+    monkeypatch.setattr(ReportService, "get_reports_paginated", _hang)
+    monkeypatch.setattr(
+        "src.graphql.directives.timeout.deadline",
+        lambda seconds: deadline(0.05),
+    )
+
+    response = await test_client.post(
+        "/graphql/",
+        json={"query": "query { reports { totalCount } studies { totalCount } }"},
+    )
+
+    result = response.json()
+    assert result["errors"][0]["path"] == ["reports"]
+    assert result["errors"][0]["extensions"]["code"] == "OPERATION_TIMEOUT"
@@ -0,0 +1,104 @@
+import pytest
+from graphql import parse
+
+from src.api.app import schema
+from src.config.settings import settings
+from src.graphql.cost import calculate_cost
+from src.utils.pagination import DEFAULT_PAGE_SIZE
+
+CONNECTION_QUERY = """
+    query Studies($first: Int) {
+        studies(first: $first) {
+            edges { node { name reports { id } } }
+        }
+    }
+"""
+
+
+def test_calculate_cost_multiplies_by_page_size_and_list_cardinality():
+    """Test connection page sizes and list estimates multiply nested costs"""
+    costs = calculate_cost(schema, parse(CONNECTION_QUERY), {"first": 5})
+
+    # studies + 5 edges * (edge + node + 100 reports)
+    assert costs["Studies"] == (1 + 5 * (1 + 1 + 100), 4)
+
+
+def test_unpaginated_connection_costs_default_page():
+    """Test a connection queried without first/last costs a default-sized page"""
+    document = parse("query Reports { reports { edges { node { id study { id } } } } }")
+
+    costs = calculate_cost(schema, document)
+
+    # reports + 20 edges * (edge + node + study)
+    assert costs["Reports"] == (1 + DEFAULT_PAGE_SIZE * (1 + 1 + 1), 4)
+
+
+def test_change_feed_costs_requested_page():
+    """Test the change feed's plain list of changes is sized by first"""
+    document = parse(
+        "query Changes { changes(first: 1000) { changes { report { id } } } }"
+    )
+
+    costs = calculate_cost(schema, document)
+
+    # changes + 1000 changes * (change + report)
+    assert costs["Changes"] == (1 + 1000 * (1 + 1), 3)
+
+
+def test_calculate_cost_expands_fragments():
+    """Test fragment spreads cost the same as the inlined selection"""
+    document = parse(
+        """
+        query Studies {
+            studies(first: 5) { edges { node { ...StudyFields } } }
+        }
+        fragment StudyFields on Study { name reports { id } }
+        """
+    )
+
+    costs = calculate_cost(schema, document)
+    assert (
+        costs["Studies"]
+        == calculate_cost(schema, parse(CONNECTION_QUERY), {"first": 5})["Studies"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_cost_reported_in_extensions(test_client, db_session):
+    """Test accepted operations report their cost in the response extensions"""
+    response = await test_client.post(
+        "/graphql/", json={"query": CONNECTION_QUERY, "variables": {"first": 5}}
+    )
+    assert response.status_code == 200
+
+    result = response.json()
+    assert "errors" not in result
+    assert result["extensions"]["cost"]["cost"] == 511
+    assert result["extensions"]["cost"]["depth"] == 4
+    assert result["extensions"]["cost"]["maxCost"] == settings.GRAPHQL_MAX_COST
+
+
+@pytest.mark.asyncio
+async def test_query_over_cost_limit_rejected(test_client, db_session):
+    """Test operations estimated above the cost limit are not executed"""
+    response = await test_client.post(
+        "/graphql/", json={"query": CONNECTION_QUERY, "variables": {"first": 1000}}
+    )
+
+    result = response.json()
+    assert "data" not in result
+    assert "exceeds the maximum" in result["errors"][0]["message"]
+
+
+@pytest.mark.asyncio
+async def test_query_over_depth_limit_rejected(test_client, db_session, monkeypatch):
+    """Test operations nested deeper than the limit are not executed"""
+    monkeypatch.setattr(settings, "GRAPHQL_MAX_DEPTH", 3)
+
+    response = await test_client.post(
+        "/graphql/", json={"query": CONNECTION_QUERY, "variables": {"first": 1}}
+    )
+
+    result = response.json()
+    assert "data" not in result
+    assert "Query depth 4 exceeds the maximum of 3" in result["errors"][0]["message"]
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from src.services.report_service import ReportService
+from src.utils.pagination import Connection, PageInfo
+from src.utils.single_flight import SingleFlight
+
+STUDIES = """
+query($first: Int) {
+    studies(first: $first) {
+        totalCount
+    }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Test callers with the same key get the result of a single call"""
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await release.wait()
+        return {"data": len(calls)}
+
+    waiters = [asyncio.create_task(flight.run("key", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [{"data": 1}] * 3
+    assert flight.snapshot() == {"inFlight": 0, "executions": 1, "coalesced": 2}
+
+    # Finished calls are not reused
+    assert await flight.run("key", load) == {"data": 2}
+
+
+@pytest.mark.asyncio
+async def test_call_survives_until_last_waiter_leaves():
+    """Test a cancelled waiter leaves the call running for the others"""
+    flight = SingleFlight()
+    release = asyncio.Event()
+    started = []
+
+    async def load():
+        started.append(1)
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.run("key", load))
+    second = asyncio.create_task(flight.run("key", load))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    assert started == [1]
+
+
+@pytest.mark.asyncio
+async def test_call_cancelled_without_waiters():
+    """Test a call nobody waits for any more is cancelled"""
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def load():
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(flight.run("key", load))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_identical_queries_are_coalesced(test_client, monkeypatch):
+    """Test identical concurrent queries run their resolvers once"""
+    calls = []
+
+    async def get_studies_paginated(first=None, *args):
+        calls.append(first)
+        await asyncio.sleep(0.05)
+        return Connection(
+            edges=[],
+            page_info=PageInfo(False, False, None, None),
+            total_count=len(calls),
+        )
+
+    monkeypatch.setattr(
+        ReportService, "get_studies_paginated", staticmethod(get_studies_paginated)
+    )
+
+    def post(first, query=STUDIES):
+        return test_client.post(
+            "/graphql/", json={"query": query, "variables": {"first": first}}
+        )
+
+    # Same operation written differently, then different variables
+    responses = await asyncio.gather(
+        post(5),
+        post(5, " ".join(STUDIES.split())),
+        post(10),
+    )
+
+    counts = [
+        response.json()["data"]["studies"]["totalCount"] for response in responses
+    ]
+    assert sorted(calls) == [5, 10]
+    assert counts[0] == counts[1]
+    assert counts[2] != counts[0]
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.api.auth_context import Principal
+from src.services.auth_service import AuthService
+from tests.factories import UserFactory
+
+STUDIES_QUERY = """
+query {
+    studies {
+        totalCount
+    }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_token_claims_build_principal_without_user_lookup(db_session):
+    """Test a token carrying claims authorizes without loading the user row"""
+    user = UserFactory(password_must_change=False)
+    await db_session.commit()
+
+    token = AuthService.create_access_token(user.id, password_must_change=False)
+
+    with patch("src.services.auth_service.user_dao.get_user_by_id") as get_user:
+        principal = await AuthService.get_current_user(token)
+        get_user.assert_not_called()
+
+    assert principal == Principal(id=user.id, password_must_change=False)
+
+
+@pytest.mark.asyncio
+async def test_principal_loads_user_on_demand(db_session):
+    """Test the full user row is only fetched when asked for"""
+    user = UserFactory(first_name="Lazy", password_must_change=False)
+    await db_session.commit()
+
+    principal = Principal(id=user.id, password_must_change=False)
+    loaded = await principal.get_user()
+
+    assert loaded.first_name == "Lazy"
+    assert await principal.get_user() is loaded
+
+
+@pytest.mark.asyncio
+async def test_pending_password_change_is_rechecked(test_app, db_session):
+    """Test a must-change claim is verified against the current user row"""
+    user = UserFactory(password_must_change=True)
+    await db_session.commit()
+    token = AuthService.create_access_token(user.id, password_must_change=True)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=test_app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        response = await client.post("/graphql/", json={"query": STUDIES_QUERY})
+        assert "errors" in response.json()
+
+        # Password changed after the token was issued
+        user.password_must_change = False
+        await db_session.commit()
+
+        response = await client.post("/graphql/", json={"query": STUDIES_QUERY})
+        data = response.json()
+        assert "errors" not in data
+        assert data["data"]["studies"]["totalCount"] >= 0
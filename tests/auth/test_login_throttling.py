@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.rate_limit import InMemoryRateLimiter, TokenBucketPolicy
+from tests.factories import UserFactory
+
+LOGIN_MUTATION = """
+mutation($email: String!, $password: String!) {
+    login(email: $email, password: $password) {
+        token
+    }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_rejects():
+    """Test bucket allows up to capacity and then reports a retry delay"""
+    limiter = InMemoryRateLimiter()
+    policy = TokenBucketPolicy(capacity=3, refill_per_second=1.0)
+
+    for _ in range(3):
+        assert await limiter.acquire("key", policy) == 0
+
+    retry_after = await limiter.acquire("key", policy)
+    assert 0 < retry_after <= 1.0
+
+    # Other keys have their own bucket
+    assert await limiter.acquire("other", policy) == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_evicts_least_recently_used_keys():
+    """Test in-memory limiter stays bounded"""
+    limiter = InMemoryRateLimiter(max_keys=2)
+    policy = TokenBucketPolicy(capacity=1, refill_per_second=0.001)
+
+    await limiter.acquire("a", policy)
+    await limiter.acquire("b", policy)
+    await limiter.acquire("c", policy)
+
+    assert len(limiter._buckets) == 2
+    assert "a" not in limiter._buckets
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limited_per_email(test_client, db_session):
+    """Test repeated logins for one email are rejected before bcrypt runs"""
+    user = UserFactory(email="throttled@example.com")
+    user.set_password("Password123!")
+    await db_session.commit()
+
+    variables = {"email": "throttled@example.com", "password": "WrongPassword"}
+    for _ in range(5):
+        response = await test_client.post(
+            "/graphql/", json={"query": LOGIN_MUTATION, "variables": variables}
+        )
+        assert response.json()["errors"][0]["message"] == "Invalid email or password"
+
+    with patch("src.db.models.user.bcrypt.checkpw") as checkpw:
+        response = await test_client.post(
+            "/graphql/", json={"query": LOGIN_MUTATION, "variables": variables}
+        )
+        checkpw.assert_not_called()
+
+    error = response.json()["errors"][0]
+    assert error["message"] == "Too many login attempts, please try again later"
+    assert error["extensions"]["code"] == "RATE_LIMITED"
+    assert error["extensions"]["retryAfter"] >= 1
@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.db.dao import change_log_dao, user_dao
+from src.db.models.user import UserRole
+from src.services.auth_service import AuthService
+from src.services.token_revocation_service import TokenRevocationService
+from src.utils.bloom import BloomFilter
+from tests.factories import OrganizationFactory, OrganizationMemberFactory, UserFactory
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test every added key is reported as present"""
+    bloom = BloomFilter(capacity=1000)
+    for i in range(1000):
+        bloom.add(str(i))
+
+    assert all(str(i) in bloom for i in range(1000))
+    assert bloom.is_full
+
+
+@pytest.fixture
+def revocations():
+    service = TokenRevocationService(refresh_interval=0)
+    with (
+        patch("src.services.auth_service.token_revocation_service", service),
+        patch("src.services.user_service.token_revocation_service", service),
+    ):
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_unrevoked_token_skips_database(db_session, revocations):
+    """Test a user with no revocations is checked without an exact lookup"""
+    user = UserFactory()
+    await db_session.commit()
+
+    with patch(
+        "src.services.token_revocation_service.user_dao.get_latest_token_revocation"
+    ) as lookup:
+        assert not await revocations.is_revoked(user.id, issued_at=0)
+        lookup.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_force_password_reset_revokes_existing_tokens(
+    test_client, db_session, authenticated_user, revocations
+):
+    """Test tokens issued before a forced reset stop authenticating"""
+    org = OrganizationFactory()
+    radiologist = UserFactory(password_must_change=False)
+    OrganizationMemberFactory(
+        user=authenticated_user, organization=org, role=UserRole.OWNER.value
+    )
+    OrganizationMemberFactory(
+        user=radiologist, organization=org, role=UserRole.RADIOLOGIST.value
+    )
+    await db_session.commit()
+
+    old_token = AuthService.create_access_token(
+        radiologist.id, password_must_change=False
+    )
+    assert await AuthService.get_current_user(old_token) is not None
+
+    mutation = """
+    mutation($userId: ID!) {
+        forcePasswordReset(userId: $userId)
+    }
+    """
+    response = await test_client.post(
+        "/graphql/",
+        json={"query": mutation, "variables": {"userId": str(radiologist.id)}},
+    )
+    assert "errors" not in response.json()
+
+    assert await AuthService.get_current_user(old_token) is None
+
+    # Logging in again issues a token that is still valid
+    new_token = AuthService.create_access_token(
+        radiologist.id, password_must_change=True
+    )
+    principal = await AuthService.get_current_user(new_token)
+    assert principal.id == radiologist.id
+    assert principal.password_must_change
+
+
+@pytest.mark.asyncio
+async def test_revocations_from_other_workers_are_picked_up(db_session):
+    """Test a worker learns about revocations through incremental refresh"""
+    user = UserFactory()
+    await db_session.commit()
+    token = AuthService.create_access_token(user.id, password_must_change=False)
+
+    this_worker = TokenRevocationService(refresh_interval=0)
+    other_worker = TokenRevocationService(refresh_interval=0)
+    assert not await this_worker.is_revoked(user.id, issued_at=0)
+
+    await other_worker.revoke_user_tokens(user.id, "user_deleted")
+
+    with patch("src.services.auth_service.token_revocation_service", this_worker):
+        assert await AuthService.get_current_user(token) is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_resumes_from_transaction_horizon(monkeypatch):
+    """Test revocations committed late by older transactions are not skipped"""
+    horizons = iter([100, 120])
+    reads = []
+
+    async def get_sync_horizon():
+        return next(horizons)
+
+    async def get_revoked_user_ids(horizon, revoked_since):
+        reads.append(horizon)
+        # A transaction below 100 was still running during the first read
+        return [] if len(reads) == 1 else [7]
+
+    async def get_latest_token_revocation(user_id):
+        return datetime.now(timezone.utc)
+
+    monkeypatch.setattr(change_log_dao, "get_sync_horizon", get_sync_horizon)
+    monkeypatch.setattr(user_dao, "get_revoked_user_ids", get_revoked_user_ids)
+    monkeypatch.setattr(
+        user_dao, "get_latest_token_revocation", get_latest_token_revocation
+    )
+    service = TokenRevocationService(refresh_interval=0)
+
+    assert not await service.is_revoked(7, issued_at=0)
+    assert await service.is_revoked(7, issued_at=0)
+    assert reads == [0, 100]
@@ -17,6 +17,7 @@ from src.config.settings import settings
 from src.db import db
 from src.db.models.base import Base
 from src.services.auth_service import AuthService
+from src.utils.rate_limit import InMemoryRateLimiter
 from tests.factories import UserFactory
 from tests.factories.base import BaseFactory
 
@@ -145,6 +146,14 @@ async def db_session(setup_test_database):
         patcher.stop()
 
 
+@pytest.fixture(autouse=True)
+def login_rate_limiter():
+    """Give every test its own login throttling buckets"""
+    limiter = InMemoryRateLimiter()
+    with patch("src.services.auth_service.login_rate_limiter", limiter):
+        yield limiter
+
+
 @pytest.fixture
 def patch_session():
     # The session is already set in the context variable by db_session fixture
@@ -0,0 +1,87 @@
+import pytest
+
+from src.api.middleware import SessionMiddleware
+from src.db import db
+from src.graphql.parser import parse_query
+
+
+async def _call(app, path="/"):
+    scope = {"type": "http", "method": "GET", "path": path, "headers": []}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await SessionMiddleware(app)(scope, receive, send)
+    return messages
+
+
+async def _respond(send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.mark.asyncio
+async def test_session_not_created_when_unused():
+    """Test requests that never touch the database never open a session"""
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["has_session"] = db.has_session
+        await _respond(send)
+
+    await _call(app)
+    assert seen["has_session"] is False
+
+
+@pytest.mark.asyncio
+async def test_session_closed_when_response_starts():
+    """Test the session is released before the response body is sent"""
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["session"] = db.session
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        seen["has_session_after_start"] = db.has_session
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    await _call(app)
+    assert seen["session"] is not None
+    assert seen["has_session_after_start"] is False
+
+
+@pytest.mark.asyncio
+async def test_scope_restores_outer_session(db_session):
+    """Test the middleware scope does not leak into the caller's context"""
+
+    async def app(scope, receive, send):
+        assert db.session is not db_session
+        await _respond(send)
+
+    await _call(app)
+    assert db.session is db_session
+
+
+@pytest.mark.asyncio
+async def test_query_operations_use_autocommit_session():
+    """Test read-only operations get a session without a transaction cycle"""
+    seen = {}
+
+    async def app(scope, receive, send):
+        parse_query({}, {"query": "query Studies { studies { totalCount } }"})
+        seen["query_session"] = db.session
+        await _respond(send)
+
+    await _call(app)
+    assert seen["query_session"].info.get("read_only") is True
+
+    async def mutation_app(scope, receive, send):
+        parse_query({}, {"query": 'mutation { deleteStudy(id: "1") }'})
+        seen["mutation_session"] = db.session
+        await _respond(send)
+
+    await _call(mutation_app)
+    assert not seen["mutation_session"].info.get("read_only")
@@ -0,0 +1,129 @@
+import pytest
+from sqlalchemy import event
+
+from src.db import db
+from src.db.dao import user_dao
+from tests.factories import UserFactory
+
+
+@pytest.fixture
+def commits(db_session):
+    counted = []
+
+    def count(session):
+        counted.append(session)
+
+    event.listen(db_session.sync_session, "after_commit", count)
+    yield counted
+    event.remove(db_session.sync_session, "after_commit", count)
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once(db_session, commits):
+    """Test DAO writes inside a unit of work are committed together"""
+    user = UserFactory()
+    await db_session.commit()
+    commits.clear()
+
+    async with db.unit_of_work():
+        organization = await user_dao.create_organization(
+            {
+                "name": "Unit of work clinic",
+                "address": "1 Commit St",
+                "phone_number": "+1-555-0123",
+                "created_by_user_id": user.id,
+            }
+        )
+        await user_dao.create_organization_member(user.id, organization.id, "Owner")
+        assert organization.id is not None
+        assert commits == []
+
+    assert len(commits) == 1
+
+
+@pytest.mark.asyncio
+async def test_nested_unit_of_work_joins_outer_one(db_session, commits):
+    """Test an inner unit of work defers to the outermost commit"""
+    async with db.unit_of_work():
+        async with db.unit_of_work():
+            UserFactory()
+            await db.commit()
+        assert commits == []
+
+    assert len(commits) == 1
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_does_not_commit_on_error(db_session, commits):
+    """Test a failing unit of work commits nothing"""
+    with pytest.raises(ValueError):
+        async with db.unit_of_work():
+            UserFactory()
+            await db.commit()
+            raise ValueError("boom")
+
+    assert commits == []
+
+
+@pytest.mark.asyncio
+async def test_mutation_field_commits_once(
+    test_client, db_session, authenticated_user, commits
+):
+    """Test a mutation writing several rows commits a single time"""
+    mutation = """
+    mutation($input: CreateOrganizationInput!) {
+        createOrganization(input: $input) {
+            members {
+                role
+            }
+        }
+    }
+    """
+    variables = {
+        "input": {
+            "name": "Single Commit Clinic",
+            "address": "123 Medical St, City, State 12345",
+            "phoneNumber": "+1-555-0123",
+        }
+    }
+
+    response = await test_client.post(
+        "/graphql/", json={"query": mutation, "variables": variables}
+    )
+
+    data = response.json()["data"]["createOrganization"]
+    assert data["members"][0]["role"] == "Owner"
+    assert len(commits) == 1
+
+
+@pytest.mark.asyncio
+async def test_after_commit_callbacks_wait_for_commit(db_session):
+    """Test after_commit callbacks run only once the unit of work commits"""
+    calls = []
+
+    async def notify():
+        calls.append("committed")
+
+    async with db.unit_of_work():
+        db.after_commit(notify)
+        await db.commit()
+        assert calls == []
+
+    assert calls == ["committed"]
+
+
+@pytest.mark.asyncio
+async def test_after_commit_callbacks_dropped_on_rollback(db_session):
+    """Test a rolled back unit of work discards its after_commit callbacks"""
+    calls = []
+
+    async def notify():
+        calls.append("committed")
+
+    with pytest.raises(RuntimeError):
+        async with db.unit_of_work():
+            db.after_commit(notify)
+            raise RuntimeError("abort")
+    await db.commit()
+
+    assert calls == []
@@ -0,0 +1,51 @@
+import pytest
+
+from src.db.dao import report_dao, user_dao
+from src.db.models.user import User
+from tests.factories import ReportFactory, UserFactory
+
+
+@pytest.mark.asyncio
+async def test_update_refreshes_instance_in_identity_map(db_session):
+    """Test the row returned by UPDATE ... RETURNING replaces stale state"""
+    user = UserFactory(first_name="Stale")
+    await db_session.commit()
+
+    updated = await user_dao.update_user(user.id, {"first_name": "Fresh"})
+
+    assert updated is user
+    assert user.first_name == "Fresh"
+
+
+@pytest.mark.asyncio
+async def test_update_of_missing_row_returns_none(db_session):
+    """Test updating an id that does not exist returns None"""
+    assert await user_dao.update_user(-1, {"first_name": "Nobody"}) is None
+
+
+@pytest.mark.asyncio
+async def test_update_report_sets_updated_at(db_session):
+    """Test report updates are timestamped by the database"""
+    report = ReportFactory(updated_at=None)
+    await db_session.commit()
+
+    updated = await report_dao.update_report(report.id, {"result_text": "Done"})
+
+    assert updated.result_text == "Done"
+    assert updated.updated_at is not None
+
+
+@pytest.mark.asyncio
+async def test_password_fields_update_stores_hash(db_session):
+    """Test a new password hash is written along with the other fields"""
+    user = UserFactory(password_must_change=True)
+    await db_session.commit()
+
+    await user_dao.update_user_password_fields(
+        user.id,
+        password=User.hash_password("N3w-password!"),
+        password_must_change=False,
+    )
+
+    assert user.check_password("N3w-password!")
+    assert user.password_must_change is False
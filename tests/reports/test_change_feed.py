@@ -0,0 +1,175 @@
+import pytest
+from sqlalchemy import text
+
+from src.db.dao import change_log_dao
+from tests.factories import StudyFactory, StudyTemplateFactory
+
+CHANGES = """
+query($since: SyncToken, $first: Int) {
+    changes(since: $since, first: $first) {
+        changes {
+            entityType
+            entityId
+            operation
+            report {
+                id
+                resultText
+            }
+            study {
+                id
+            }
+        }
+        syncToken
+        hasMore
+    }
+}
+"""
+
+CREATE_REPORT = """
+mutation($input: CreateReportInput!) {
+    createReport(input: $input) { id }
+}
+"""
+
+
+@pytest.fixture
+def horizon(monkeypatch):
+    """Control which transactions the feed treats as finished.
+
+    Everything a test writes shares one open transaction, which the real
+    horizon would always hold back.
+    """
+    value = {"txid": 2**62}
+
+    async def get_sync_horizon():
+        return value["txid"]
+
+    monkeypatch.setattr(change_log_dao, "get_sync_horizon", get_sync_horizon)
+    return value
+
+
+async def post(client, query, variables):
+    response = await client.post(
+        "/graphql/", json={"query": query, "variables": variables}
+    )
+    body = response.json()
+    assert "errors" not in body, body
+    return body["data"]
+
+
+async def create_report(client, study, template):
+    variables = {
+        "input": {
+            "studyId": str(study.id),
+            "templateId": str(template.id),
+            "promptText": "Chest X-ray",
+        }
+    }
+    data = await post(client, CREATE_REPORT, variables)
+    return data["createReport"]["id"]
+
+
+@pytest.mark.asyncio
+async def test_changes_collapse_to_latest_state(test_client, db_session, horizon):
+    """Test a created then updated report is sent once, with its current state"""
+    study = StudyFactory()
+    template = StudyTemplateFactory(study=study)
+    await db_session.commit()
+
+    report_id = await create_report(test_client, study, template)
+    await post(
+        test_client,
+        """
+        mutation($id: ID!) {
+            updateReport(id: $id, input: {resultText: "No acute findings"}) { id }
+        }
+        """,
+        {"id": report_id},
+    )
+
+    feed = (await post(test_client, CHANGES, {}))["changes"]
+
+    assert feed["changes"] == [
+        {
+            "entityType": "REPORT",
+            "entityId": report_id,
+            "operation": "UPDATED",
+            "report": {"id": report_id, "resultText": "No acute findings"},
+            "study": None,
+        }
+    ]
+    assert feed["hasMore"] is False
+
+
+@pytest.mark.asyncio
+async def test_sync_token_resumes_after_last_change(test_client, db_session, horizon):
+    """Test paging with the sync token returns only later changes"""
+    study = StudyFactory()
+    template = StudyTemplateFactory(study=study)
+    await db_session.commit()
+
+    first_id = await create_report(test_client, study, template)
+    second_id = await create_report(test_client, study, template)
+
+    page = (await post(test_client, CHANGES, {"first": 1}))["changes"]
+    assert [change["entityId"] for change in page["changes"]] == [first_id]
+    assert page["hasMore"] is True
+
+    await post(
+        test_client,
+        "mutation($id: ID!) { deleteReport(id: $id) }",
+        {"id": first_id},
+    )
+    page = (await post(test_client, CHANGES, {"since": page["syncToken"]}))["changes"]
+
+    assert [
+        (change["entityId"], change["operation"], change["report"])
+        for change in page["changes"]
+    ] == [
+        (second_id, "CREATED", {"id": second_id, "resultText": None}),
+        (first_id, "DELETED", None),
+    ]
+    assert page["hasMore"] is False
+
+
+@pytest.mark.asyncio
+async def test_deleting_study_logs_its_reports(test_client, db_session, horizon):
+    """Test reports removed by a study's cascade are reported as deleted"""
+    study = StudyFactory()
+    template = StudyTemplateFactory(study=study)
+    await db_session.commit()
+    report_id = await create_report(test_client, study, template)
+    token = (await post(test_client, CHANGES, {}))["changes"]["syncToken"]
+
+    await post(
+        test_client, "mutation($id: ID!) { deleteStudy(id: $id) }", {"id": study.id}
+    )
+    feed = (await post(test_client, CHANGES, {"since": token}))["changes"]
+
+    assert [
+        (change["entityType"], change["entityId"], change["operation"])
+        for change in feed["changes"]
+    ] == [("REPORT", report_id, "DELETED"), ("STUDY", str(study.id), "DELETED")]
+
+
+@pytest.mark.asyncio
+async def test_unfinished_transactions_hold_the_token_back(
+    test_client, db_session, horizon
+):
+    """Test changes of still running transactions are neither sent nor skipped"""
+    study = StudyFactory()
+    template = StudyTemplateFactory(study=study)
+    await db_session.commit()
+    report_id = await create_report(test_client, study, template)
+
+    # Pretend the test's own transaction is still running for other readers
+    result = await db_session.execute(
+        text("SELECT (pg_current_xact_id()::text)::bigint")
+    )
+    horizon["txid"] = result.scalar_one()
+    feed = (await post(test_client, CHANGES, {}))["changes"]
+    assert feed["changes"] == []
+
+    horizon["txid"] = 2**62
+    feed = (await post(test_client, CHANGES, {"since": feed["syncToken"]}))["changes"]
+    assert [change["entityId"] for change in feed["changes"]] == [report_id]
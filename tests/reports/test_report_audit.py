@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from src.db import db
+from src.db.dao import report_dao
+from src.services.report_audit_service import ReportAuditWriter
+from tests.factories import ReportFactory
+
+UPDATE_REPORT = """
+mutation($id: ID!, $input: UpdateReportInput!) {
+    updateReport(id: $id, input: $input) {
+        id
+        history {
+            resultText
+        }
+        events {
+            eventType
+        }
+    }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_update_report_records_history_and_events(test_client, db_session):
+    """Test changing status and text appends history and event rows"""
+    report = ReportFactory()
+    await db_session.commit()
+
+    variables = {
+        "id": str(report.id),
+        "input": {"status": "SIGNED", "resultText": "Final impression"},
+    }
+    response = await test_client.post(
+        "/graphql/", json={"query": UPDATE_REPORT, "variables": variables}
+    )
+
+    data = response.json()["data"]["updateReport"]
+    assert [entry["resultText"] for entry in data["history"]] == ["Final impression"]
+    assert sorted(event["eventType"] for event in data["events"]) == [
+        "status_changed",
+        "updated",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_without_audited_fields_records_nothing(test_client, db_session):
+    """Test edits that touch neither status nor result text are not audited"""
+    report = ReportFactory()
+    await db_session.commit()
+
+    variables = {"id": str(report.id), "input": {"promptText": "New prompt"}}
+    response = await test_client.post(
+        "/graphql/", json={"query": UPDATE_REPORT, "variables": variables}
+    )
+
+    data = response.json()["data"]["updateReport"]
+    assert data["history"] == []
+    assert data["events"] == []
+
+
+@pytest.mark.asyncio
+async def test_batched_writer_groups_concurrent_appends(monkeypatch):
+    """Test queued appends are written together as one multi-row insert"""
+    writes = []
+
+    async def create_report_audit_entries(history, events):
+        writes.append((history, events))
+
+    monkeypatch.setattr(
+        report_dao, "create_report_audit_entries", create_report_audit_entries
+    )
+    writer = ReportAuditWriter(durability="batched", flush_interval=0.05)
+    writer.start()
+
+    async with db.unit_of_work():
+        await asyncio.gather(
+            *(
+                writer.record([{"report_id": index}], [{"report_id": index}])
+                for index in range(5)
+            )
+        )
+    await writer.stop()
+
+    assert len(writes) == 1
+    history, events = writes[0]
+    assert [row["report_id"] for row in history] == [0, 1, 2, 3, 4]
+    assert len(events) == 5
+
+
+@pytest.mark.asyncio
+async def test_batched_writer_drops_rolled_back_appends(monkeypatch):
+    """Test appends are only queued once the change they belong to commits"""
+    writes = []
+
+    async def create_report_audit_entries(history, events):
+        writes.append((history, events))
+
+    monkeypatch.setattr(
+        report_dao, "create_report_audit_entries", create_report_audit_entries
+    )
+    writer = ReportAuditWriter(durability="batched", flush_interval=0.01)
+    writer.start()
+
+    with pytest.raises(RuntimeError):
+        async with db.unit_of_work():
+            await writer.record([{"report_id": 1}], [{"report_id": 1}])
+            raise RuntimeError("abort")
+    await writer.stop()
+
+    assert writes == []
+
+
+@pytest.mark.asyncio
+async def test_batched_writer_isolates_failing_records(monkeypatch):
+    """Test a record that cannot be written does not lose the rest of its batch"""
+    written = []
+
+    async def create_report_audit_entries(history, events):
+        report_ids = [row["report_id"] for row in history]
+        if 2 in report_ids:
+            raise ValueError("report 2 was deleted")
+        written.extend(report_ids)
+
+    monkeypatch.setattr(
+        report_dao, "create_report_audit_entries", create_report_audit_entries
+    )
+    writer = ReportAuditWriter(durability="batched", flush_interval=0.05)
+    writer.start()
+
+    async with db.unit_of_work():
+        for index in range(4):
+            await writer.record([{"report_id": index}], [])
+    await writer.stop()
+
+    assert written == [0, 1, 3]
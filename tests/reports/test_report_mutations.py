@@ -1,5 +1,6 @@
 import pytest
 
+from src.db.dao import report_dao
 from src.db.models.report import ReportStatus
 from tests.factories import (
     OrganizationFactory,
@@ -387,3 +388,146 @@ async def test_report_with_all_status_types(test_client, db_session):
 
         update_data = update_response.json()
         assert update_data["data"]["updateReport"]["status"] == status
+
+
+@pytest.mark.asyncio
+async def test_create_reports_mutation(test_client, db_session):
+    """Test creating several reports in one mutation"""
+    study = StudyFactory(name="Bulk Report Study")
+    template = StudyTemplateFactory(study=study)
+    await db_session.commit()
+
+    mutation = """
+    mutation($inputs: [CreateReportInput!]!) {
+        createReports(inputs: $inputs) {
+            id
+            promptText
+            status
+            study {
+                name
+            }
+        }
+    }
+    """
+    variables = {
+        "inputs": [
+            {
+                "studyId": str(study.id),
+                "templateId": str(template.id),
+                "promptText": f"Bulk prompt {index}",
+            }
+            for index in range(3)
+        ]
+    }
+
+    response = await test_client.post(
+        "/graphql/", json={"query": mutation, "variables": variables}
+    )
+    assert response.status_code == 200
+
+    reports = response.json()["data"]["createReports"]
+    assert [report["promptText"] for report in reports] == [
+        "Bulk prompt 0",
+        "Bulk prompt 1",
+        "Bulk prompt 2",
+    ]
+    assert all(report["status"] == "DRAFT" for report in reports)
+    assert all(report["study"]["name"] == "Bulk Report Study" for report in reports)
+
+
+@pytest.mark.asyncio
+async def test_create_reports_rejects_batch_with_invalid_input(test_client, db_session):
+    """Test one invalid input fails the whole batch without creating reports"""
+    study = StudyFactory(name="Invalid Bulk Study")
+    template = StudyTemplateFactory(study=study)
+    await db_session.commit()
+
+    mutation = """
+    mutation($inputs: [CreateReportInput!]!) {
+        createReports(inputs: $inputs) {
+            id
+        }
+    }
+    """
+    valid = {
+        "studyId": str(study.id),
+        "templateId": str(template.id),
+        "promptText": "Valid prompt",
+    }
+    variables = {"inputs": [valid, {**valid, "promptText": "   "}]}
+
+    response = await test_client.post(
+        "/graphql/", json={"query": mutation, "variables": variables}
+    )
+
+    data = response.json()
+    assert data["errors"][0]["message"] == "inputs[1]: Prompt text is required"
+
+    query = """
+    query($studyId: ID!) {
+        reports(filter: {studyId: $studyId}) {
+            totalCount
+        }
+    }
+    """
+    response = await test_client.post(
+        "/graphql/", json={"query": query, "variables": {"studyId": str(study.id)}}
+    )
+    assert response.json()["data"]["reports"]["totalCount"] == 0
+
+
+UPDATE_REPORT_VERSIONED = """
+mutation($id: ID!, $input: UpdateReportInput!, $expectedVersion: Int) {
+    updateReport(id: $id, input: $input, expectedVersion: $expectedVersion) {
+        resultText
+        version
+    }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_update_report_with_expected_version(test_client, db_session):
+    """Test an update at the current version succeeds and bumps the version"""
+    report = ReportFactory()
+    await db_session.commit()
+
+    variables = {
+        "id": str(report.id),
+        "input": {"resultText": "First edit"},
+        "expectedVersion": 1,
+    }
+    response = await test_client.post(
+        "/graphql/", json={"query": UPDATE_REPORT_VERSIONED, "variables": variables}
+    )
+
+    data = response.json()["data"]["updateReport"]
+    assert data == {"resultText": "First edit", "version": 2}
+
+
+@pytest.mark.asyncio
+async def test_update_report_with_stale_version_conflicts(test_client, db_session):
+    """Test a writer holding an old version is rejected instead of overwriting"""
+    report = ReportFactory(result_text="Original")
+    await db_session.commit()
+
+    first = {
+        "id": str(report.id),
+        "input": {"resultText": "Tab one"},
+        "expectedVersion": 1,
+    }
+    second = {**first, "input": {"resultText": "Tab two"}}
+    await test_client.post(
+        "/graphql/", json={"query": UPDATE_REPORT_VERSIONED, "variables": first}
+    )
+    response = await test_client.post(
+        "/graphql/", json={"query": UPDATE_REPORT_VERSIONED, "variables": second}
+    )
+
+    error = response.json()["errors"][0]
+    assert error["extensions"]["code"] == "CONFLICT"
+    assert error["extensions"]["currentVersion"] == 2
+
+    updated = await report_dao.get_report_by_id(report.id)
+    await db_session.refresh(updated)
+    assert updated.result_text == "Tab one"
@@ -0,0 +1,100 @@
+import pytest
+
+from src.db.dao import report_dao
+from tests.factories import ReportFactory, StudyTemplateFactory
+
+UPDATE_REPORT_SECTION = """
+mutation($reportId: ID!, $section: String!, $text: String) {
+    updateReportSection(reportId: $reportId, section: $section, text: $text) {
+        resultText
+        version
+        sections {
+            name
+            content
+        }
+        history {
+            sectionName
+            resultText
+        }
+    }
+}
+"""
+
+
+async def update_section(test_client, report_id, section, text):
+    variables = {"reportId": str(report_id), "section": section, "text": text}
+    response = await test_client.post(
+        "/graphql/", json={"query": UPDATE_REPORT_SECTION, "variables": variables}
+    )
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_first_section_update_structures_report(test_client, db_session):
+    """Test a plain result text is split into sections on its first edit"""
+    template = StudyTemplateFactory(section_names=["Findings", "Impression"])
+    report = ReportFactory(
+        template=template,
+        study=template.study,
+        result_text="Findings:\nClear lungs.\n\nImpression:\nPending.",
+    )
+    await db_session.commit()
+
+    body = await update_section(
+        test_client, report.id, "Impression", "No acute disease."
+    )
+
+    data = body["data"]["updateReportSection"]
+    assert data["resultText"] == (
+        "Findings:\nClear lungs.\n\nImpression:\nNo acute disease."
+    )
+    assert data["version"] == 2
+    assert data["history"] == [
+        {"sectionName": "Impression", "resultText": "No acute disease."}
+    ]
+
+    stored = await report_dao.get_report_by_id(report.id)
+    await db_session.refresh(stored)
+    assert stored.section_data == {
+        "Findings": "Clear lungs.",
+        "Impression": "No acute disease.",
+    }
+    assert stored.result_text is None
+
+
+@pytest.mark.asyncio
+async def test_section_update_leaves_other_sections(test_client, db_session):
+    """Test updating a structured report changes only the given section"""
+    template = StudyTemplateFactory(section_names=["Findings", "Impression"])
+    report = ReportFactory(
+        template=template,
+        study=template.study,
+        result_text=None,
+        section_data={"Findings": "Clear lungs.", "Impression": "Pending."},
+    )
+    await db_session.commit()
+
+    body = await update_section(test_client, report.id, "Findings", "Small effusion.")
+
+    assert body["data"]["updateReportSection"]["sections"] == [
+        {"name": "Findings", "content": "Small effusion."},
+        {"name": "Impression", "content": "Pending."},
+    ]
+
+    body = await update_section(test_client, report.id, "Impression", None)
+
+    data = body["data"]["updateReportSection"]
+    assert data["resultText"] == "Findings:\nSmall effusion."
+    assert data["version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_update_unknown_section_fails(test_client, db_session):
+    """Test a section outside the report's template is refused"""
+    template = StudyTemplateFactory(section_names=["Findings"])
+    report = ReportFactory(template=template, study=template.study)
+    await db_session.commit()
+
+    body = await update_section(test_client, report.id, "Technique", "Axial CT")
+
+    assert body["errors"][0]["message"] == "Unknown report section: Technique"
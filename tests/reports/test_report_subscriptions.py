@@ -0,0 +1,147 @@
+import asyncio
+import contextvars
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from ariadne import subscribe
+
+from src.api.app import schema
+from src.api.auth_context import get_current_user, set_current_user
+from src.api.auth_middleware import authenticate_websocket
+from src.db import db
+from src.services.auth_service import AuthService
+from src.services.token_revocation_service import TokenRevocationService
+from src.utils.pubsub import InMemoryBroker
+from tests.factories import ReportFactory, UserFactory
+
+REPORT_UPDATED = """
+subscription($filter: ReportUpdateFilterInput) {
+    reportUpdated(filter: $filter) {
+        id
+        version
+        status
+        changedFields
+    }
+}
+"""
+
+UPDATE_REPORT = """
+mutation($id: ID!, $input: UpdateReportInput!) {
+    updateReport(id: $id, input: $input) { id }
+}
+"""
+
+
+async def next_result(results):
+    """Start waiting for the next event and let the subscription register"""
+    pending = asyncio.ensure_future(results.__anext__())
+    for _ in range(3):
+        await asyncio.sleep(0)
+    return pending
+
+
+@pytest.mark.asyncio
+async def test_in_memory_broker_fans_out_to_each_subscriber():
+    """Test every subscriber of a channel receives each published message"""
+    broker = InMemoryBroker()
+    first = broker.subscribe("reports")
+    second = broker.subscribe("reports")
+    pending = [asyncio.ensure_future(anext(messages)) for messages in (first, second)]
+    await asyncio.sleep(0)
+
+    await broker.publish("reports", {"id": 1})
+
+    assert await asyncio.gather(*pending) == [{"id": 1}, {"id": 1}]
+    await first.aclose()
+    await second.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_keeps_latest_messages():
+    """Test a full subscriber queue drops its oldest message"""
+    broker = InMemoryBroker(queue_size=2)
+    messages = broker.subscribe("reports")
+    pending = asyncio.ensure_future(anext(messages))
+    await asyncio.sleep(0)
+    await broker.publish("reports", {"id": 0})
+    assert await pending == {"id": 0}
+
+    for index in range(1, 5):
+        await broker.publish("reports", {"id": index})
+
+    assert await anext(messages) == {"id": 3}
+    assert await anext(messages) == {"id": 4}
+    await messages.aclose()
+
+
+@pytest.mark.asyncio
+async def test_report_update_is_pushed_to_subscribers(test_client, db_session):
+    """Test a committed update reaches matching subscribers as a delta"""
+    report = ReportFactory()
+    other = ReportFactory()
+    await db_session.commit()
+
+    success, results = await subscribe(
+        schema,
+        {
+            "query": REPORT_UPDATED,
+            "variables": {"filter": {"reportIds": [str(report.id)]}},
+        },
+    )
+    assert success
+    pending = await next_result(results)
+
+    for target in (other, report):
+        await test_client.post(
+            "/graphql/",
+            json={
+                "query": UPDATE_REPORT,
+                "variables": {"id": str(target.id), "input": {"status": "SIGNED"}},
+            },
+        )
+
+    result = await asyncio.wait_for(pending, timeout=1)
+    assert result.data["reportUpdated"] == {
+        "id": str(report.id),
+        "version": 2,
+        "status": "SIGNED",
+        "changedFields": ["status"],
+    }
+    await results.aclose()
+
+
+@pytest.mark.asyncio
+async def test_report_subscription_requires_authentication(db_session):
+    """Test an unauthenticated client cannot open the event stream"""
+    set_current_user(None)
+
+    success, errors = await subscribe(schema, {"query": REPORT_UPDATED})
+
+    assert not success
+    assert errors[0]["message"] == "Authentication required"
+
+
+@pytest.mark.asyncio
+async def test_connection_init_authenticates_without_request_scope(db_session):
+    """Test connection_init auth can query the database outside any request"""
+    user = UserFactory(password_must_change=False)
+    await db_session.commit()
+    token = AuthService.create_access_token(user.id, password_must_change=False)
+
+    async def connection_init():
+        await authenticate_websocket(None, {"Authorization": f"Bearer {token}"})
+        return get_current_user()
+
+    # A stale revocation filter is refreshed from the database; a fresh
+    # context has no session scope, like a websocket connection
+    revocations = TokenRevocationService(refresh_interval=0)
+    with (
+        patch("src.services.auth_service.token_revocation_service", revocations),
+        patch.object(db, "close_session", AsyncMock()),
+    ):
+        principal = await asyncio.create_task(
+            connection_init(), context=contextvars.Context()
+        )
+
+    assert principal is not None
+    assert principal.id == user.id
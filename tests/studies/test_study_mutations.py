@@ -1,6 +1,19 @@
 import pytest
-
-from tests.factories import OrganizationFactory, StudyFactory, UserFactory
+from sqlalchemy import func, select
+
+from src.config.settings import settings
+from src.db.dao import report_dao
+from src.db.models.report import Report, ReportEvent, ReportHistory
+from src.services.report_service import ReportService
+from tests.factories import (
+    OrganizationFactory,
+    ReportEventFactory,
+    ReportFactory,
+    ReportHistoryFactory,
+    StudyFactory,
+    StudyTemplateFactory,
+    UserFactory,
+)
 
 
 @pytest.mark.asyncio
@@ -137,3 +150,61 @@ async def test_delete_study_mutation(test_client, db_session):
     verify_data = verify_response.json()
     # The study should not be found or should be null
     assert verify_data["data"]["study"] is None
+
+
+@pytest.mark.asyncio
+async def test_delete_study_cascades_to_reports(test_client, db_session):
+    """Test deleting a study removes its templates, reports and report history"""
+    report = ReportFactory()
+    ReportHistoryFactory(report=report)
+    ReportEventFactory(report=report)
+    await db_session.commit()
+    study_id, report_id = report.study_id, report.id
+
+    mutation = """
+    mutation($id: ID!) {
+        deleteStudy(id: $id)
+    }
+    """
+    response = await test_client.post(
+        "/graphql/", json={"query": mutation, "variables": {"id": str(study_id)}}
+    )
+    assert response.json()["data"]["deleteStudy"] is True
+
+    for model, column in (
+        (Report, Report.id),
+        (ReportHistory, ReportHistory.report_id),
+        (ReportEvent, ReportEvent.report_id),
+    ):
+        result = await db_session.execute(
+            select(func.count()).select_from(model).where(column == report_id)
+        )
+        assert result.scalar_one() == 0
+
+
+@pytest.mark.asyncio
+async def test_large_study_deleted_in_background_chunks(
+    test_client, db_session, monkeypatch
+):
+    """Test studies over the threshold are deleted chunk by chunk off-request"""
+    study = StudyFactory(name="Large study")
+    template = StudyTemplateFactory(study=study)
+    for _ in range(5):
+        ReportFactory(study=study, template=template)
+    await db_session.commit()
+
+    jobs = []
+    monkeypatch.setattr(settings, "BULK_DELETE_THRESHOLD", 2)
+    monkeypatch.setattr(
+        "src.services.report_service.run_in_background",
+        lambda job, *args: jobs.append((job, args)),
+    )
+
+    assert await ReportService.delete_study(study.id) is True
+    assert await report_dao.count_reports_by_study_id(study.id) == 5
+
+    job, args = jobs[0]
+    assert job == ReportService.delete_study_in_chunks
+    assert await ReportService.delete_study_in_chunks(*args, chunk_size=2) is True
+    assert await report_dao.count_reports_by_study_id(study.id) == 0
+    assert await report_dao.get_study_by_id(study.id) is None
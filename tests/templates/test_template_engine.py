@@ -0,0 +1,174 @@
+import pytest
+
+from src.services.template_engine import (
+    CompiledTemplate,
+    TemplateEngine,
+    template_engine,
+)
+from tests.factories import ReportFactory, StudyTemplateFactory
+
+REPORT_SECTIONS = """
+query($id: ID!) {
+    report(id: $id) {
+        sections {
+            name
+            content
+        }
+    }
+}
+"""
+
+UPDATE_SECTIONS = """
+mutation($id: ID!, $sections: [ReportSectionInput!]!) {
+    updateReport(id: $id, input: {sections: $sections}) {
+        resultText
+        version
+    }
+}
+"""
+
+
+def test_render_and_parse_round_trip():
+    """Test a rendered body parses back into the same sections"""
+    template = CompiledTemplate(["Findings", "Impression"])
+    body = template.render(
+        {"Findings": "Lungs are clear.", "Impression": "Normal study."},
+        preamble="Indication: cough",
+    )
+
+    assert body == (
+        "Indication: cough\n\nFindings:\nLungs are clear.\n\nImpression:\nNormal study."
+    )
+    parsed = template.parse(body)
+    assert parsed.sections == {
+        "Findings": "Lungs are clear.",
+        "Impression": "Normal study.",
+    }
+    assert parsed.preamble == "Indication: cough"
+
+
+def test_parse_accepts_free_form_headings():
+    """Test headings match regardless of case and may share a line with text"""
+    template = CompiledTemplate(["Findings", "Impression"])
+
+    parsed = template.parse("FINDINGS: No fracture.\nimpression:\n  Negative.")
+
+    assert parsed.sections == {"Findings": "No fracture.", "Impression": "Negative."}
+    assert parsed.preamble is None
+
+
+def test_parse_keeps_text_without_headings():
+    """Test text with no recognised heading is kept as the preamble"""
+    parsed = CompiledTemplate(["Findings"]).parse("Dictated without headings")
+
+    assert parsed.sections == {"Findings": None}
+    assert parsed.preamble == "Dictated without headings"
+
+
+def test_render_rejects_unknown_sections():
+    """Test values for sections outside the template are refused"""
+    with pytest.raises(ValueError, match="Unknown report sections: Technique"):
+        CompiledTemplate(["Findings"]).render({"Technique": "Axial CT"})
+
+
+def test_engine_compiles_each_template_once():
+    """Test the compiled layout is reused until the sections change"""
+    engine = TemplateEngine()
+    template = StudyTemplateFactory.build(id=1, section_names=["Findings"])
+
+    compiled = engine.compile(template)
+    assert engine.compile(template) is compiled
+
+    template.section_names = ["Findings", "Impression"]
+    recompiled = engine.compile(template)
+    assert recompiled is not compiled
+    assert recompiled.section_names == ("Findings", "Impression")
+
+
+@pytest.mark.asyncio
+async def test_template_update_invalidates_compiled_form(db_session):
+    """Test saving a template drops its compiled layouts"""
+    template = StudyTemplateFactory(section_names=["Findings"])
+    await db_session.commit()
+    template_engine.compile(template)
+
+    template.section_names = ["Findings", "Impression"]
+    await db_session.commit()
+
+    assert all(key[0] != template.id for key in template_engine._compiled)
+
+
+@pytest.mark.asyncio
+async def test_report_sections_follow_template(test_client, db_session):
+    """Test Report.sections lists every template section in order"""
+    template = StudyTemplateFactory(section_names=["Findings", "Impression"])
+    report = ReportFactory(
+        template=template,
+        study=template.study,
+        result_text="Impression: Unremarkable.",
+    )
+    await db_session.commit()
+
+    response = await test_client.post(
+        "/graphql/", json={"query": REPORT_SECTIONS, "variables": {"id": report.id}}
+    )
+
+    assert response.json()["data"]["report"]["sections"] == [
+        {"name": "Findings", "content": None},
+        {"name": "Impression", "content": "Unremarkable."},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_sections_renders_result_text(test_client, db_session):
+    """Test updating one section keeps the others and re-renders the body"""
+    template = StudyTemplateFactory(section_names=["Findings", "Impression"])
+    report = ReportFactory(
+        template=template,
+        study=template.study,
+        result_text="Findings:\nClear lungs.\n\nImpression:\nPending.",
+    )
+    await db_session.commit()
+
+    variables = {
+        "id": report.id,
+        "sections": [{"name": "Impression", "content": "No acute disease."}],
+    }
+    response = await test_client.post(
+        "/graphql/", json={"query": UPDATE_SECTIONS, "variables": variables}
+    )
+
+    assert response.json()["data"]["updateReport"]["resultText"] == (
+        "Findings:\nClear lungs.\n\nImpression:\nNo acute disease."
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "report_body",
+    [
+        {"result_text": "Findings:\nClear lungs."},
+        {"result_text": None, "section_data": {"Findings": "Clear lungs."}},
+    ],
+)
+async def test_update_unknown_sections_fails(test_client, db_session, report_body):
+    """Test unknown section names are refused alike for both report shapes"""
+    template = StudyTemplateFactory(section_names=["Findings"])
+    report = ReportFactory(template=template, study=template.study, **report_body)
+    await db_session.commit()
+
+    sections = [
+        {"name": "Technique", "content": "Axial CT"},
+        {"name": "Comparison", "content": None},
+    ]
+    response = await test_client.post(
+        "/graphql/",
+        json={
+            "query": UPDATE_SECTIONS,
+            "variables": {"id": str(report.id), "sections": sections},
+        },
+    )
+
+    assert response.json()["errors"][0]["message"] == (
+        "Unknown report sections: Technique, Comparison"
+    )
@@ -168,3 +168,32 @@ async def test_query_organizations_paginated(test_client, db_session):
     assert orgs_data["totalCount"] == 3
     assert orgs_data["pageInfo"]["hasNextPage"] == True
     assert orgs_data["pageInfo"]["hasPreviousPage"] == False
+
+
+@pytest.mark.asyncio
+async def test_update_user_mutation(test_client, db_session):
+    user = UserFactory(first_name="Before", phone_number=None)
+    await db_session.commit()
+
+    mutation = """
+    mutation($id: ID!, $input: UpdateUserInput!) {
+        updateUser(id: $id, input: $input) {
+            id
+            firstName
+            phoneNumber
+        }
+    }
+    """
+    variables = {
+        "id": str(user.id),
+        "input": {"firstName": "After", "phoneNumber": "+15555550100"},
+    }
+
+    response = await test_client.post(
+        "/graphql/", json={"query": mutation, "variables": variables}
+    )
+    assert response.status_code == 200
+
+    data = response.json()["data"]["updateUser"]
+    assert data["firstName"] == "After"
+    assert data["phoneNumber"] == "+15555550100"
@@ -0,0 +1,135 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from src.db import db
+from src.db.dao import outbox_dao
+from src.db.models.outbox import OutboxEvent
+from src.services.outbox_service import REPORT_UPDATED
+from src.workers import outbox
+from src.workers.outbox import OutboxWorker, outbox_handler
+from tests.factories import ReportFactory
+
+TEST_EVENT = "test.event"
+
+
+@pytest.fixture
+def received():
+    """Register a handler for TEST_EVENT and collect what it receives"""
+    events = []
+
+    @outbox_handler(TEST_EVENT)
+    async def collect(event):
+        events.append(event)
+
+    yield events
+    outbox._handlers.pop(TEST_EVENT, None)
+
+
+@pytest.fixture
+def worker_in_test_session():
+    """Run worker batches in the test session instead of a fresh scope"""
+    with (
+        patch.object(db, "begin_scope", return_value=None),
+        patch.object(db, "end_scope", AsyncMock()),
+    ):
+        yield
+
+
+async def add_event(db_session, **values):
+    await outbox_dao.create_outbox_events(
+        [
+            {
+                "aggregate_type": "report",
+                "aggregate_id": 1,
+                "event_type": TEST_EVENT,
+                "payload": {"id": 1},
+                **values,
+            }
+        ]
+    )
+    result = await db_session.execute(select(OutboxEvent))
+    return result.scalars().one()
+
+
+@pytest.mark.asyncio
+async def test_update_report_writes_outbox_event(test_client, db_session):
+    """Test a report change is recorded in the outbox with the change itself"""
+    report = ReportFactory()
+    await db_session.commit()
+
+    mutation = """
+    mutation($id: ID!, $input: UpdateReportInput!) {
+        updateReport(id: $id, input: $input) { id }
+    }
+    """
+    variables = {"id": str(report.id), "input": {"resultText": "Impression"}}
+    await test_client.post(
+        "/graphql/", json={"query": mutation, "variables": variables}
+    )
+
+    result = await db_session.execute(
+        select(OutboxEvent).where(OutboxEvent.aggregate_id == report.id)
+    )
+    event = result.scalars().one()
+    assert event.event_type == REPORT_UPDATED
+    assert event.payload["id"] == report.id
+    assert event.payload["changes"] == ["resultText"]
+
+
+@pytest.mark.asyncio
+async def test_worker_delivers_and_deletes_events(
+    db_session, received, worker_in_test_session
+):
+    """Test a delivered event reaches its handler and leaves the outbox"""
+    event = await add_event(db_session)
+
+    assert await OutboxWorker().run_once() == 1
+
+    assert [delivered.id for delivered in received] == [event.id]
+    result = await db_session.execute(select(OutboxEvent))
+    assert result.scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_failed_event_is_retried_later(db_session, worker_in_test_session):
+    """Test a failing handler keeps the event with its error and a backoff"""
+
+    @outbox_handler(TEST_EVENT)
+    async def explode(event):
+        raise RuntimeError("downstream unavailable")
+
+    try:
+        event = await add_event(db_session)
+        assert await OutboxWorker().run_once() == 1
+        # Leased and backed off, so not due again yet
+        assert await OutboxWorker().run_once() == 0
+    finally:
+        outbox._handlers.pop(TEST_EVENT, None)
+
+    await db_session.refresh(event)
+    assert event.attempts == 1
+    assert event.last_error == "RuntimeError: downstream unavailable"
+    assert event.failed_at is None
+
+
+@pytest.mark.asyncio
+async def test_event_is_abandoned_after_max_attempts(
+    db_session, worker_in_test_session
+):
+    """Test an event that keeps failing is marked failed and not claimed again"""
+
+    @outbox_handler(TEST_EVENT)
+    async def explode(event):
+        raise RuntimeError("bad payload")
+
+    try:
+        event = await add_event(db_session, attempts=2)
+        assert await OutboxWorker(max_attempts=3).run_once() == 1
+    finally:
+        outbox._handlers.pop(TEST_EVENT, None)
+
+    await db_session.refresh(event)
+    assert event.failed_at is not None
+    assert event.last_error == "RuntimeError: bad payload"
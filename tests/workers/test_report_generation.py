@@ -0,0 +1,179 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from src.db import db
+from src.db.dao import generation_job_dao
+from src.db.models.generation import GenerationJobStatus, ReportGenerationJob
+from src.db.models.report import ReportStatus
+from src.services.report_generator import StubReportGenerator
+from src.workers.report_generation import ReportGenerationWorker
+from tests.factories import ReportFactory, StudyFactory, StudyTemplateFactory
+
+
+class FailingGenerator:
+    async def generate(self, report):
+        raise RuntimeError("model unavailable")
+
+
+class BlockingGenerator:
+    def __init__(self):
+        self.started = 0
+        self.release = asyncio.Event()
+
+    async def generate(self, report):
+        self.started += 1
+        await self.release.wait()
+        return "done"
+
+
+@pytest.fixture
+def worker_in_test_session():
+    """Run jobs in the test session instead of fresh scopes"""
+    with (
+        patch.object(db, "begin_scope", return_value=None),
+        patch.object(db, "end_scope", AsyncMock()),
+        patch.object(db, "close_session", AsyncMock()),
+    ):
+        yield
+
+
+async def queue_job(db_session, **report_values):
+    report = ReportFactory(status=ReportStatus.draft.value, **report_values)
+    await db_session.commit()
+    await generation_job_dao.create_generation_jobs([report.id])
+    result = await db_session.execute(
+        select(ReportGenerationJob).where(ReportGenerationJob.report_id == report.id)
+    )
+    return report, result.scalar_one()
+
+
+async def run_dispatched(worker):
+    assert await worker.dispatch() > 0
+    await asyncio.gather(*worker._active)
+
+
+@pytest.mark.asyncio
+async def test_create_report_queues_generation_job(test_client, db_session):
+    """Test createReport returns at once with a generation job queued"""
+    study = StudyFactory()
+    template = StudyTemplateFactory(study=study)
+    await db_session.commit()
+
+    mutation = """
+    mutation($input: CreateReportInput!) {
+        createReport(input: $input) { id status }
+    }
+    """
+    variables = {
+        "input": {
+            "studyId": str(study.id),
+            "templateId": str(template.id),
+            "promptText": "CT head without contrast",
+        }
+    }
+    response = await test_client.post(
+        "/graphql/", json={"query": mutation, "variables": variables}
+    )
+    report = response.json()["data"]["createReport"]
+
+    assert report["status"] == "DRAFT"
+    result = await db_session.execute(
+        select(ReportGenerationJob).where(
+            ReportGenerationJob.report_id == int(report["id"])
+        )
+    )
+    assert result.scalar_one().status == GenerationJobStatus.queued.value
+
+
+@pytest.mark.asyncio
+async def test_worker_writes_result_and_advances_status(
+    db_session, worker_in_test_session
+):
+    """Test a processed job stores the result and makes the report preliminary"""
+    report, job = await queue_job(db_session, prompt_text="Chest X-ray PA")
+    generator = StubReportGenerator()
+    expected = await generator.generate(report)
+
+    await run_dispatched(ReportGenerationWorker(generator))
+
+    await db_session.refresh(report)
+    await db_session.refresh(job)
+    assert report.result_text == expected
+    assert report.status == ReportStatus.preliminary.value
+    assert report.version == 2
+    assert job.status == GenerationJobStatus.succeeded.value
+    assert job.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_later(db_session, worker_in_test_session):
+    """Test a generator failure requeues the job with its error and a backoff"""
+    report, job = await queue_job(db_session)
+
+    await run_dispatched(ReportGenerationWorker(FailingGenerator(), max_attempts=3))
+
+    await db_session.refresh(job)
+    await db_session.refresh(report)
+    assert job.status == GenerationJobStatus.queued.value
+    assert job.attempts == 1
+    assert job.last_error == "RuntimeError: model unavailable"
+    assert report.status == ReportStatus.draft.value
+
+
+@pytest.mark.asyncio
+async def test_job_fails_after_max_attempts(db_session, worker_in_test_session):
+    """Test a job that keeps failing is marked failed"""
+    _, job = await queue_job(db_session)
+
+    await run_dispatched(ReportGenerationWorker(FailingGenerator(), max_attempts=1))
+
+    await db_session.refresh(job)
+    assert job.status == GenerationJobStatus.failed.value
+    assert job.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_report_edited_by_hand_is_left_alone(db_session, worker_in_test_session):
+    """Test a report no longer in draft is not overwritten"""
+    report, job = await queue_job(db_session)
+    report.status = ReportStatus.signed.value
+    report.result_text = "Signed by radiologist"
+    await db_session.commit()
+
+    await run_dispatched(ReportGenerationWorker(StubReportGenerator()))
+
+    await db_session.refresh(report)
+    await db_session.refresh(job)
+    assert report.result_text == "Signed by radiologist"
+    assert job.status == GenerationJobStatus.succeeded.value
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_at_most_concurrency_jobs(db_session, worker_in_test_session):
+    """Test the pool only claims as many jobs as it has free slots"""
+    for _ in range(3):
+        await queue_job(db_session)
+    generator = BlockingGenerator()
+    worker = ReportGenerationWorker(generator, concurrency=2)
+
+    assert await worker.dispatch() == 2
+    await asyncio.sleep(0)
+    assert generator.started == 2
+    assert await worker.dispatch() == 0
+
+    for task in worker._active:
+        task.cancel()
+    await asyncio.gather(*worker._active, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_stub_generator_is_deterministic():
+    """Test the stub produces the same text for the same prompt"""
+    generator = StubReportGenerator()
+    report = ReportFactory.build(prompt_text="MRI knee")
+
+    assert await generator.generate(report) == await generator.generate(report)
+    assert "MRI knee" in await generator.generate(report)